@@ -0,0 +1,315 @@
+"""Benchmark suite di GCC v1 (standalone, offline).
+
+Uso:
+
+    python benchmarks/run_benchmarks.py run -o results.json
+    python benchmarks/run_benchmarks.py run --quick --only encode_block,kernel_2310
+    python benchmarks/run_benchmarks.py compare benchmarks/baseline.json results.json
+
+`run` misura tempo (miglior ripetizione) e throughput su corpora sintetici
+deterministici (random, text, numeric, composite) da 16 B a 64 MB, più il picco
+di memoria con tracemalloc; scrive tutto in JSON. `compare` confronta due file
+JSON ed esce con codice 1 se qualche misura è più lenta della soglia.
+
+Ogni benchmark ha una dimensione massima di default (le parti pure Python sono
+lente sui blocchi grandi): `--max-size` la alza o la abbassa per tutti.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT / "src"))
+
+from gcc_v1 import (  # noqa: E402
+    decode_block,
+    encode_block,
+    kernel_2310_from_buffer,
+    spectral_view,
+)
+from gcc_v1.cluster import DYNAMICS, compute_cluster_signature  # noqa: E402
+from gcc_v1.codec import __version__  # noqa: E402
+from gcc_v1.exponents import build_exponent_matrix  # noqa: E402
+from gcc_v1.invariants import compute_cids  # noqa: E402
+
+SIZES = (16, 1 << 10, 1 << 16, 1 << 20, 1 << 26)  # 16 B .. 64 MB
+QUICK_SIZES = (16, 1 << 10, 1 << 16)
+CORPORA = ("random", "text", "numeric", "composite")
+
+# Durata minima di una ripetizione: le chiamate brevi vengono ripetute in loop.
+_MIN_REPEAT_SECONDS = 0.05
+
+# ---------------------------------------------------------------------------
+# Corpora sintetici deterministici
+# ---------------------------------------------------------------------------
+
+_WORDS = (
+    "crystal prism prime nodulo cluster spectrum kernel signature lattice "
+    "basis black white light filter orbit band depth mass support"
+).split()
+
+# Byte altamente composti: molte valutazioni p-adiche non nulle.
+_COMPOSITE = bytes((2, 4, 6, 12, 24, 36, 48, 60, 120, 180, 240))
+
+
+def _repeat_to(pattern: bytes, size: int) -> bytes:
+    return (pattern * (size // len(pattern) + 1))[:size]
+
+
+def make_corpus(kind: str, size: int, seed: int = 0) -> bytes:
+    """Corpus deterministico di `size` byte."""
+    rng = random.Random(f"{kind}:{seed}")
+    if kind == "random":
+        return rng.randbytes(size)
+    if kind == "text":
+        text = " ".join(rng.choice(_WORDS) for _ in range(4096)).encode("ascii")
+        return _repeat_to(text, size)
+    if kind == "numeric":
+        digits = "".join(rng.choice("0123456789") for _ in range(1 << 16))
+        return _repeat_to(("1" + digits).encode("ascii"), size)
+    if kind == "composite":
+        return _repeat_to(bytes(rng.choice(_COMPOSITE) for _ in range(4096)), size)
+    raise ValueError(f"corpus sconosciuto: {kind!r}")
+
+
+# ---------------------------------------------------------------------------
+# Definizione dei benchmark
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    # setup(data) -> argomento passato a fn (escluso dalla misura)
+    setup: Callable[[bytes], Any]
+    fn: Callable[[Any], Any]
+    corpora: Tuple[str, ...] = CORPORA
+    max_size: int = 1 << 16
+
+
+def _cip_of(data: bytes) -> Dict:
+    return encode_block(data)["header"]["cip"]
+
+
+def _cluster_benchmark(dyn: str) -> Benchmark:
+    return Benchmark(
+        name=f"cluster_signature[{dyn}]",
+        setup=_cip_of,
+        fn=lambda cip: compute_cluster_signature(cip, dyn_name=dyn),
+        max_size=1 << 16,
+    )
+
+
+def _spectral(cip: Dict) -> Any:
+    return spectral_view(cip["primes"], cip["logic_signature"], mode="white")
+
+
+def _benchmarks() -> List[Benchmark]:
+    return [
+        Benchmark("encode_block", setup=lambda d: d, fn=encode_block),
+        Benchmark("decode_block", setup=encode_block, fn=decode_block),
+        Benchmark("build_exponent_matrix", setup=lambda d: d, fn=build_exponent_matrix),
+        Benchmark(
+            "compute_cids",
+            setup=build_exponent_matrix,
+            fn=lambda m_primes: compute_cids(*m_primes),
+        ),
+        *(_cluster_benchmark(dyn) for dyn in sorted(DYNAMICS)),
+        Benchmark(
+            "kernel_2310",
+            setup=lambda d: d,
+            fn=kernel_2310_from_buffer,
+            corpora=("numeric",),
+            max_size=1 << 26,
+        ),
+        Benchmark("spectral_view", setup=_cip_of, fn=_spectral),
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Misura
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Result:
+    name: str
+    corpus: str
+    size: int
+    seconds: float  # miglior tempo per chiamata
+    throughput_mb_s: float
+    peak_bytes: Optional[int]
+    loops: int
+    repeat: int
+
+
+def _time_call(fn: Callable[[Any], Any], arg: Any, repeat: int) -> Tuple[float, int]:
+    start = time.perf_counter()
+    fn(arg)
+    first = time.perf_counter() - start
+    loops = max(1, math.ceil(_MIN_REPEAT_SECONDS / first)) if first > 0 else 1000
+
+    best = first if loops == 1 else math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn(arg)
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best, loops
+
+
+def _peak_memory(fn: Callable[[Any], Any], arg: Any) -> int:
+    tracemalloc.start()
+    try:
+        fn(arg)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(
+    *,
+    sizes: Sequence[int],
+    max_size: Optional[int],
+    repeat: int,
+    only: Optional[Sequence[str]],
+    memory: bool,
+    log: Callable[[str], None] = print,
+) -> Dict[str, Any]:
+    results: List[Result] = []
+    corpus_cache: Dict[Tuple[str, int], bytes] = {}
+
+    for bench in _benchmarks():
+        if only and not any(bench.name.startswith(name) for name in only):
+            continue
+        limit = bench.max_size if max_size is None else max_size
+        for corpus in bench.corpora:
+            for size in sizes:
+                if size > limit:
+                    continue
+                data = corpus_cache.get((corpus, size))
+                if data is None:
+                    data = corpus_cache[(corpus, size)] = make_corpus(corpus, size)
+                arg = bench.setup(data)
+                seconds, loops = _time_call(bench.fn, arg, repeat)
+                peak = _peak_memory(bench.fn, arg) if memory else None
+                result = Result(
+                    name=bench.name,
+                    corpus=corpus,
+                    size=size,
+                    seconds=seconds,
+                    throughput_mb_s=size / seconds / 1e6 if seconds > 0 else math.inf,
+                    peak_bytes=peak,
+                    loops=loops,
+                    repeat=repeat,
+                )
+                results.append(result)
+                log(
+                    f"{bench.name:32s} {corpus:9s} {size:>10d} B "
+                    f"{seconds * 1e3:10.3f} ms {result.throughput_mb_s:10.2f} MB/s"
+                    + (f" peak={peak / 1024:.1f} KiB" if peak is not None else "")
+                )
+
+    return {
+        "meta": {
+            "gcc_v1_version": __version__,
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": [asdict(r) for r in results],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Confronto con una baseline
+# ---------------------------------------------------------------------------
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    *,
+    threshold: float,
+    min_seconds: float = 1e-5,
+    log: Callable[[str], None] = print,
+) -> List[Dict[str, Any]]:
+    """Restituisce le misure più lente della baseline oltre `threshold`.
+
+    Le misure sotto `min_seconds` in entrambi i file sono ignorate (rumore).
+    """
+
+    def index(doc: Dict[str, Any]) -> Dict[Tuple[str, str, int], Dict[str, Any]]:
+        return {(r["name"], r["corpus"], r["size"]): r for r in doc["results"]}
+
+    base = index(baseline)
+    regressions = []
+    for key, cur in sorted(index(current).items()):
+        old = base.get(key)
+        if old is None:
+            continue
+        if max(old["seconds"], cur["seconds"]) < min_seconds:
+            continue
+        ratio = cur["seconds"] / old["seconds"] if old["seconds"] > 0 else math.inf
+        flag = "REGRESSION" if ratio > 1 + threshold else ""
+        log(f"{key[0]:32s} {key[1]:9s} {key[2]:>10d} B  x{ratio:6.2f} {flag}")
+        if flag:
+            regressions.append({"key": list(key), "ratio": ratio})
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="esegue i benchmark e scrive JSON")
+    run_p.add_argument("-o", "--output", type=Path, help="file JSON di output")
+    run_p.add_argument("--quick", action="store_true", help="solo taglie piccole")
+    run_p.add_argument("--max-size", type=int, help="taglia massima per tutti")
+    run_p.add_argument("--repeat", type=int, default=5)
+    run_p.add_argument("--only", help="prefissi di nome separati da virgola")
+    run_p.add_argument("--no-memory", action="store_true", help="salta tracemalloc")
+
+    cmp_p = sub.add_parser("compare", help="confronta con una baseline")
+    cmp_p.add_argument("baseline", type=Path)
+    cmp_p.add_argument("current", type=Path)
+    cmp_p.add_argument("--threshold", type=float, default=0.15)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        doc = run_suite(
+            sizes=QUICK_SIZES if args.quick else SIZES,
+            max_size=args.max_size,
+            repeat=args.repeat,
+            only=args.only.split(",") if args.only else None,
+            memory=not args.no_memory,
+        )
+        if args.output:
+            args.output.write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    current = json.loads(args.current.read_text(encoding="utf-8"))
+    regressions = compare(baseline, current, threshold=args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regressioni oltre +{args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
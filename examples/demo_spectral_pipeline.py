@@ -12,6 +12,7 @@ from gcc_v1 import encode_block  # noqa: E402
 from lab.spectral_filters import (  # noqa: E402
     Spectrum,
     make_black_filter,
+    run_filter_orbit,
     run_filter_pipeline,
     spectrum_black,
     spectrum_white,
@@ -40,6 +41,10 @@ def main() -> None:
     for s in spectra:
         print(f"{s.mode}: active={s.active_primes}")
 
+    # Pipeline iterata: si ferma al primo stato ripetuto (orbita periodica).
+    orbit = run_filter_orbit(cip, invert_prev, steps=1_000_000)
+    print(f"orbit: mu={orbit.mu} lam={orbit.lam} final={orbit.final.active_primes}")
+
 
 if __name__ == "__main__":
     main()
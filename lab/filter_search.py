@@ -0,0 +1,382 @@
+"""
+Ricerca di filtri spettrografici per GCC v1.
+
+Con k primi esistono 2^k filtri F. Questo modulo cerca i filtri che
+ottimizzano un obiettivo sui conteggi di primi attivi di una o più CIP:
+
+- esaustiva in ordine di Gray code: tra un filtro e il successivo cambia un
+  solo bit j, quindi ogni conteggio si aggiorna con +/-(T1_j - T0_j) invece
+  di rivalutare l'intera firma (per k <= max_exhaustive_k);
+- beam search / greedy per k grandi (beam_width=1 è il greedy puro);
+- più processi per la ricerca esaustiva (intervalli disgiunti di Gray code).
+
+Gli obiettivi ricevono il vettore dei conteggi (uno per firma: ndarray con
+NumPy, altrimenti lista) e restituiscono un punteggio. Per usarli con più
+processi devono essere serializzabili (classi a livello di modulo, non lambda).
+Gli obiettivi con `batched = True` accettano anche una matrice (filtri ×
+firme) e restituiscono un punteggio per riga: con NumPy la ricerca esaustiva
+li valuta a blocchi di filtri consecutivi (somma cumulativa dei delta).
+
+Dipende solo da:
+
+    from gcc_v1.spectrum import PackedSignature, pack_signature, unpack_bits
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Sequence, Tuple
+
+from gcc_v1.spectrum import PackedSignature, pack_signature, unpack_bits
+
+try:  # NumPy è un'accelerazione opzionale.
+    import numpy as np
+except ImportError:  # pragma: no cover - dipende dall'ambiente
+    np = None
+
+# Obiettivo: conteggi per firma -> punteggio.
+Objective = Callable[[Any], float]
+
+# Sotto questa soglia di passi la ricerca esaustiva resta in un solo processo.
+_MIN_STEPS_PER_WORKER = 1 << 12
+
+# Celle (filtri × firme) per blocco nella valutazione esaustiva con NumPy.
+_BLOCK_CELLS = 1 << 18
+
+
+@dataclass(frozen=True)
+class FilterResult:
+    """Un filtro trovato dalla ricerca, con il suo punteggio."""
+
+    mask: int  # bit j = F[primes[j]]
+    score: float
+    filter_bits: Dict[int, int]  # F[p]
+    method: str  # "exhaustive" o "beam"
+
+
+# ---------------------------------------------------------------------------
+# Obiettivi
+# ---------------------------------------------------------------------------
+
+
+def _sum(values: Any) -> Any:
+    return values.sum(axis=-1) if hasattr(values, "sum") else float(sum(values))
+
+
+@dataclass(frozen=True)
+class ActiveCount:
+    """Totale dei primi attivi su tutte le firme."""
+
+    batched: ClassVar[bool] = True
+
+    def __call__(self, counts: Any) -> Any:
+        return _sum(counts)
+
+
+@dataclass(frozen=True)
+class Separation:
+    """Separazione tra il gruppo A (prime n_a firme) e il gruppo B (le altre).
+
+    margin=False: differenza delle medie dei conteggi (A - B);
+    margin=True:  min(A) - max(B), positivo solo se i gruppi non si toccano.
+    """
+
+    n_a: int
+    margin: bool = False
+
+    batched: ClassVar[bool] = True
+
+    def __call__(self, counts: Any) -> Any:
+        if hasattr(counts, "ndim"):
+            a = counts[..., : self.n_a]
+            b = counts[..., self.n_a :]
+            if self.margin:
+                return a.min(axis=-1) - b.max(axis=-1)
+            return a.mean(axis=-1) - b.mean(axis=-1)
+        a = counts[: self.n_a]
+        b = counts[self.n_a :]
+        if self.margin:
+            return float(min(a) - max(b))
+        return sum(a) / len(a) - sum(b) / len(b)
+
+
+# ---------------------------------------------------------------------------
+# Supporto comune
+# ---------------------------------------------------------------------------
+
+
+def signatures_from_cips(cips: Sequence[Dict]) -> List[PackedSignature]:
+    """Impacchetta le logic_signature di più CIP (stessa lista di primi)."""
+    if not cips:
+        raise ValueError("serve almeno una CIP")
+    primes = list(cips[0]["primes"])
+    sigs = []
+    for cip in cips:
+        if list(cip["primes"]) != primes:
+            raise ValueError("tutte le CIP devono avere la stessa lista di primi")
+        sigs.append(pack_signature(primes, cip["logic_signature"]))
+    return sigs
+
+
+def _counts_for(t0s: Sequence[int], t1s: Sequence[int], mask: int) -> Any:
+    pairs = zip(t0s, t1s, strict=True)
+    counts = [((t0 & ~mask) | (t1 & mask)).bit_count() for t0, t1 in pairs]
+    return np.asarray(counts, dtype=np.int64) if np is not None else counts
+
+
+def _bit_deltas(t0s: Sequence[int], t1s: Sequence[int], k: int) -> List[Any]:
+    """Per ogni bit j: variazione dei conteggi quando F_j passa da 0 a 1."""
+    deltas = []
+    for j in range(k):
+        pairs = zip(t0s, t1s, strict=True)
+        d = [((t1 >> j) & 1) - ((t0 >> j) & 1) for t0, t1 in pairs]
+        deltas.append(np.asarray(d, dtype=np.int64) if np is not None else d)
+    return deltas
+
+
+def _add(counts: Any, delta: Any, sign: int) -> Any:
+    if np is not None:
+        if sign > 0:
+            counts += delta
+        else:
+            counts -= delta
+        return counts
+    return [c + sign * d for c, d in zip(counts, delta, strict=True)]
+
+
+class _TopK:
+    """Migliori `size` filtri visti (min-heap su punteggio orientato)."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.heap: List[Tuple[float, int]] = []
+
+    def push(self, score: float, mask: int) -> None:
+        item = (score, -mask)  # a parità di punteggio vince la maschera minore
+        if len(self.heap) < self.size:
+            heapq.heappush(self.heap, item)
+        elif item > self.heap[0]:
+            heapq.heapreplace(self.heap, item)
+
+    def push_block(self, scores: Any, masks: Any) -> None:
+        """push() vettoriale: solo i candidati migliori del blocco."""
+        if len(scores) > self.size:
+            kth = np.partition(scores, len(scores) - self.size)[-self.size]
+            keep = np.flatnonzero(scores >= kth)
+            order = np.lexsort((masks[keep], -scores[keep]))[: self.size]
+            scores, masks = scores[keep[order]], masks[keep[order]]
+        for score, mask in zip(scores.tolist(), masks.tolist(), strict=True):
+            self.push(score, mask)
+
+    def items(self) -> List[Tuple[float, int]]:
+        return [(s, -m) for s, m in sorted(self.heap, reverse=True)]
+
+
+# ---------------------------------------------------------------------------
+# Ricerca esaustiva (Gray code)
+# ---------------------------------------------------------------------------
+
+
+def _gray_range(
+    t0s: Sequence[int],
+    t1s: Sequence[int],
+    k: int,
+    start: int,
+    stop: int,
+    objective: Objective,
+    sign: int,
+    top: int,
+) -> List[Tuple[float, int]]:
+    """Valuta i filtri gray(g) per g in [start, stop), un bit per passo."""
+    best = _TopK(top)
+    deltas = _bit_deltas(t0s, t1s, k)
+    mask = start ^ (start >> 1)
+    counts = _counts_for(t0s, t1s, mask)
+    best.push(sign * objective(counts), mask)
+
+    if np is not None and getattr(objective, "batched", False) and k < 63:
+        # A blocchi: conteggi del blocco = conteggi iniziali + cumsum dei delta.
+        D = np.stack(deltas)
+        block = max(1, _BLOCK_CELLS // max(1, len(t0s)))
+        for lo in range(start + 1, stop, block):
+            g = np.arange(lo, min(lo + block, stop), dtype=np.int64)
+            masks = g ^ (g >> 1)
+            j = np.log2(g & -g).astype(np.int64)  # bit cambiato al passo g
+            signs = np.where((masks >> j) & 1, 1, -1)
+            block_counts = counts + np.cumsum(signs[:, None] * D[j], axis=0)
+            best.push_block(sign * objective(block_counts), masks)
+            counts = block_counts[-1]
+        return best.items()
+
+    for g in range(start + 1, stop):
+        j = (g & -g).bit_length() - 1
+        mask ^= 1 << j
+        counts = _add(counts, deltas[j], 1 if (mask >> j) & 1 else -1)
+        best.push(sign * objective(counts), mask)
+    return best.items()
+
+
+def _exhaustive(
+    t0s: Sequence[int],
+    t1s: Sequence[int],
+    k: int,
+    objective: Objective,
+    sign: int,
+    top: int,
+    workers: int,
+) -> List[Tuple[float, int]]:
+    total = 1 << k
+    parts = max(1, min(workers, total // _MIN_STEPS_PER_WORKER))
+    if parts == 1:
+        return _gray_range(t0s, t1s, k, 0, total, objective, sign, top)
+
+    step = -(-total // parts)
+    bounds = [(lo, min(lo + step, total)) for lo in range(0, total, step)]
+    best = _TopK(top)
+    with ProcessPoolExecutor(max_workers=parts) as pool:
+        futures = [
+            pool.submit(_gray_range, t0s, t1s, k, lo, hi, objective, sign, top)
+            for lo, hi in bounds
+        ]
+        for fut in futures:
+            for score, mask in fut.result():
+                best.push(score, mask)
+    return best.items()
+
+
+# ---------------------------------------------------------------------------
+# Beam search / greedy
+# ---------------------------------------------------------------------------
+
+
+def _beam(
+    t0s: Sequence[int],
+    t1s: Sequence[int],
+    k: int,
+    objective: Objective,
+    sign: int,
+    top: int,
+    beam_width: int,
+    max_rounds: int,
+) -> List[Tuple[float, int]]:
+    """Parte da luce nera e bianca; a ogni giro prova tutti i flip di un bit."""
+    deltas = _bit_deltas(t0s, t1s, k)
+    best = _TopK(top)
+    seen: set[int] = set()
+
+    beam: List[Tuple[float, int, Any]] = []
+    for mask in sorted({0, (1 << k) - 1}):
+        counts = _counts_for(t0s, t1s, mask)
+        score = sign * objective(counts)
+        seen.add(mask)
+        best.push(score, mask)
+        beam.append((score, mask, counts))
+    beam.sort(key=lambda c: (c[0], -c[1]), reverse=True)
+
+    for _ in range(max_rounds):
+        candidates: List[Tuple[float, int, Any]] = []
+        for _score, mask, counts in beam:
+            for j in range(k):
+                new_mask = mask ^ (1 << j)
+                if new_mask in seen:
+                    continue
+                seen.add(new_mask)
+                sign_j = 1 if (new_mask >> j) & 1 else -1
+                new_counts = _add(
+                    counts.copy() if np is not None else counts, deltas[j], sign_j
+                )
+                score = sign * objective(new_counts)
+                best.push(score, new_mask)
+                candidates.append((score, new_mask, new_counts))
+        if not candidates:
+            break
+
+        candidates.sort(key=lambda c: (c[0], -c[1]), reverse=True)
+        new_beam = candidates[:beam_width]
+        if new_beam[0][0] <= beam[0][0] and beam_width == 1:
+            break  # greedy: nessun miglioramento locale
+        beam = new_beam
+
+    return best.items()
+
+
+# ---------------------------------------------------------------------------
+# API
+# ---------------------------------------------------------------------------
+
+
+def search_filters(
+    signatures: Sequence[PackedSignature],
+    objective: Objective,
+    *,
+    maximize: bool = True,
+    top: int = 1,
+    max_exhaustive_k: int = 20,
+    beam_width: int = 16,
+    max_rounds: Optional[int] = None,
+    workers: int = 1,
+) -> List[FilterResult]:
+    """Cerca i `top` filtri migliori per `objective` sulle firme date.
+
+    Esaustiva (Gray code) se k <= max_exhaustive_k, altrimenti beam search
+    con `beam_width` stati per giro (al più `max_rounds` giri, default k).
+    `workers` > 1 usa più processi per la ricerca esaustiva.
+    """
+    if not signatures:
+        raise ValueError("serve almeno una firma")
+    primes = list(signatures[0].primes)
+    k = len(primes)
+    if any(len(sig.primes) != k for sig in signatures):
+        raise ValueError("le firme devono avere gli stessi primi")
+    if top <= 0 or beam_width <= 0:
+        raise ValueError("top e beam_width devono essere positivi")
+
+    t0s = [sig.t0 for sig in signatures]
+    t1s = [sig.t1 for sig in signatures]
+    sign = 1 if maximize else -1
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+
+    if k <= max_exhaustive_k:
+        method = "exhaustive"
+        found = _exhaustive(t0s, t1s, k, objective, sign, top, workers)
+    else:
+        method = "beam"
+        rounds = k if max_rounds is None else max_rounds
+        found = _beam(t0s, t1s, k, objective, sign, top, beam_width, rounds)
+
+    return [
+        FilterResult(
+            mask=mask,
+            score=float(sign * score),
+            filter_bits=unpack_bits(primes, mask),
+            method=method,
+        )
+        for score, mask in found
+    ]
+
+
+def find_extreme_filters(
+    cips: Sequence[Dict], *, maximize: bool = True, **kwargs: Any
+) -> List[FilterResult]:
+    """Filtri che massimizzano (o minimizzano) i primi attivi sulle CIP."""
+    return search_filters(
+        signatures_from_cips(cips), ActiveCount(), maximize=maximize, **kwargs
+    )
+
+
+def find_separating_filters(
+    cips_a: Sequence[Dict],
+    cips_b: Sequence[Dict],
+    *,
+    margin: bool = False,
+    **kwargs: Any,
+) -> List[FilterResult]:
+    """Filtri che accendono più primi sulle CIP di A che su quelle di B."""
+    if not cips_a or not cips_b:
+        raise ValueError("servono CIP in entrambi i gruppi")
+    sigs = signatures_from_cips(list(cips_a) + list(cips_b))
+    return search_filters(sigs, Separation(len(cips_a), margin=margin), **kwargs)
@@ -5,22 +5,35 @@ Qui vivono:
 
 - la dataclass Spectrum (risultato di un singolo passaggio di filtro);
 - i filtri base (luce nera / luce bianca);
-- la pipeline dinamica f(Spectrum) -> nuovo filtro.
+- la pipeline dinamica f(Spectrum) -> nuovo filtro, con memo delle
+  transizioni e rilevamento dei cicli per le pipeline iterate.
+
+Le funzioni filtro sono trattate come pure: la transizione
+(funzione, filtro precedente, spettro precedente) -> nuovo filtro viene
+memorizzata in una PipelineCache e riusata tra passi, esecuzioni e CIP.
+Gli Spectrum sono frozen e ogni chiamata restituisce istanze proprie: il
+contenuto della cache non si può alterare dall'esterno.
 
 Dipende solo da:
 
-    from gcc_v1 import spectral_view
+    from gcc_v1.spectrum import pack_bits, pack_signature, summarize_packed, ...
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
 
-from gcc_v1 import spectral_view
+from gcc_v1.spectrum import (
+    PackedSignature,
+    pack_bits,
+    pack_signature,
+    summarize_packed,
+    unpack_bits,
+)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Spectrum:
     """Risultato di un singolo passaggio spettrografico attraverso il prisma."""
 
@@ -31,6 +44,8 @@ class Spectrum:
     active_count: int  # quanti p attivi
     inactive_count: int  # quanti p spenti
     bitvector: List[int]  # [out[p] in ordine primes]
+    filter_mask: int = 0  # F impacchettato (bit j = primes[j])
+    out_mask: int = 0  # out impacchettato
 
 
 # Firma dei filtri dinamici:
@@ -48,21 +63,48 @@ def make_white_filter(primes: List[int]) -> Dict[int, int]:
     return {p: 1 for p in primes}
 
 
-def _build_spectrum(
-    mode: str, primes: List[int], logic_signature: Dict, filter_bits: Dict[int, int]
+def _spectrum_from_mask(
+    mode: str,
+    primes: Sequence[int],
+    packed: PackedSignature,
+    filter_mask: int,
+    filter_bits: Optional[Dict[int, int]] = None,
 ) -> Spectrum:
-    """Wrapper che chiama spectral_view e incapsula il risultato in Spectrum."""
-    out_bits, summary = spectral_view(
-        primes, logic_signature, mode="custom", custom_bits=filter_bits
-    )
+    """Costruisce lo Spectrum di un filtro impacchettato."""
+    out_mask = packed.apply(filter_mask)
+    summary = summarize_packed(primes, out_mask)
+    if filter_bits is None:
+        filter_bits = unpack_bits(primes, filter_mask)
     return Spectrum(
         mode=mode,
         filter_bits=filter_bits,
-        out_bits=out_bits,
+        out_bits=unpack_bits(primes, out_mask),
         active_primes=summary["active_primes"],
         active_count=summary["active_count"],
         inactive_count=summary["inactive_count"],
         bitvector=summary["bitvector"],
+        filter_mask=filter_mask,
+        out_mask=out_mask,
+    )
+
+
+def _build_spectrum(
+    mode: str, primes: List[int], logic_signature: Dict, filter_bits: Dict[int, int]
+) -> Spectrum:
+    """Valuta un filtro F[p] sulla logic_signature e incapsula il risultato."""
+    packed = pack_signature(primes, logic_signature)
+    mask = pack_bits(primes, filter_bits)
+    return _spectrum_from_mask(mode, primes, packed, mask, filter_bits)
+
+
+def _detached(spec: Spectrum, filter_bits: Optional[Dict[int, int]] = None) -> Spectrum:
+    """Copia di uno Spectrum con contenitori propri (dict e liste nuovi)."""
+    return replace(
+        spec,
+        filter_bits=dict(spec.filter_bits if filter_bits is None else filter_bits),
+        out_bits=dict(spec.out_bits),
+        active_primes=list(spec.active_primes),
+        bitvector=list(spec.bitvector),
     )
 
 
@@ -90,7 +132,64 @@ def spectrum_custom(cip: Dict, mode_name: str, filter_bits: Dict[int, int]) -> S
     return _build_spectrum(mode_name, primes, logic_sig, F_norm)
 
 
-def run_filter_pipeline(cip: Dict, filter_fns: List[FilterFn]) -> List[Spectrum]:
+# ---------------------------------------------------------------------------
+# Pipeline con memo e rilevamento dei cicli
+# ---------------------------------------------------------------------------
+
+
+class PipelineCache:
+    """Memo condivisa tra passi, esecuzioni e CIP.
+
+    - transizioni: (f, primes, stato precedente) -> (maschera del nuovo
+      filtro, dict restituito da f);
+    - spettri: (modo, primes, T0, T1, filtro) -> Spectrum.
+
+    `step` restituisce sempre una copia (frozen, con contenitori propri)
+    dello Spectrum memorizzato, con `filter_bits` uguale al dict di f.
+    """
+
+    def __init__(self) -> None:
+        self.transitions: Dict[Tuple[Hashable, ...], Tuple[int, Dict[int, int]]] = {}
+        self.spectra: Dict[Tuple[Hashable, ...], Spectrum] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def step(
+        self,
+        f: FilterFn,
+        mode: str,
+        prev: Optional[Spectrum],
+        primes: Sequence[int],
+        packed: PackedSignature,
+    ) -> Spectrum:
+        primes_key = tuple(primes)
+        state = None if prev is None else (prev.filter_mask, prev.out_mask)
+        t_key = (f, primes_key, state)
+        transition = self.transitions.get(t_key)
+        if transition is None:
+            self.misses += 1
+            filter_bits = dict(f(prev, list(primes)))
+            transition = (pack_bits(primes, filter_bits), filter_bits)
+            self.transitions[t_key] = transition
+        else:
+            self.hits += 1
+        mask, filter_bits = transition
+
+        s_key = (mode, primes_key, packed.t0, packed.t1, mask)
+        spec = self.spectra.get(s_key)
+        if spec is None:
+            spec = _spectrum_from_mask(mode, primes, packed, mask)
+            self.spectra[s_key] = spec
+        return _detached(spec, filter_bits)
+
+
+def _mode_name(f: FilterFn, idx: int) -> str:
+    return getattr(f, "__name__", f"step_{idx}")
+
+
+def run_filter_pipeline(
+    cip: Dict, filter_fns: List[FilterFn], *, cache: Optional[PipelineCache] = None
+) -> List[Spectrum]:
     """Esegue una pipeline di filtri dipendenti dallo Spectrum precedente.
 
     Esempio:
@@ -103,17 +202,140 @@ def run_filter_pipeline(cip: Dict, filter_fns: List[FilterFn]) -> List[Spectrum]
             return {p: 1 - prev.out_bits[p] for p in primes}
 
         spectra = run_filter_pipeline(cip, [f0, f1])
+
+    Le transizioni già viste (anche in altre esecuzioni con la stessa
+    `cache`) non richiamano la funzione filtro.
     """
     primes = cip["primes"]
-    logic_sig = cip["logic_signature"]
+    packed = pack_signature(primes, cip["logic_signature"])
+    if cache is None:
+        cache = PipelineCache()
 
     spectra: List[Spectrum] = []
     prev: Optional[Spectrum] = None
     for idx, f in enumerate(filter_fns):
-        F = f(prev, primes)
-        mode_name = getattr(f, "__name__", f"step_{idx}")
-        spec = _build_spectrum(mode_name, primes, logic_sig, F)
+        spec = cache.step(f, _mode_name(f, idx), prev, primes, packed)
         spectra.append(spec)
         prev = spec
 
     return spectra
+
+
+@dataclass(frozen=True)
+class PipelineOrbit:
+    """Orbita di una pipeline iterata: transiente + ciclo, senza ripetizioni.
+
+    spectra[:mu] è il transiente, spectra[mu:] il ciclo di periodo lam
+    (lam = 0 se entro `steps` passi nessuno stato si è ripetuto).
+    Lo spettro al passo n si ottiene con orbit[n] in O(1).
+    """
+
+    spectra: List[Spectrum]
+    mu: int
+    lam: int
+    steps: int
+
+    def __len__(self) -> int:
+        return self.steps
+
+    def __getitem__(self, n: int) -> Spectrum:
+        if n < 0:
+            n += self.steps
+        if not 0 <= n < self.steps:
+            raise IndexError(f"passo fuori range: {n}")
+        if n < len(self.spectra):
+            return self.spectra[n]
+        return self.spectra[self.mu + (n - self.mu) % self.lam]
+
+    @property
+    def final(self) -> Spectrum:
+        return self[self.steps - 1]
+
+
+def run_filter_orbit(
+    cip: Dict,
+    step_fn: FilterFn,
+    steps: int,
+    *,
+    init_fn: Optional[FilterFn] = None,
+    cache: Optional[PipelineCache] = None,
+) -> PipelineOrbit:
+    """Itera step_fn per `steps` passi (il primo può essere init_fn).
+
+    Lo stato è lo Spectrum (modo, filtro, uscita): appena uno stato si
+    ripete l'orbita è periodica e l'iterazione si ferma, quindi il costo è
+    O(mu + lam) invece di O(steps).
+    """
+    if steps <= 0:
+        raise ValueError(f"steps deve essere positivo: {steps}")
+    primes = cip["primes"]
+    packed = pack_signature(primes, cip["logic_signature"])
+    if cache is None:
+        cache = PipelineCache()
+
+    spectra: List[Spectrum] = []
+    seen: Dict[Tuple[str, int, int], int] = {}
+    prev: Optional[Spectrum] = None
+    mu, lam = 0, 0
+    for n in range(steps):
+        f = init_fn if (n == 0 and init_fn is not None) else step_fn
+        spec = cache.step(f, _mode_name(f, min(n, 1)), prev, primes, packed)
+        state = (spec.mode, spec.filter_mask, spec.out_mask)
+        if state in seen:
+            mu = seen[state]
+            lam = n - mu
+            break
+        seen[state] = n
+        spectra.append(spec)
+        prev = spec
+
+    return PipelineOrbit(spectra=spectra, mu=mu, lam=lam, steps=steps)
+
+
+def _group_by_signature(cips: Sequence[Dict]) -> Dict[Tuple, List[int]]:
+    """Indici delle CIP raggruppati per (primes, T0, T1) impacchettati."""
+    groups: Dict[Tuple, List[int]] = {}
+    for i, cip in enumerate(cips):
+        packed = pack_signature(cip["primes"], cip["logic_signature"])
+        groups.setdefault((packed.primes, packed.t0, packed.t1), []).append(i)
+    return groups
+
+
+def run_filter_pipeline_many(
+    cips: Sequence[Dict],
+    filter_fns: List[FilterFn],
+    *,
+    cache: Optional[PipelineCache] = None,
+) -> List[List[Spectrum]]:
+    """run_filter_pipeline su molte CIP: una sola esecuzione per firma distinta."""
+    if cache is None:
+        cache = PipelineCache()
+    results: List[List[Spectrum]] = [[] for _ in cips]
+    for indices in _group_by_signature(cips).values():
+        spectra = run_filter_pipeline(cips[indices[0]], filter_fns, cache=cache)
+        for i in indices:
+            results[i] = [_detached(spec) for spec in spectra]
+    return results
+
+
+def run_filter_orbit_many(
+    cips: Sequence[Dict],
+    step_fn: FilterFn,
+    steps: int,
+    *,
+    init_fn: Optional[FilterFn] = None,
+    cache: Optional[PipelineCache] = None,
+) -> List[PipelineOrbit]:
+    """run_filter_orbit su molte CIP, condividendo orbite e transizioni."""
+    if cache is None:
+        cache = PipelineCache()
+    results: Dict[int, PipelineOrbit] = {}
+    for indices in _group_by_signature(cips).values():
+        orbit = run_filter_orbit(
+            cips[indices[0]], step_fn, steps, init_fn=init_fn, cache=cache
+        )
+        for i in indices:
+            results[i] = replace(
+                orbit, spectra=[_detached(spec) for spec in orbit.spectra]
+            )
+    return [results[i] for i in range(len(cips))]
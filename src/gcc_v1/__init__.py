@@ -1,25 +1,67 @@
 """GiadaWare Crystal Codec (GCC v1) - Python prototype."""
 
+from .archive import ArchiveIndex, ArchiveReader
+from .cip_store import CIPStore
 from .codec import decode_block, encode_block
+from .compact import CompactCIP, compact_cip
 from .kernel2310 import (
     MOD_2310,
     PRIMES_PENTAGON,
+    PrismBatch2310,
+    kernel_2310_batch,
+    kernel_2310_batch_from_file,
+    kernel_2310_from_buffer,
     kernel_2310_from_digits,
+    kernel_2310_from_file,
+    kernel_2310_parallel,
     state_to_prism_signature_2310,
     update_state_2310,
+    update_state_2310_buffer,
 )
-from .spectrum import apply_filter, build_filter_bits, spectral_view, summarize_spectrum
+from .kernelcrt import CRTKernel, CRTSignature
+from .prefix2310 import PrefixStateIndex2310
+from .spectrum import (
+    PackedSignature,
+    apply_filter,
+    batch_active_counts,
+    build_filter_bits,
+    pack_signature,
+    spectral_view,
+    summarize_spectrum,
+)
+from .stats import EncodeStats, install_stats, uninstall_stats
 
 __all__ = [
     "encode_block",
     "decode_block",
+    "CompactCIP",
+    "compact_cip",
+    "CIPStore",
+    "ArchiveIndex",
+    "ArchiveReader",
     "MOD_2310",
     "PRIMES_PENTAGON",
     "update_state_2310",
     "state_to_prism_signature_2310",
     "kernel_2310_from_digits",
+    "update_state_2310_buffer",
+    "kernel_2310_from_buffer",
+    "kernel_2310_parallel",
+    "kernel_2310_from_file",
+    "PrismBatch2310",
+    "kernel_2310_batch",
+    "kernel_2310_batch_from_file",
+    "CRTKernel",
+    "CRTSignature",
+    "PrefixStateIndex2310",
     "build_filter_bits",
     "apply_filter",
     "summarize_spectrum",
     "spectral_view",
+    "PackedSignature",
+    "pack_signature",
+    "batch_active_counts",
+    "EncodeStats",
+    "install_stats",
+    "uninstall_stats",
 ]
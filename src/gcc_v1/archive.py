@@ -0,0 +1,206 @@
+"""Accesso casuale per intervalli di byte a un contenitore GCC.
+
+`ArchiveIndex` tiene, per ogni blocco del contenitore, l'offset del record
+nel file e la fine cumulativa del blocco nei dati originali:
+
+    ends[i] = block_len[0] + ... + block_len[i]
+
+Un intervallo [start, stop) dei dati originali corrisponde ai blocchi da
+`bisect_right(ends, start)` a `bisect_left(ends, stop)`: `ArchiveReader`
+decodifica solo quelli e restituisce una memoryview sul risultato (senza
+copie se l'intervallo sta in un solo blocco). Costo O(intervallo), non
+O(file).
+
+L'indice si costruisce scorrendo i record (i dati binari vengono saltati con
+seek) e si può salvare accanto al contenitore in un file memory-mappable.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, BinaryIO, Tuple
+
+from .codec import decode_block
+from .container import read_block_at, scan_blocks
+
+try:  # NumPy è un'accelerazione opzionale.
+    import numpy as np
+except ImportError:  # pragma: no cover - dipende dall'ambiente
+    np = None
+
+__all__ = ["ArchiveIndex", "ArchiveReader"]
+
+# Header: magic, numero di blocchi; seguono offsets[count] e ends[count] (u8).
+_MAGIC = b"GCCAIX01"
+_HEADER = struct.Struct("<8sQ")
+
+
+class ArchiveIndex:
+    """Offset dei record e fini cumulative dei blocchi di un contenitore."""
+
+    def __init__(self, offsets: Any = None, ends: Any = None) -> None:
+        self.offsets = offsets if offsets is not None else array("Q")
+        self.ends = ends if ends is not None else array("Q")
+        if len(self.offsets) != len(self.ends):
+            raise ValueError("offsets e ends devono avere la stessa lunghezza")
+        self._mmap: mmap.mmap | None = None
+
+    @classmethod
+    def build(cls, fh: BinaryIO) -> ArchiveIndex:
+        """Scorre il contenitore (seekable) senza decodificare i residui."""
+        offsets = array("Q")
+        ends = array("Q")
+        total = 0
+        for offset, block_len in scan_blocks(fh):
+            total += block_len
+            offsets.append(offset)
+            ends.append(total)
+        return cls(offsets, ends)
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+    @property
+    def total_size(self) -> int:
+        """Lunghezza dei dati originali."""
+        return int(self.ends[-1]) if len(self.ends) else 0
+
+    def block_start(self, i: int) -> int:
+        return int(self.ends[i - 1]) if i else 0
+
+    def locate(self, start: int, stop: int) -> Tuple[int, int]:
+        """Blocchi [first, last) che coprono l'intervallo di byte [start, stop)."""
+        total = self.total_size
+        if not 0 <= start <= stop <= total:
+            raise ValueError(
+                f"intervallo non valido: [{start}, {stop}) su {total} byte"
+            )
+        if start == stop:
+            return 0, 0
+        if np is not None and isinstance(self.ends, np.ndarray):
+            first = int(np.searchsorted(self.ends, start, side="right"))
+            last = int(np.searchsorted(self.ends, stop, side="left"))
+        else:
+            first = bisect_right(self.ends, start)
+            last = bisect_left(self.ends, stop)
+        return first, last + 1
+
+    # -- persistenza -------------------------------------------------------------
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Scrive header + offsets + ends (u8 little-endian)."""
+        with open(path, "wb") as fh:
+            fh.write(_HEADER.pack(_MAGIC, len(self)))
+            for column in (self.offsets, self.ends):
+                data = array("Q", column)
+                if sys.byteorder != "little":
+                    data.byteswap()
+                fh.write(data.tobytes())
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> ArchiveIndex:
+        """Apre un indice salvato mappandolo in memoria (sola lettura)."""
+        with open(path, "rb") as fh:
+            magic, count = _HEADER.unpack(fh.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"file indice non riconosciuto: {path}")
+            if count == 0:
+                return cls()
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        base = _HEADER.size
+        size = 8 * count
+        if np is not None:
+            offsets = np.frombuffer(mm, dtype="<u8", count=count, offset=base)
+            ends = np.frombuffer(mm, dtype="<u8", count=count, offset=base + size)
+        elif sys.byteorder == "little":
+            view = memoryview(mm)
+            offsets = view[base : base + size].cast("Q")
+            ends = view[base + size : base + 2 * size].cast("Q")
+        else:  # pragma: no cover - piattaforme big-endian senza NumPy
+            offsets = array("Q", mm[base : base + size])
+            ends = array("Q", mm[base + size : base + 2 * size])
+            offsets.byteswap()
+            ends.byteswap()
+        index = cls(offsets, ends)
+        index._mmap = mm
+        return index
+
+    def close(self) -> None:
+        """Rilascia la mappatura del file, copiando prima l'indice in memoria."""
+        if self._mmap is None:
+            return
+        self.offsets = array("Q", (int(v) for v in self.offsets))
+        self.ends = array("Q", (int(v) for v in self.ends))
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Esistono ancora viste esportate: la mappa resta aperta.
+            pass
+        self._mmap = None
+
+    def __enter__(self) -> ArchiveIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class ArchiveReader:
+    """Lettura di intervalli di byte dei dati originali da un contenitore.
+
+    Esempio:
+
+        with ArchiveReader("big.gcc") as reader:
+            chunk = reader.read_range(1_000_000, 1_065_536)  # memoryview
+    """
+
+    def __init__(
+        self, path: str | os.PathLike[str], index: ArchiveIndex | None = None
+    ) -> None:
+        self._fh = open(path, "rb")
+        try:
+            self.index = index if index is not None else ArchiveIndex.build(self._fh)
+        except BaseException:
+            self._fh.close()
+            raise
+
+    def __len__(self) -> int:
+        return self.index.total_size
+
+    def read_block(self, i: int) -> bytes:
+        """Decodifica il blocco i."""
+        data = decode_block(read_block_at(self._fh, int(self.index.offsets[i])))
+        expected = int(self.index.ends[i]) - self.index.block_start(i)
+        if len(data) != expected:
+            raise ValueError(
+                f"blocco {i}: {len(data)} byte, l'indice ne prevede {expected}"
+            )
+        return data
+
+    def read_range(self, start: int, stop: int) -> memoryview:
+        """Byte [start, stop) dei dati originali, decodificando solo i blocchi utili."""
+        first, last = self.index.locate(start, stop)
+        if first == last:
+            return memoryview(b"")
+        base = self.index.block_start(first)
+        if last - first == 1:
+            return memoryview(self.read_block(first))[start - base : stop - base]
+        out = bytearray()
+        for i in range(first, last):
+            out += self.read_block(i)
+        return memoryview(out)[start - base : stop - base]
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def __enter__(self) -> ArchiveReader:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,369 @@
+"""Store colonnare su disco per corpora di CIP (append + letture zero-copy).
+
+Un corpus è una directory con una colonna per file, valori little-endian a
+larghezza fissa, e un `manifest.json`:
+
+    H_total      u4   (N,)
+    total_mass   u8   (N,)
+    logic_mode   u1   (N,)     indice in manifest["logic_modes"]
+    logic_t0     u8   (N,)     logic_signature impacchettata (bit j = primes[j])
+    logic_t1     u8   (N,)
+    fingerprint  u1   (N, 32)  matrix_fingerprint grezzo
+    H_p, Mass_p, Supp_p, mu_p_q, sigma_p_q
+                 u4   (N, k)   campi CID per primo (Mass_p = col_mass)
+    row_end      u8   (N,)     fine della riga i nella side table row_mass
+    row_mass     u4   (R,)     side table a larghezza variabile
+    cluster_code u8   (N,)     solo se il corpus ha cluster signature
+
+Tutte le CIP di un corpus condividono la stessa base di primi (k <= 64). Il
+numero di righe valide è quello del manifest: dati accodati oltre (es. dopo
+un'interruzione) vengono ignorati in lettura.
+
+`column(name)` mappa il file in memoria: con NumPy restituisce un ndarray
+senza copia, altrimenti una memoryview tipizzata (stessi valori).
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import sys
+from array import array
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .compact import CID_FIELDS, CompactCIP
+
+try:  # NumPy è un'accelerazione opzionale.
+    import numpy as np
+except ImportError:  # pragma: no cover - dipende dall'ambiente
+    np = None
+
+__all__ = ["CIPStore"]
+
+_FORMAT = "gcc-cip-store"
+_MANIFEST = "manifest.json"
+_FINGERPRINT_BYTES = 32
+_MAX_PRIMES = 64
+
+# typecode array.array -> dtype NumPy little-endian
+_DTYPES = {"B": "<u1", "I": "<u4", "Q": "<u8"}
+
+
+def _columns(k: int, with_cluster: bool) -> Dict[str, Tuple[str, int]]:
+    """nome -> (typecode, valori per riga); 0 = side table a lunghezza variabile."""
+    cols = {
+        "H_total": ("I", 1),
+        "total_mass": ("Q", 1),
+        "logic_mode": ("B", 1),
+        "logic_t0": ("Q", 1),
+        "logic_t1": ("Q", 1),
+        "fingerprint": ("B", _FINGERPRINT_BYTES),
+    }
+    for name in CID_FIELDS:
+        cols[name] = ("I", k)
+    cols["row_end"] = ("Q", 1)
+    cols["row_mass"] = ("I", 0)
+    if with_cluster:
+        cols["cluster_code"] = ("Q", 1)
+    return cols
+
+
+def _le_bytes(values: array) -> bytes:
+    if sys.byteorder != "little" and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _typed(values: Iterable[int], typecode: str, name: str) -> array:
+    try:
+        return array(typecode, values)
+    except OverflowError:
+        raise ValueError(f"valore fuori range per la colonna {name!r}") from None
+
+
+class CIPStore:
+    """Corpus di CIP in colonne memory-mappable.
+
+    Esempio:
+
+        store = CIPStore.create("corpus", primes)
+        store.extend(cips)
+        store.column("Mass_p").sum(axis=0)   # massa totale per primo
+        store.cip(42)                        # CompactCIP della riga 42
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+        manifest = json.loads((self.path / _MANIFEST).read_text(encoding="utf-8"))
+        if manifest.get("format") != _FORMAT:
+            raise ValueError(f"corpus CIP non riconosciuto: {self.path}")
+        self.primes: Tuple[int, ...] = tuple(manifest["primes"])
+        self.logic_modes: List[str] = list(manifest["logic_modes"])
+        self.cluster_max_band: Optional[int] = manifest.get("cluster_max_band")
+        self._count = int(manifest["count"])
+        self._rows = int(manifest["rows"])
+        self._with_cluster = bool(manifest["with_cluster"])
+        self._layout = _columns(len(self.primes), self._with_cluster)
+        self._maps: Dict[str, mmap.mmap] = {}
+
+    @classmethod
+    def create(
+        cls,
+        path: str | os.PathLike[str],
+        primes: Sequence[int],
+        *,
+        with_cluster: bool = False,
+    ) -> CIPStore:
+        """Crea un corpus vuoto per la base `primes`."""
+        if len(primes) > _MAX_PRIMES:
+            raise ValueError(
+                f"al più {_MAX_PRIMES} primi per corpus, ricevuti {len(primes)}"
+            )
+        root = Path(path)
+        root.mkdir(parents=True, exist_ok=True)
+        if (root / _MANIFEST).exists():
+            raise ValueError(f"corpus già esistente: {root}")
+        for name in _columns(len(primes), with_cluster):
+            (root / f"{name}.bin").write_bytes(b"")
+        store_manifest = {
+            "format": _FORMAT,
+            "version": 1,
+            "primes": [int(p) for p in primes],
+            "logic_modes": [],
+            "with_cluster": with_cluster,
+            "cluster_max_band": None,
+            "count": 0,
+            "rows": 0,
+        }
+        _write_manifest(root, store_manifest)
+        return cls(root)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def with_cluster(self) -> bool:
+        return self._with_cluster
+
+    # -- scrittura -------------------------------------------------------------
+
+    def append(
+        self, cip: Mapping[str, Any], cluster: Optional[Mapping[str, Any]] = None
+    ) -> None:
+        self.extend([cip], None if cluster is None else [cluster])
+
+    def extend(
+        self,
+        cips: Iterable[Mapping[str, Any]],
+        clusters: Optional[Iterable[Mapping[str, Any]]] = None,
+    ) -> None:
+        """Accoda CIP (dict o CompactCIP) e, se il corpus li prevede, i cluster."""
+        if clusters is not None and not self._with_cluster:
+            raise ValueError("corpus creato senza cluster signature")
+        if self._with_cluster and clusters is None:
+            raise ValueError("questo corpus richiede una cluster signature per CIP")
+
+        k = len(self.primes)
+        buffers = {name: array(tc) for name, (tc, _) in self._layout.items()}
+        fingerprints = bytearray()
+        rows = self._rows
+        count = 0
+        cluster_iter = iter(clusters) if clusters is not None else None
+
+        for cip in cips:
+            compact = CompactCIP.from_dict(cip)
+            if compact.primes != self.primes:
+                msg = f"base di primi diversa da quella del corpus: {compact.primes}"
+                raise ValueError(msg)
+            if len(compact.fingerprint) != _FINGERPRINT_BYTES:
+                raise ValueError("matrix_fingerprint mancante o non SHA-256")
+
+            buffers["H_total"].append(compact.H_total)
+            buffers["total_mass"].append(compact.total_mass)
+            buffers["logic_mode"].append(self._mode_index(compact.logic_mode))
+            buffers["logic_t0"].append(compact.t0)
+            buffers["logic_t1"].append(compact.t1)
+            fingerprints += compact.fingerprint
+            for f, name in enumerate(CID_FIELDS):
+                buffers[name].extend(
+                    _typed(compact.cid[f * k : (f + 1) * k], "I", name)
+                )
+            buffers["row_mass"].extend(_typed(compact.row_mass, "I", "row_mass"))
+            rows += len(compact.row_mass)
+            buffers["row_end"].append(rows)
+
+            if cluster_iter is not None:
+                cluster = next(cluster_iter, None)
+                if cluster is None:
+                    raise ValueError("meno cluster signature che CIP")
+                self._check_cluster(cluster)
+                buffers["cluster_code"].append(int(cluster["code"]))
+            count += 1
+
+        if count == 0:
+            return
+        buffers["fingerprint"] = array("B", fingerprints)
+        for name, values in buffers.items():
+            with open(self.path / f"{name}.bin", "r+b") as fh:
+                # Si scrive alla fine dei dati validi (scarta code interrotte).
+                fh.seek(self._valid_bytes(name))
+                fh.write(_le_bytes(values))
+                fh.truncate()
+        self._count += count
+        self._rows = rows
+        self.close()
+        self._save_manifest()
+
+    def _mode_index(self, mode: str) -> int:
+        try:
+            return self.logic_modes.index(mode)
+        except ValueError:
+            if len(self.logic_modes) >= 256:
+                raise ValueError("troppi logic_mode distinti nel corpus") from None
+            self.logic_modes.append(mode)
+            return len(self.logic_modes) - 1
+
+    def _check_cluster(self, cluster: Mapping[str, Any]) -> None:
+        max_band = int(cluster["max_band_index"])
+        if self.cluster_max_band is None:
+            self.cluster_max_band = max_band
+        elif max_band != self.cluster_max_band:
+            raise ValueError(
+                f"max_band_index {max_band} diverso da quello del corpus "
+                f"({self.cluster_max_band})"
+            )
+
+    def _save_manifest(self) -> None:
+        _write_manifest(
+            self.path,
+            {
+                "format": _FORMAT,
+                "version": 1,
+                "primes": list(self.primes),
+                "logic_modes": self.logic_modes,
+                "with_cluster": self._with_cluster,
+                "cluster_max_band": self.cluster_max_band,
+                "count": self._count,
+                "rows": self._rows,
+            },
+        )
+
+    # -- lettura ---------------------------------------------------------------
+
+    def _valid_values(self, name: str) -> int:
+        width = self._layout[name][1]
+        return self._rows if width == 0 else self._count * width
+
+    def _valid_bytes(self, name: str) -> int:
+        typecode = self._layout[name][0]
+        return self._valid_values(name) * array(typecode).itemsize
+
+    def column(self, name: str) -> Any:
+        """Colonna `name` mappata in memoria: shape (N,), (N, k) o (R,)."""
+        if name == "col_mass":
+            name = "Mass_p"
+        if name not in self._layout:
+            raise ValueError(f"colonna sconosciuta: {name!r}")
+        typecode, width = self._layout[name]
+        count = self._valid_values(name)
+        shape = [count] if width in (0, 1) else [self._count, width]
+
+        if count == 0:
+            if np is not None:
+                return np.zeros(shape, dtype=_DTYPES[typecode])
+            # memoryview non ammette dimensioni nulle: vista 1-D vuota.
+            return memoryview(array(typecode))
+
+        mm = self._map(name)
+        if np is not None:
+            arr = np.frombuffer(mm, dtype=_DTYPES[typecode], count=count)
+            return arr.reshape(shape)
+        raw = memoryview(mm)[: self._valid_bytes(name)]
+        if sys.byteorder != "little" and typecode != "B":  # pragma: no cover
+            values = array(typecode, raw.tobytes())
+            values.byteswap()
+            raw = memoryview(values).cast("B")
+        return raw.cast(typecode, shape)
+
+    def _map(self, name: str) -> mmap.mmap:
+        mm = self._maps.get(name)
+        if mm is None:
+            with open(self.path / f"{name}.bin", "rb") as fh:
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[name] = mm
+        return mm
+
+    def row_mass(self, i: int) -> Any:
+        """row_mass della CIP i (vista sulla side table)."""
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        ends = self.column("row_end")
+        start = int(ends[i - 1]) if i else 0
+        return self.column("row_mass")[start : int(ends[i])]
+
+    def cip(self, i: int) -> CompactCIP:
+        """Ricostruisce la CIP della riga i."""
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        k = len(self.primes)
+        cid = array("I")
+        for name in CID_FIELDS:
+            cid.extend(int(v) for v in self._row(name, i, k))
+        return CompactCIP(
+            version=1,
+            H_total=int(self.column("H_total")[i]),
+            primes=self.primes,
+            cid=cid,
+            row_mass=array("I", (int(v) for v in self.row_mass(i))),
+            logic_mode=self.logic_modes[int(self.column("logic_mode")[i])],
+            t0=int(self.column("logic_t0")[i]),
+            t1=int(self.column("logic_t1")[i]),
+            fingerprint=bytes(self._row("fingerprint", i, _FINGERPRINT_BYTES)),
+        )
+
+    def _row(self, name: str, i: int, width: int) -> Any:
+        col = self.column(name)
+        if np is not None:
+            return col[i]
+        # memoryview multidimensionale: niente indicizzazione per riga.
+        flat = col.cast("B").cast(col.format)
+        return flat[i * width : (i + 1) * width]
+
+    def cips(self) -> Iterator[CompactCIP]:
+        for i in range(self._count):
+            yield self.cip(i)
+
+    def close(self) -> None:
+        """Chiude le mappature (le viste ancora esportate le tengono aperte)."""
+        for mm in self._maps.values():
+            try:
+                mm.close()
+            except BufferError:
+                pass
+        self._maps.clear()
+
+    def __enter__(self) -> CIPStore:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _write_manifest(root: Path, manifest: Dict[str, Any]) -> None:
+    # Scrittura atomica: il manifest vecchio resta valido fino al replace.
+    tmp = root / (_MANIFEST + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, root / _MANIFEST)
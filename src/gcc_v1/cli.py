@@ -0,0 +1,238 @@
+"""Tool da riga di comando `gcc-v1`: encode, decode, inspect, verify.
+
+Tutti i comandi lavorano in streaming (file o stdin/stdout, "-"):
+
+    gcc-v1 encode big.bin -o big.gcc --format binary --workers 4 --stats
+    cat big.gcc | gcc-v1 decode > big.bin
+    gcc-v1 inspect big.gcc
+    gcc-v1 verify big.gcc --workers 4
+
+`encode` legge blocchi di `--block-size` byte; decode/inspect/verify
+riconoscono da soli il formato del contenitore (json o binary).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from typing import IO, Any, Dict, Iterator, Optional, Sequence
+
+from .codec import PRISM_SOURCES, __version__, decode_block, encode_block
+from .container import CONTAINER_FORMATS, dump_block, read_blocks
+from .parallel import ordered_map
+from .verify import verify_container
+
+__all__ = ["main"]
+
+DEFAULT_BLOCK_SIZE = 1 << 12
+
+
+# ---------------------------------------------------------------------------
+# Stream e parallelismo
+# ---------------------------------------------------------------------------
+
+
+def _open_in(path: str, stack: ExitStack) -> IO[bytes]:
+    if path == "-":
+        return sys.stdin.buffer
+    return stack.enter_context(open(path, "rb"))
+
+
+def _open_out(path: str, stack: ExitStack) -> IO[bytes]:
+    if path == "-":
+        return sys.stdout.buffer
+    return stack.enter_context(open(path, "wb"))
+
+
+def _iter_chunks(fh: IO[bytes], size: int) -> Iterator[bytes]:
+    while True:
+        chunk = fh.read(size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _encode_record(
+    block: bytes, fmt: str, options: Dict[str, Any]
+) -> tuple[int, bytes]:
+    return len(block), dump_block(encode_block(block, **options), fmt)
+
+
+class _Meter:
+    """Contatori per --stats (scritti su stderr)."""
+
+    def __init__(self) -> None:
+        self.blocks = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.start = time.perf_counter()
+
+    def add(self, bytes_in: int, bytes_out: int, blocks: int = 1) -> None:
+        self.blocks += blocks
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+
+    def report(self, command: str) -> None:
+        seconds = time.perf_counter() - self.start
+        rate = self.bytes_in / seconds / 1e6 if seconds > 0 else 0.0
+        print(
+            f"{command}: {self.blocks} blocchi, {self.bytes_in} B in, "
+            f"{self.bytes_out} B out, {seconds:.3f} s, {rate:.2f} MB/s",
+            file=sys.stderr,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Comandi
+# ---------------------------------------------------------------------------
+
+
+def _cmd_encode(args: argparse.Namespace, meter: _Meter) -> int:
+    options = {
+        "max_prime": args.max_prime,
+        "logic_op": args.logic,
+        "prism_source": args.prism_source,
+        "with_cluster": args.with_cluster,
+    }
+    fn = partial(_encode_record, fmt=args.format, options=options)
+    with ExitStack() as stack:
+        src = _open_in(args.input, stack)
+        dst = _open_out(args.output, stack)
+        pool = None
+        if args.workers > 1:
+            pool = stack.enter_context(ProcessPoolExecutor(max_workers=args.workers))
+        chunks = _iter_chunks(src, args.block_size)
+        for size, record in ordered_map(fn, chunks, pool, 4 * args.workers):
+            dst.write(record)
+            meter.add(size, len(record))
+        dst.flush()
+    return 0
+
+
+def _cmd_decode(args: argparse.Namespace, meter: _Meter) -> int:
+    with ExitStack() as stack:
+        src = _open_in(args.input, stack)
+        dst = _open_out(args.output, stack)
+        for gcc_obj in read_blocks(src):
+            data = decode_block(gcc_obj)
+            dst.write(data)
+            meter.add(len(data), len(data))
+        dst.flush()
+    return 0
+
+
+def _cmd_inspect(args: argparse.Namespace, meter: _Meter) -> int:
+    with ExitStack() as stack:
+        src = _open_in(args.input, stack)
+        dst = _open_out(args.output, stack)
+        for index, gcc_obj in enumerate(read_blocks(src)):
+            header = gcc_obj.get("header", {})
+            cip = header.get("cip", {})
+            summary = {
+                "index": index,
+                "block_len": header.get("block_len"),
+                "version": header.get("version"),
+                "prism_source": header.get("prism_source", "bytes"),
+                "logic_mode": cip.get("logic_signature", {}).get("logic_mode"),
+                "k": cip.get("k"),
+                "H_total": cip.get("H_total"),
+                "total_mass": cip.get("total_mass"),
+                "matrix_fingerprint": cip.get("matrix_fingerprint"),
+            }
+            line = json.dumps(summary).encode("utf-8") + b"\n"
+            dst.write(line)
+            meter.add(header.get("block_len") or 0, len(line))
+        dst.flush()
+    return 0
+
+
+def _cmd_verify(args: argparse.Namespace, meter: _Meter) -> int:
+    with ExitStack() as stack:
+        src = _open_in(args.input, stack)
+        report = verify_container(src, workers=args.workers, fail_fast=False)
+    meter.add(report.bytes_checked, 0, blocks=report.checked)
+    for failure in report.failures:
+        print(
+            f"blocco {failure.index}: {failure.check}: {failure.detail}",
+            file=sys.stderr,
+        )
+    if not report.ok:
+        print(
+            f"{len(report.failures)} blocchi non validi su {report.checked}",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+_COMMANDS = {
+    "encode": _cmd_encode,
+    "decode": _cmd_decode,
+    "inspect": _cmd_inspect,
+    "verify": _cmd_verify,
+}
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="gcc-v1", description="GiadaWare Crystal Codec (GCC v1)"
+    )
+    parser.add_argument("--version", action="version", version=__version__)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add(name: str, help: str) -> argparse.ArgumentParser:
+        p = sub.add_parser(name, help=help)
+        p.add_argument("input", nargs="?", default="-", help="file o '-' (stdin)")
+        p.add_argument("-o", "--output", default="-", help="file o '-' (stdout)")
+        p.add_argument("--stats", action="store_true", help="throughput su stderr")
+        return p
+
+    enc = add("encode", "codifica uno stream in blocchi GCC")
+    enc.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE)
+    enc.add_argument("--format", choices=CONTAINER_FORMATS, default="json")
+    enc.add_argument("--workers", type=int, default=1)
+    enc.add_argument(
+        "--max-prime", type=int, default=None, help="default 31 (11 con kernel2310)"
+    )
+    enc.add_argument("--logic", default=None, help="logic_mode registrato")
+    enc.add_argument("--prism-source", choices=PRISM_SOURCES, default="bytes")
+    enc.add_argument("--with-cluster", action="store_true")
+
+    add("decode", "ricostruisce i byte originali")
+    add("inspect", "una riga JSON di riepilogo per blocco")
+    ver = add("verify", "controlla block_len, hash, masse e fingerprint")
+    ver.add_argument("--workers", type=int, default=1)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if getattr(args, "block_size", 1) <= 0:
+        print("--block-size deve essere positivo", file=sys.stderr)
+        return 2
+    meter = _Meter()
+    try:
+        status = _COMMANDS[args.command](args, meter)
+    except BrokenPipeError:
+        # Lettore chiuso (es. `| head`): stdout punta a /dev/null, così il
+        # flush all'uscita dell'interprete non solleva di nuovo.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        os.close(devnull)
+        return 1
+    except (ValueError, OSError) as exc:
+        print(f"errore: {exc}", file=sys.stderr)
+        return 1
+    if args.stats:
+        meter.report(args.command)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
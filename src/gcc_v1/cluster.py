@@ -1,8 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import json
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import partial
 from math import isqrt
-from typing import Any, Mapping, Sequence
+from pathlib import Path
+from random import Random
+from typing import Any, Callable, Collection, Mapping, Sequence
 
 # Cluster Signature per GCC v1.
 #
@@ -14,7 +20,11 @@ from typing import Any, Mapping, Sequence
 #
 # La dinamica H(I_n) è parametrizzabile:
 # - "H-identity"       → A_n = A0 per tutti gli n;
-# - "H-band-quadratic" → dinamica quadratica sulle maschere di banda.
+# - "H-band-quadratic" → dinamica quadratica sulle maschere di banda;
+# - "H-monster-v1"     → dinamica quadratica globale sugli indici della base.
+#
+# Gli stati A_n sono bitmask intere e l'iterazione si ferma al primo stato
+# ripetuto: l'orbita è allora periodica e non può visitare stati nuovi.
 
 
 # ---------------------------------------------------------------------------
@@ -36,15 +46,6 @@ def _primes_up_to(n: int) -> list[int]:
     return [i for i, is_prime in enumerate(sieve) if is_prime]
 
 
-def _band_state_mask(active_primes: set[int], band: Sequence[int]) -> int:
-    """Converte A_n ∩ B_k in una maschera di bit locale (0..2^len-1)."""
-    mask = 0
-    for idx, p in enumerate(band):
-        if p in active_primes:
-            mask |= 1 << idx
-    return mask
-
-
 # ---------------------------------------------------------------------------
 # Codec binario per CV_n = (S0, ..., Sn)
 # ---------------------------------------------------------------------------
@@ -196,106 +197,208 @@ def build_bands(
     return bands
 
 
+@dataclass(frozen=True)
+class BandPlan:
+    """Schema di bande: modalità, ampiezza dei blocchi e troncamento opzionale."""
+
+    mode: str = "canonical"
+    band_size: int = 3
+    max_band: int | None = None
+
+    def build(self, primes: Sequence[int]) -> list[list[int]]:
+        """Bande B_0..B_n del piano sulla base `primes`."""
+        bands = build_bands(primes, mode=self.mode, band_size=self.band_size)
+        if self.max_band is not None:
+            bands = bands[: self.max_band + 1]
+        return bands
+
+
 # ---------------------------------------------------------------------------
 # Dinamica H e classificazione delle bande
 # ---------------------------------------------------------------------------
+#
+# Gli stati A_n sono bitmask intere sugli indici della base
+# `basis_list = sorted(∪ B_k)`: il bit i è acceso se basis_list[i] ∈ A_n.
+# Ogni banda occupa un sottoinsieme di bit (contiguo per le bande costruite da
+# build_bands), quindi la proiezione π_k(A_n) è uno shift + AND.
 
 
-def _init_band_masks(a0: set[int], bands: Sequence[Sequence[int]]) -> list[int]:
-    """Costruisce le maschere di banda iniziali a partire da A0."""
-    masks: list[int] = []
-    for band in bands:
+@dataclass(frozen=True)
+class _BandSlot:
+    """Posizione della banda B_k dentro la bitmask globale."""
+
+    positions: tuple[int, ...]  # bit globale per ciascun bit locale della banda
+    shift: int  # primo bit globale se le posizioni sono contigue, altrimenti -1
+
+    @property
+    def width(self) -> int:
+        return len(self.positions)
+
+    def project(self, state: int) -> int:
+        """Maschera locale mask_k = π_k(A_n) (0..2^len-1)."""
+        if self.shift >= 0:
+            return (state >> self.shift) & ((1 << len(self.positions)) - 1)
         mask = 0
-        for idx, p in enumerate(band):
-            if p in a0:
+        for idx, pos in enumerate(self.positions):
+            if (state >> pos) & 1:
                 mask |= 1 << idx
-        masks.append(mask)
-    return masks
+        return mask
+
+    def inject(self, state: int, mask: int) -> int:
+        """Sostituisce in `state` i bit della banda con la maschera locale."""
+        if self.shift >= 0:
+            full = ((1 << len(self.positions)) - 1) << self.shift
+            return (state & ~full) | (mask << self.shift)
+        for idx, pos in enumerate(self.positions):
+            if (mask >> idx) & 1:
+                state |= 1 << pos
+            else:
+                state &= ~(1 << pos)
+        return state
+
+
+def _band_layout(
+    bands: Sequence[Sequence[int]],
+) -> tuple[list[int], dict[int, int], list[_BandSlot]]:
+    """Costruisce basis_list, indice p -> bit e gli slot di banda."""
+    basis_list = sorted({int(p) for band in bands for p in band})
+    index = {p: i for i, p in enumerate(basis_list)}
 
+    slots: list[_BandSlot] = []
+    for band in bands:
+        positions = tuple(index[int(p)] for p in band)
+        shift = positions[0] if positions else 0
+        if positions != tuple(range(shift, shift + len(positions))):
+            shift = -1
+        slots.append(_BandSlot(positions=positions, shift=shift))
 
-def _step_band_quadratic_masks(
-    masks: list[int], bands: Sequence[Sequence[int]]
-) -> list[int]:
-    """Applica la H quadratica per banda: s' = s XOR (s AND rotl(s, 1))."""
-    new_masks: list[int] = []
-    for mask, band in zip(masks, bands, strict=False):
-        width = len(band)
-        if width <= 0:
-            new_masks.append(0)
-            continue
+    return basis_list, index, slots
 
-        if width == 1:
-            # Banda di un solo primo: la rotazione è identica,
-            # quindi s' = s XOR (s AND s) = s XOR s = 0.
-            new_masks.append(mask & 1)
-            continue
 
-        full = (1 << width) - 1
-        rot = ((mask << 1) | (mask >> (width - 1))) & full
-        quad = mask & rot
-        new_masks.append((mask ^ quad) & full)
+def _set_to_mask(active_primes: set[int], index: Mapping[int, int]) -> int:
+    """Converte un insieme di primi in bitmask; i primi fuori base sono ignorati."""
+    mask = 0
+    for p in active_primes:
+        i = index.get(p)
+        if i is not None:
+            mask |= 1 << i
+    return mask
 
-    return new_masks
 
+def _step_band_quadratic_mask(mask: int, width: int) -> int:
+    """Applica la H quadratica a una banda: s' = s XOR (s AND rotl(s, 1))."""
+    if width <= 0:
+        return 0
 
-def _masks_to_set(masks: Sequence[int], bands: Sequence[Sequence[int]]) -> set[int]:
-    """Ricostruisce A_n a partire dalle maschere di banda."""
-    result: set[int] = set()
-    for mask, band in zip(masks, bands, strict=False):
-        for idx, p in enumerate(band):
-            if mask & (1 << idx):
-                result.add(p)
-    return result
+    if width == 1:
+        # Banda di un solo primo: il bit resta invariato (punto fisso).
+        return mask & 1
 
+    full = (1 << width) - 1
+    rot = ((mask << 1) | (mask >> (width - 1))) & full
+    quad = mask & rot
+    return (mask ^ quad) & full
 
-def _step_monster_indices(
-    a: set[int], basis_list: Sequence[int], index: Mapping[int, int]
-) -> set[int]:
-    """Un passo di H-monster-v1 sugli indici globali.
 
-    - x[i] = 1 se basis_list[i] ∈ a, altrimenti 0.
-    - q[i] = XOR_j (x[j] & x[(i - j) mod K])
-    - y[i] = x[i] XOR q[i]
+# Tabella di "spread": bit i del byte -> bit 2i (per il quadrato in GF(2)).
+_SPREAD_8 = tuple(sum(((b >> i) & 1) << (2 * i) for i in range(8)) for b in range(256))
+
+
+def _gf2_square_cyclic(x: int, k: int) -> int:
+    """Auto-convoluzione ciclica in GF(2): q_i = XOR_j (x_j AND x_{(i-j) mod K}).
+
+    In GF(2)[t]/(t^K - 1) i termini misti x_j·x_l (j != l) compaiono due
+    volte e si annullano, quindi q(t) = x(t)^2 = Σ_j x_j t^{2j mod K}:
+    basta "spargere" i bit su posizioni pari e ripiegare modulo K.
     """
-    k = len(basis_list)
-    if k == 0:
-        return set()
+    spread = 0
+    shift = 0
+    while x:
+        spread |= _SPREAD_8[x & 0xFF] << shift
+        x >>= 8
+        shift += 16
+    return (spread & ((1 << k) - 1)) ^ (spread >> k)
+
+
+def _step_monster_mask(x: int, k: int) -> int:
+    """Un passo di H-monster-v1 sugli indici globali: y = x XOR Q(x)."""
+    if k <= 0:
+        return 0
+    return x ^ _gf2_square_cyclic(x, k)
 
-    x = [0] * k
-    for p in a:
-        i = index.get(p)
-        if i is not None:
-            x[i] = 1
 
-    q = [0] * k
-    for i in range(k):
-        acc = 0
-        for j in range(k):
-            if x[j] and x[(i - j) % k]:
-                acc ^= 1
-        q[i] = acc
+def _make_step(
+    dyn_name: str, slots: Sequence[_BandSlot], k: int
+) -> Callable[[int], int]:
+    """Restituisce la mappa H: stato -> stato successivo per la dinamica scelta."""
+    if dyn_name == "H-identity":
+        return _identity_step
+
+    if dyn_name == "H-band-quadratic":
 
-    y = [0] * k
-    for i in range(k):
-        y[i] = x[i] ^ q[i]
+        def step(state: int) -> int:
+            new_state = state
+            for slot in slots:
+                mask = _step_band_quadratic_mask(slot.project(state), slot.width)
+                new_state = slot.inject(new_state, mask)
+            return new_state
 
-    return {basis_list[i] for i in range(k) if y[i]}
+        return step
+
+    if dyn_name == "H-monster-v1":
+        return partial(_step_monster_mask, k=k)
+
+    msg = f"dinamica cluster non supportata: {dyn_name!r}"
+    raise ValueError(msg)
+
+
+def _identity_step(state: int) -> int:
+    return state
+
+
+def _orbit(
+    x0: int, step: Callable[[int], int], max_steps: int
+) -> tuple[list[int], int, int]:
+    """Segue l'orbita x0, H(x0), ... fino al primo stato ripetuto.
+
+    Restituisce (states, mu, lam):
+
+    - states: stati distinti visitati, al più max_steps + 1;
+    - mu: lunghezza del transiente (indice di ingresso nel ciclo);
+    - lam: periodo del ciclo, 0 se l'orizzonte finisce prima di chiuderlo.
+
+    Ogni stato successivo ripeterebbe il ciclo già visto, quindi `states`
+    contiene esattamente gli stati della traiettoria completa A_0..A_N.
+    """
+    seen = {x0: 0}
+    states = [x0]
+    x = x0
+    for n in range(1, max_steps + 1):
+        x = step(x)
+        first = seen.get(x)
+        if first is not None:
+            return states, first, n - first
+        seen[x] = n
+        states.append(x)
+    return states, len(states), 0
 
 
 def _run_dynamics(
-    a0: set[int],
-    bands: Sequence[Sequence[int]],
+    a0_mask: int,
+    slots: Sequence[_BandSlot],
     *,
     dyn_name: str,
     dyn_params: Mapping[str, Any] | None,
     max_steps: int,
-) -> list[set[int]]:
-    """Esegue la dinamica sugli insiemi A_n.
+) -> list[int]:
+    """Esegue la dinamica sulle bitmask A_n e restituisce gli stati visitati.
 
     Supporta:
     - "H-identity"        → A_n = A0 per tutti gli n,
     - "H-band-quadratic"  → per banda: s' = s XOR (s AND rotl(s, 1)),
     - "H-monster-v1"      → dinamica quadratica globale sugli indici della base.
+
+    L'iterazione si ferma appena l'orbita si chiude (o a max_steps).
     """
     if dyn_params is None:
         dyn_params = {}
@@ -303,49 +406,18 @@ def _run_dynamics(
     if max_steps < 0:
         max_steps = 0
 
-    # Caso banale: identità
-    if dyn_name == "H-identity":
-        return [set(a0) for _ in range(max_steps + 1)]
+    k = sum(slot.width for slot in slots)
+    step = _make_step(dyn_name, slots, k)
 
-    # Dinamica quadratica per banda (come già definito)
     if dyn_name == "H-band-quadratic":
-        masks = _init_band_masks(a0, bands)
-        seq: list[set[int]] = []
-        current_masks = masks
-        for step in range(max_steps + 1):
-            a_n = _masks_to_set(current_masks, bands)
-            seq.append(a_n)
-            if step == max_steps:
-                break
-            current_masks = _step_band_quadratic_masks(current_masks, bands)
-        return seq
-
-    # Dinamica "monster" globale sugli indici
-    if dyn_name == "H-monster-v1":
-        basis_set: set[int] = set()
-        for band in bands:
-            for p in band:
-                basis_set.add(int(p))
-        basis_list = sorted(basis_set)
-        if not basis_list:
-            return [set() for _ in range(max_steps + 1)]
-
-        index = {p: i for i, p in enumerate(basis_list)}
-
-        seq = []
-        current = set(a0)
-        for step in range(max_steps + 1):
-            seq.append(set(current))
-            if step == max_steps:
-                break
-            current = _step_monster_indices(current, basis_list, index)
-        return seq
+        # A_0 contiene solo i primi delle bande (le maschere locali).
+        a0_mask &= (1 << k) - 1
 
-    msg = f"dinamica cluster non supportata: {dyn_name!r}"
-    raise ValueError(msg)
+    states, _, _ = _orbit(a0_mask, step, max_steps)
+    return states
 
 
-def _classify_band_states_b0(masks: list[int]) -> int:
+def _classify_band_states_b0(masks: Collection[int]) -> int:
     """Classifica la banda 0 (solo primo 2).
 
     Stati possibili: {0, 1}
@@ -359,7 +431,7 @@ def _classify_band_states_b0(masks: list[int]) -> int:
     return 1
 
 
-def _classify_band_states(masks: list[int]) -> int:
+def _classify_band_states(masks: Collection[int]) -> int:
     """Classifica la banda k >= 1 in S_k ∈ {0, 1, 2, 3}.
 
     Convenzione:
@@ -391,6 +463,27 @@ def _classify_band_states(masks: list[int]) -> int:
     return 0
 
 
+def _classify_orbit(states: Sequence[int], slots: Sequence[_BandSlot]) -> list[int]:
+    """Classifica ogni banda a partire dagli stati distinti dell'orbita."""
+    cluster_vector: list[int] = []
+
+    for k, slot in enumerate(slots):
+        if not slot.positions:
+            cluster_vector.append(3)
+            continue
+
+        masks = {slot.project(state) for state in states}
+
+        if k == 0:
+            s_k = _classify_band_states_b0(masks)
+        else:
+            s_k = _classify_band_states(masks)
+
+        cluster_vector.append(s_k)
+
+    return cluster_vector
+
+
 def _compute_cluster_vector_from_dynamics(
     a0: set[int],
     bands: Sequence[Sequence[int]],
@@ -400,27 +493,462 @@ def _compute_cluster_vector_from_dynamics(
     max_steps: int,
 ) -> list[int]:
     """Calcola CV_n = (S0, ..., S_n) a partire da A0, bande e dinamica H."""
-    a_sequence = _run_dynamics(
-        a0, bands, dyn_name=dyn_name, dyn_params=dyn_params, max_steps=max_steps
+    _, index, slots = _band_layout(bands)
+    states = _run_dynamics(
+        _set_to_mask(a0, index),
+        slots,
+        dyn_name=dyn_name,
+        dyn_params=dyn_params,
+        max_steps=max_steps,
     )
+    return _classify_orbit(states, slots)
 
-    cluster_vector: list[int] = []
 
-    for k, band in enumerate(bands):
-        if not band:
-            cluster_vector.append(3)
+# ---------------------------------------------------------------------------
+# Tabella precomputata A0 -> (cluster_vector, code)
+# ---------------------------------------------------------------------------
+#
+# A parità di base, bande, dinamica e max_iter la Cluster Signature dipende
+# solo da A0, che ha al più 2^k stati (2048 per max_prime=31). La tabella
+# memoizza A0 (bitmask sulla base ordinata) -> (cluster_vector, code) e può
+# essere salvata/caricata in JSON per distribuirla già calcolata.
+
+# Oltre questa dimensione della base la tabella non viene usata di default.
+_TABLE_MAX_BITS = 16
+
+# Tabelle tenute in memoria da get_cluster_table (LRU, le meno usate escono).
+_TABLE_CACHE_SIZE = 32
+
+# Stati A0 ricalcolati per controllare una tabella caricata da file.
+_TABLE_CHECK_SAMPLE = 64
+
+
+@dataclass
+class ClusterSignatureTable:
+    """Memo A0 -> (cluster_vector, code) per una configurazione fissata."""
+
+    primes: list[int]  # base ordinata: il bit i di A0 corrisponde a primes[i]
+    band_mode: str
+    dyn_name: str
+    max_iter: int
+    max_band: int | None = None
+    band_size: int = 3
+    codes: dict[int, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.dyn_name not in DYNAMICS:
+            msg = f"dinamica cluster non supportata: {self.dyn_name!r}"
+            raise ValueError(msg)
+        self.primes = sorted({int(p) for p in self.primes})
+        bands = BandPlan(self.band_mode, self.band_size, self.max_band).build(
+            self.primes
+        )
+        self.bands = bands
+        self.max_band_index = len(bands) - 1
+        self._index = {p: i for i, p in enumerate(self.primes)}
+        self._entries: dict[int, tuple[list[int], int]] = {}
+        for mask, code in self.codes.items():
+            cv = decode_cluster_code(code, self.max_band_index)
+            self._entries[mask] = (cv, code)
+
+    @property
+    def key(self) -> tuple[tuple[int, ...], str, str, int, int | None, int]:
+        return (
+            tuple(self.primes),
+            self.band_mode,
+            self.dyn_name,
+            self.max_iter,
+            self.max_band,
+            self.band_size,
+        )
+
+    @property
+    def is_complete(self) -> bool:
+        return len(self.codes) == 1 << len(self.primes)
+
+    def mask_of(self, a0: set[int]) -> int:
+        """Bitmask di A0 sulla base della tabella."""
+        return _set_to_mask(a0, self._index)
+
+    def lookup(self, a0_mask: int) -> tuple[list[int], int]:
+        """Restituisce (cluster_vector, code) per A0, calcolandolo se manca."""
+        entry = self._entries.get(a0_mask)
+        if entry is None:
+            a0 = {p for i, p in enumerate(self.primes) if (a0_mask >> i) & 1}
+            cv = _compute_cluster_vector_from_dynamics(
+                a0,
+                self.bands,
+                dyn_name=self.dyn_name,
+                dyn_params=None,
+                max_steps=self.max_iter,
+            )
+            entry = (cv, encode_cluster_vector(cv))
+            self._entries[a0_mask] = entry
+            self.codes[a0_mask] = entry[1]
+        return list(entry[0]), entry[1]
+
+    def precompute(self) -> ClusterSignatureTable:
+        """Riempie la tabella su tutti i 2^k stati di A0."""
+        k = len(self.primes)
+        if k > _TABLE_MAX_BITS:
+            msg = f"base troppo grande per una tabella completa: {k} primi"
+            raise ValueError(msg)
+        for mask in range(1 << k):
+            self.lookup(mask)
+        return self
+
+    def check(self, sample: int | None = _TABLE_CHECK_SAMPLE, seed: int = 0) -> None:
+        """Controlla i codici memorizzati contro la configurazione della tabella.
+
+        Ogni maschera deve stare nei 2^k stati e ogni code nei 1 + 2n bit; poi
+        `sample` stati (tutti con sample=None) vengono ricalcolati dalla
+        dinamica. Solleva ValueError alla prima discrepanza.
+        """
+        k = len(self.primes)
+        code_limit = 1 << max(0, 1 + 2 * self.max_band_index)
+        for mask, code in self.codes.items():
+            if not 0 <= mask < 1 << k:
+                msg = f"maschera A0 {mask} fuori dai 2^{k} stati della base"
+                raise ValueError(msg)
+            if not 0 <= code < code_limit:
+                msg = (
+                    f"code {code} fuori range per max_band_index={self.max_band_index}"
+                )
+                raise ValueError(msg)
+
+        masks = sorted(self.codes)
+        if sample is not None and sample < len(masks):
+            masks = Random(seed).sample(masks, sample)
+        for mask in masks:
+            a0 = {p for i, p in enumerate(self.primes) if (mask >> i) & 1}
+            cv = _compute_cluster_vector_from_dynamics(
+                a0,
+                self.bands,
+                dyn_name=self.dyn_name,
+                dyn_params=None,
+                max_steps=self.max_iter,
+            )
+            if encode_cluster_vector(cv) != self.codes[mask]:
+                msg = (
+                    f"tabella incoerente con {self.dyn_name!r}: A0={mask} "
+                    f"ha code {self.codes[mask]}, atteso {encode_cluster_vector(cv)}"
+                )
+                raise ValueError(msg)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": "cluster-table-v1",
+            "primes": list(self.primes),
+            "band_mode": self.band_mode,
+            "dyn": self.dyn_name,
+            "max_iter": self.max_iter,
+            "max_band": self.max_band,
+            "band_size": self.band_size,
+            "codes": [[mask, code] for mask, code in sorted(self.codes.items())],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> ClusterSignatureTable:
+        max_band = data.get("max_band")
+        return cls(
+            primes=[int(p) for p in data.get("primes", [])],
+            band_mode=str(data.get("band_mode", "canonical")),
+            dyn_name=str(data.get("dyn", "H-identity")),
+            max_iter=int(data.get("max_iter", 32)),
+            max_band=None if max_band is None else int(max_band),
+            band_size=int(data.get("band_size", 3)),
+            codes={int(m): int(c) for m, c in data.get("codes", [])},
+        )
+
+
+_TABLE_CACHE: OrderedDict[
+    tuple[tuple[int, ...], str, str, int, int | None, int], ClusterSignatureTable
+] = OrderedDict()
+
+
+def _cache_table(table: ClusterSignatureTable) -> None:
+    _TABLE_CACHE[table.key] = table
+    _TABLE_CACHE.move_to_end(table.key)
+    while len(_TABLE_CACHE) > _TABLE_CACHE_SIZE:
+        _TABLE_CACHE.popitem(last=False)
+
+
+def get_cluster_table(
+    primes: Sequence[int],
+    *,
+    mode: str = "canonical",
+    dyn_name: str = "H-identity",
+    max_iter: int = 32,
+    max_band: int | None = None,
+    band_size: int = 3,
+) -> ClusterSignatureTable:
+    """Restituisce (creandola al primo uso) la tabella per la configurazione data.
+
+    Le tabelle restano in una cache LRU di `_TABLE_CACHE_SIZE` configurazioni.
+    """
+    if dyn_name not in DYNAMICS:
+        msg = f"dinamica cluster non supportata: {dyn_name!r}"
+        raise ValueError(msg)
+    basis = tuple(sorted({int(p) for p in primes}))
+    key = (basis, mode, dyn_name, int(max_iter), max_band, band_size)
+    table = _TABLE_CACHE.get(key)
+    if table is None:
+        table = ClusterSignatureTable(
+            primes=list(basis),
+            band_mode=mode,
+            dyn_name=dyn_name,
+            max_iter=int(max_iter),
+            max_band=max_band,
+            band_size=band_size,
+        )
+    _cache_table(table)
+    return table
+
+
+def save_cluster_table(table: ClusterSignatureTable, path: str | Path) -> None:
+    """Salva la tabella in JSON (tipicamente dopo precompute())."""
+    Path(path).write_text(json.dumps(table.to_dict()), encoding="utf-8")
+
+
+def load_cluster_table(
+    path: str | Path,
+    *,
+    install: bool = True,
+    check_sample: int | None = _TABLE_CHECK_SAMPLE,
+) -> ClusterSignatureTable:
+    """Carica una tabella salvata; con install=True la usa compute_cluster_signature.
+
+    Prima dell'installazione la tabella passa da `check(check_sample)`: range
+    di maschere e codici, più un campione di stati ricalcolati (tutti con
+    check_sample=None). Una tabella incoerente solleva ValueError.
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    table = ClusterSignatureTable.from_dict(data)
+    table.check(check_sample)
+    if install:
+        _cache_table(table)
+    return table
+
+
+# ---------------------------------------------------------------------------
+# Analisi delle orbite (grafo funzionale della dinamica H)
+# ---------------------------------------------------------------------------
+#
+# H è una funzione su uno spazio finito di stati, quindi il suo grafo è un
+# grafo funzionale: ogni stato ha un transiente μ (passi prima di entrare in
+# un ciclo), un periodo λ e un bacino (il ciclo in cui cade). Con
+# max_iter >= μ + λ - 1 la traiettoria A_0..A_N visita tutti gli stati
+# dell'orbita, quindi la classificazione coincide con quella a orizzonte
+# infinito.
+
+DYNAMICS = ("H-identity", "H-band-quadratic", "H-monster-v1")
+
+# Oltre questa dimensione della base si analizza solo un campione di stati.
+_EXHAUSTIVE_MAX_BITS = 20
+
+
+@dataclass
+class OrbitAnalysis:
+    """Transienti, periodi e bacini della dinamica su (un campione di) stati.
+
+    Se `states` è None l'analisi è esaustiva e l'indice dell'array è lo stato
+    stesso (bitmask su `primes`); altrimenti gli array sono allineati a
+    `states`. `basin` contiene il minimo stato del ciclo raggiunto. Con più
+    di 64 primi `states` e `basin` sono liste di int Python.
+    """
+
+    dyn_name: str
+    primes: list[int]
+    bands: list[list[int]]
+    states: array | list[int] | None
+    transient: array
+    cycle_length: array
+    basin: array | list[int]
+
+    @property
+    def exhaustive(self) -> bool:
+        return self.states is None
+
+    @property
+    def max_transient(self) -> int:
+        return max(self.transient, default=0)
+
+    @property
+    def max_cycle_length(self) -> int:
+        return max(self.cycle_length, default=0)
+
+    @property
+    def min_max_iter(self) -> int:
+        """Il più piccolo max_iter con cui ogni orbita analizzata è completa."""
+        return max(
+            (
+                mu + lam - 1
+                for mu, lam in zip(self.transient, self.cycle_length, strict=False)
+            ),
+            default=0,
+        )
+
+    def basin_sizes(self) -> dict[int, int]:
+        """Numero di stati (analizzati) per ciascun ciclo attrattore."""
+        sizes: dict[int, int] = {}
+        for cycle_id in self.basin:
+            sizes[cycle_id] = sizes.get(cycle_id, 0) + 1
+        return sizes
+
+    def summary(self) -> dict[str, Any]:
+        sizes = self.basin_sizes()
+        return {
+            "dyn": self.dyn_name,
+            "k": len(self.primes),
+            "exhaustive": self.exhaustive,
+            "n_states": len(self.transient),
+            "n_cycles": len(sizes),
+            "max_transient": self.max_transient,
+            "max_cycle_length": self.max_cycle_length,
+            "min_max_iter": self.min_max_iter,
+        }
+
+
+def _functional_graph(
+    successor: Callable[[int], int], starts: Sequence[int] | range
+) -> tuple[dict[int, int], dict[int, int], dict[int, int]]:
+    """Calcola (transiente, periodo, bacino) per ogni stato raggiunto da `starts`.
+
+    Algoritmo iterativo lineare: si segue il cammino da ogni stato non ancora
+    visitato finché si incontra uno stato già risolto o uno stato del cammino
+    corrente (nuovo ciclo); poi si risolve il cammino a ritroso.
+    """
+    transient: dict[int, int] = {}
+    cycle_length: dict[int, int] = {}
+    basin: dict[int, int] = {}
+
+    for start in starts:
+        if start in transient:
             continue
 
-        masks = [_band_state_mask(a_n, band) for a_n in a_sequence]
+        path: list[int] = []
+        on_path: dict[int, int] = {}
+        x = start
+        while x not in transient and x not in on_path:
+            on_path[x] = len(path)
+            path.append(x)
+            x = successor(x)
+
+        if x in on_path:
+            cycle = path[on_path[x] :]
+            cycle_id = min(cycle)
+            for y in cycle:
+                transient[y] = 0
+                cycle_length[y] = len(cycle)
+                basin[y] = cycle_id
+            del path[on_path[x] :]
+
+        for y in reversed(path):
+            nxt = successor(y)
+            transient[y] = transient[nxt] + 1
+            cycle_length[y] = cycle_length[nxt]
+            basin[y] = basin[nxt]
+
+    return transient, cycle_length, basin
+
+
+def _functional_graph_dense(successor: array) -> tuple[array, array, array]:
+    """Variante di _functional_graph su tutto lo spazio, con array al posto dei dict."""
+    n = len(successor)
+    transient = array("I", bytes(4 * n))
+    cycle_length = array("I", bytes(4 * n))
+    basin = array("I", bytes(4 * n))
+    color = bytearray(n)  # 0 = nuovo, 1 = sul cammino corrente, 2 = risolto
+    position = array("I", bytes(4 * n))
+
+    for start in range(n):
+        if color[start]:
+            continue
 
-        if k == 0:
-            s_k = _classify_band_states_b0(masks)
-        else:
-            s_k = _classify_band_states(masks)
+        path: list[int] = []
+        x = start
+        while not color[x]:
+            color[x] = 1
+            position[x] = len(path)
+            path.append(x)
+            x = successor[x]
+
+        if color[x] == 1:
+            cycle = path[position[x] :]
+            cycle_id = min(cycle)
+            for y in cycle:
+                cycle_length[y] = len(cycle)
+                basin[y] = cycle_id
+                color[y] = 2
+            del path[position[x] :]
+
+        for y in reversed(path):
+            nxt = successor[y]
+            transient[y] = transient[nxt] + 1
+            cycle_length[y] = cycle_length[nxt]
+            basin[y] = basin[nxt]
+            color[y] = 2
+
+    return transient, cycle_length, basin
+
+
+def analyze_dynamics(
+    primes: Sequence[int],
+    *,
+    mode: str = "canonical",
+    dyn_name: str = "H-identity",
+    max_band: int | None = None,
+    band_size: int = 3,
+    sample: int | None = None,
+    seed: int = 0,
+) -> OrbitAnalysis:
+    """Analizza il grafo funzionale di H sullo spazio degli stati A_n.
+
+    Lo spazio è enumerato per intero se la base ha al più
+    _EXHAUSTIVE_MAX_BITS primi e `sample` è None; altrimenti si analizzano
+    `sample` stati iniziali estratti in modo riproducibile (default 4096).
+    """
+    bands = BandPlan(mode, band_size, max_band).build(list(primes))
+    basis_list, _, slots = _band_layout(bands)
+    k = len(basis_list)
+    step = _make_step(dyn_name, slots, k)
+
+    if sample is None and k <= _EXHAUSTIVE_MAX_BITS:
+        successor = array("I", (step(x) for x in range(1 << k)))
+        transient, cycle_length, basin = _functional_graph_dense(successor)
+        return OrbitAnalysis(
+            dyn_name=dyn_name,
+            primes=basis_list,
+            bands=[list(b) for b in bands],
+            states=None,
+            transient=transient,
+            cycle_length=cycle_length,
+            basin=basin,
+        )
 
-        cluster_vector.append(s_k)
+    rng = Random(seed)
+    n_sample = 4096 if sample is None else int(sample)
+    starts = [rng.getrandbits(k) if k else 0 for _ in range(n_sample)]
+    t_map, c_map, b_map = _functional_graph(step, starts)
+    # Gli stati stanno in array('Q') fino a 64 bit, oltre in int Python.
+    states = array("Q", starts) if k <= 64 else starts
+    basin = [b_map[x] for x in starts]
+    return OrbitAnalysis(
+        dyn_name=dyn_name,
+        primes=basis_list,
+        bands=[list(b) for b in bands],
+        states=states,
+        transient=array("I", (t_map[x] for x in starts)),
+        cycle_length=array("I", (c_map[x] for x in starts)),
+        basin=array("Q", basin) if k <= 64 else basin,
+    )
 
-    return cluster_vector
+
+def analyze_all_dynamics(
+    primes: Sequence[int], **kwargs: Any
+) -> dict[str, OrbitAnalysis]:
+    """analyze_dynamics per ciascuna dinamica supportata."""
+    return {dyn: analyze_dynamics(primes, dyn_name=dyn, **kwargs) for dyn in DYNAMICS}
 
 
 # ---------------------------------------------------------------------------
@@ -428,7 +956,7 @@ def _compute_cluster_vector_from_dynamics(
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class ClusterSignature:
     """Rappresentazione ad alto livello della Cluster Signature."""
 
@@ -464,15 +992,51 @@ class ClusterSignature:
         )
 
 
+def _build_signature_dict(
+    plan: BandPlan,
+    bands: Sequence[Sequence[int]],
+    cluster_vector: list[int],
+    code: int,
+    *,
+    dyn_name: str,
+    max_iter: int,
+    dyn_params: Mapping[str, Any],
+) -> dict[str, Any]:
+    bands_meta = [{"k": k, "primes": list(band)} for k, band in enumerate(bands)]
+
+    cs = ClusterSignature(
+        version="cluster-v1",
+        band_mode=plan.mode,
+        max_band_index=len(cluster_vector) - 1,
+        bands=bands_meta,
+        cluster_vector=cluster_vector,
+        code=code,
+        params={
+            "dyn": dyn_name,
+            "max_iter": max_iter,
+            "band_size": plan.band_size,
+            "dyn_params": dict(dyn_params),
+        },
+    )
+    return cs.to_dict()
+
+
 def compute_cluster_signature(
     cip: Mapping[str, Any],
     *,
     mode: str = "canonical",
     max_band: int | None = None,
+    band_size: int = 3,
     dyn_name: str = "H-identity",
     dyn_params: dict[str, Any] | None = None,
+    use_table: bool = True,
 ) -> dict[str, Any]:
-    """Costruisce il dict `cluster_signature` a partire da una CIP."""
+    """Costruisce il dict `cluster_signature` a partire da una CIP.
+
+    Con use_table=True (e base di al più _TABLE_MAX_BITS primi) il risultato
+    passa dalla tabella memoizzata A0 -> (cluster_vector, code). La tabella
+    conosce solo max_iter: con altri dyn_params si usa il calcolo diretto.
+    """
     primes = cip.get("primes", [])
     primes_list = [int(p) for p in primes]
 
@@ -480,31 +1044,93 @@ def compute_cluster_signature(
         dyn_params = {}
 
     max_iter = int(dyn_params.get("max_iter", 32))
-
-    bands_full = build_bands(primes_list, mode=mode)
-    if max_band is not None:
-        bands = bands_full[: max_band + 1]
-    else:
-        bands = bands_full
+    plan = BandPlan(mode, band_size, max_band)
 
     a0 = make_A0_from_cip(cip)
 
-    cluster_vector = _compute_cluster_vector_from_dynamics(
-        a0, bands, dyn_name=dyn_name, dyn_params=dyn_params, max_steps=max_iter
+    table_ok = not (dyn_params.keys() - {"max_iter"})
+    if use_table and table_ok and len(set(primes_list)) <= _TABLE_MAX_BITS:
+        table = get_cluster_table(
+            primes_list,
+            mode=mode,
+            dyn_name=dyn_name,
+            max_iter=max_iter,
+            max_band=max_band,
+            band_size=band_size,
+        )
+        bands = table.bands
+        cluster_vector, code = table.lookup(table.mask_of(a0))
+    else:
+        bands = plan.build(primes_list)
+        cluster_vector = _compute_cluster_vector_from_dynamics(
+            a0, bands, dyn_name=dyn_name, dyn_params=dyn_params, max_steps=max_iter
+        )
+        code = encode_cluster_vector(cluster_vector)
+
+    return _build_signature_dict(
+        plan,
+        bands,
+        cluster_vector,
+        code,
+        dyn_name=dyn_name,
+        max_iter=max_iter,
+        dyn_params=dyn_params,
     )
 
-    code = encode_cluster_vector(cluster_vector)
-    max_band_index = len(cluster_vector) - 1
 
-    bands_meta = [{"k": k, "primes": list(band)} for k, band in enumerate(bands)]
+def compute_cluster_signatures(
+    cip: Mapping[str, Any],
+    plans: Sequence[BandPlan],
+    *,
+    dyn_name: str = "H-identity",
+    dyn_params: dict[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """Cluster Signature per più schemi di bande, condividendo la dinamica.
 
-    cs = ClusterSignature(
-        version="cluster-v1",
-        band_mode=mode,
-        max_band_index=max_band_index,
-        bands=bands_meta,
-        cluster_vector=cluster_vector,
-        code=code,
-        params={"dyn": dyn_name, "max_iter": max_iter, "dyn_params": dict(dyn_params)},
-    )
-    return cs.to_dict()
+    H-identity e H-monster-v1 evolvono A_n sulla base globale,
+    indipendentemente dalle bande: l'orbita viene calcolata una sola volta per
+    base e proiettata su ogni piano. H-band-quadratic dipende dalle bande e
+    viene quindi eseguita per piano.
+    """
+    primes_list = [int(p) for p in cip.get("primes", [])]
+
+    if dyn_params is None:
+        dyn_params = {}
+
+    max_iter = int(dyn_params.get("max_iter", 32))
+    a0 = make_A0_from_cip(cip)
+
+    shared_orbits: dict[tuple[int, ...], list[int]] = {}
+    signatures: list[dict[str, Any]] = []
+
+    for plan in plans:
+        bands = plan.build(primes_list)
+        basis_list, index, slots = _band_layout(bands)
+
+        key = tuple(basis_list)
+        states = None if dyn_name == "H-band-quadratic" else shared_orbits.get(key)
+        if states is None:
+            states = _run_dynamics(
+                _set_to_mask(a0, index),
+                slots,
+                dyn_name=dyn_name,
+                dyn_params=dyn_params,
+                max_steps=max_iter,
+            )
+            if dyn_name != "H-band-quadratic":
+                shared_orbits[key] = states
+
+        cluster_vector = _classify_orbit(states, slots)
+        signatures.append(
+            _build_signature_dict(
+                plan,
+                bands,
+                cluster_vector,
+                encode_cluster_vector(cluster_vector),
+                dyn_name=dyn_name,
+                max_iter=max_iter,
+                dyn_params=dyn_params,
+            )
+        )
+
+    return signatures
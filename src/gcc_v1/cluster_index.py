@@ -0,0 +1,341 @@
+"""Indice colonnare dei codici di cluster (code_n) per GCC v1.
+
+Qui vive lo store batch dei codici prodotti da `encode_cluster_vector`:
+
+- encode/decode vettoriali di molti CV_n alla volta;
+- query per pattern (mask, value) sui codici impacchettati, es.
+  "banda 2 è un 2-cycle e banda 3 è un punto fisso" -> {2: 1, 3: 3};
+- bitmap per (banda, stato), costruite su richiesta;
+- persistenza su file memory-mappable (header fisso + codici little-endian).
+
+NumPy è opzionale: se presente le operazioni sono vettoriali, altrimenti si
+usa `array.array` con cicli Python (stessi risultati).
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Sequence
+
+from .cluster import encode_cluster_vector
+
+try:  # NumPy è un'accelerazione opzionale.
+    import numpy as np
+except ImportError:  # pragma: no cover - dipende dall'ambiente
+    np = None
+
+__all__ = [
+    "ClusterCodeIndex",
+    "band_field",
+    "decode_cluster_codes",
+    "encode_cluster_vectors",
+    "pattern_mask",
+]
+
+# Header: magic, max_band_index, itemsize, numero di codici.
+_MAGIC = b"GCCCIX01"
+_HEADER = struct.Struct("<8sIIQ")
+
+# typecode array.array / dtype NumPy per larghezza in byte.
+_TYPECODES = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+
+def _code_bits(max_band_index: int) -> int:
+    """Numero di bit di code_n: 1 per S0 + 2 per ogni Sk (k >= 1)."""
+    return 1 + 2 * max_band_index if max_band_index >= 0 else 0
+
+
+def _itemsize_for(max_band_index: int) -> int:
+    bits = _code_bits(max_band_index)
+    for size in (1, 2, 4, 8):
+        if bits <= 8 * size:
+            return size
+    msg = f"troppe bande per un codice a 64 bit: max_band_index={max_band_index}"
+    raise ValueError(msg)
+
+
+def band_field(k: int, max_band_index: int) -> tuple[int, int]:
+    """Restituisce (shift, width) del campo S_k dentro code_n."""
+    if not 0 <= k <= max_band_index:
+        raise ValueError(f"banda fuori range: {k} (max {max_band_index})")
+    if k == 0:
+        return 2 * max_band_index, 1
+    return 2 * (max_band_index - k), 2
+
+
+def pattern_mask(pattern: Mapping[int, int], max_band_index: int) -> tuple[int, int]:
+    """Converte {banda: stato} nella coppia (mask, value) sui codici.
+
+    Un codice soddisfa il pattern se `code & mask == value`.
+    """
+    mask = 0
+    value = 0
+    for k, state in pattern.items():
+        shift, width = band_field(int(k), max_band_index)
+        full = (1 << width) - 1
+        if not 0 <= int(state) <= full:
+            raise ValueError(f"stato {state!r} non valido per la banda {k}")
+        mask |= full << shift
+        value |= int(state) << shift
+    return mask, value
+
+
+def encode_cluster_vectors(vectors: Iterable[Sequence[int]] | Any) -> Any:
+    """Codifica molti CV_n (stessa lunghezza) in un array di code_n.
+
+    Con NumPy accetta una matrice (N, n+1) e restituisce un ndarray uint64;
+    senza NumPy restituisce un `array('Q')`.
+    """
+    if np is not None:
+        mat = np.asarray(vectors, dtype=np.uint64)
+        if mat.ndim != 2:
+            raise ValueError("serve una matrice (N, n+1) di vettori di cluster")
+        n = mat.shape[1] - 1
+        if n < 0:
+            return np.zeros(mat.shape[0], dtype=np.uint64)
+        codes = (mat[:, 0] & np.uint64(1)) << np.uint64(2 * n)
+        for k in range(1, n + 1):
+            codes |= (mat[:, k] & np.uint64(3)) << np.uint64(2 * (n - k))
+        return codes
+
+    return array("Q", (encode_cluster_vector(v) for v in vectors))
+
+
+def decode_cluster_codes(codes: Iterable[int] | Any, max_band_index: int) -> Any:
+    """Inverso di encode_cluster_vectors: matrice (N, n+1) di stati S_k.
+
+    Con NumPy restituisce un ndarray uint8, altrimenti una lista di liste.
+    """
+    n = max_band_index
+    if np is not None:
+        arr = np.asarray(codes, dtype=np.uint64)
+        out = np.empty((arr.shape[0], max(n + 1, 0)), dtype=np.uint8)
+        for k in range(n + 1):
+            shift, width = band_field(k, n)
+            out[:, k] = (arr >> np.uint64(shift)) & np.uint64((1 << width) - 1)
+        return out
+
+    fields = [band_field(k, n) for k in range(n + 1)]
+    return [
+        [(int(code) >> shift) & ((1 << width) - 1) for shift, width in fields]
+        for code in codes
+    ]
+
+
+class ClusterCodeIndex:
+    """Store colonnare di code_n con query per pattern e bitmap per (banda, stato).
+
+    I codici sono tenuti in un unico array di interi senza segno della
+    larghezza minima sufficiente (1 + 2n bit). Le bitmap vengono costruite
+    alla prima richiesta e invalidate da append/extend.
+    """
+
+    def __init__(self, max_band_index: int, codes: Iterable[int] | None = None):
+        self.max_band_index = int(max_band_index)
+        self.itemsize = _itemsize_for(self.max_band_index)
+        self._codes = array(_TYPECODES[self.itemsize])
+        self._mmap: mmap.mmap | None = None
+        self._view: Any = None
+        self._bitmaps: dict[tuple[int, int], Any] = {}
+        if codes is not None:
+            self.extend(codes)
+
+    # -- accesso ai codici --------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._view) if self._view is not None else len(self._codes)
+
+    @property
+    def codes(self) -> Any:
+        """Colonna dei codici: `np.ndarray` con NumPy, altrimenti `array.array`.
+
+        Per un indice caricato da file (con NumPy) è una vista in sola lettura
+        sulla mappatura; altrimenti è una copia. In entrambi i casi
+        append/extend restano possibili.
+        """
+        column = self._column()
+        if np is not None:
+            return column if self._view is not None else column.copy()
+        copy = array(_TYPECODES[self.itemsize])
+        copy.frombytes(memoryview(column).cast("B"))
+        return copy
+
+    def _column(self) -> Any:
+        """Colonna interna senza copia (da non conservare oltre la chiamata)."""
+        if self._view is not None:
+            return self._view
+        if np is not None:
+            return np.frombuffer(self._codes, dtype=self._codes.typecode)
+        return self._codes
+
+    def _overflow(self) -> OverflowError:
+        return OverflowError(
+            f"codice fuori dalla larghezza dell'indice ({8 * self.itemsize} bit)"
+        )
+
+    def append(self, code_or_vector: int | Sequence[int]) -> None:
+        if not isinstance(code_or_vector, int):
+            code_or_vector = encode_cluster_vector(code_or_vector)
+        self.extend((code_or_vector,))
+
+    def extend(self, codes: Iterable[int] | Any) -> None:
+        """Aggiunge codici; OverflowError (senza modifiche) se uno non entra."""
+        target = self._writable()
+        if (
+            np is not None
+            and isinstance(codes, np.ndarray)
+            and codes.dtype.kind in "iu"
+        ):
+            limit = (1 << (8 * self.itemsize)) - 1
+            if codes.size and (int(codes.min()) < 0 or int(codes.max()) > limit):
+                raise self._overflow()
+            target.frombytes(codes.astype(target.typecode, copy=False).tobytes())
+        else:
+            try:
+                new = array(target.typecode, (int(c) for c in codes))
+            except OverflowError:
+                raise self._overflow() from None
+            target.extend(new)
+        self._bitmaps.clear()
+
+    def _writable(self) -> array:
+        if self._view is not None:
+            # Indice caricato da file: si passa a una copia in memoria.
+            self._codes = array(_TYPECODES[self.itemsize], bytes(self._raw_view()))
+            self._release()
+        return self._codes
+
+    def decode(self) -> Any:
+        return decode_cluster_codes(self._column(), self.max_band_index)
+
+    # -- query ---------------------------------------------------------------
+
+    def match(self, pattern: Mapping[int, int] | tuple[int, int]) -> Any:
+        """Maschera booleana dei codici che soddisfano il pattern."""
+        mask, value = self._as_mask(pattern)
+        codes = self._column()
+        if np is not None:
+            return (codes & codes.dtype.type(mask)) == value
+        return [(c & mask) == value for c in codes]
+
+    def query(self, pattern: Mapping[int, int] | tuple[int, int]) -> Any:
+        """Indici dei codici che soddisfano il pattern (mask/value)."""
+        mask, value = self._as_mask(pattern)
+        codes = self._column()
+        if np is not None:
+            return np.flatnonzero((codes & codes.dtype.type(mask)) == value)
+        return array("Q", (i for i, c in enumerate(codes) if (c & mask) == value))
+
+    def count(self, pattern: Mapping[int, int] | tuple[int, int]) -> int:
+        mask, value = self._as_mask(pattern)
+        codes = self._column()
+        if np is not None:
+            return int(np.count_nonzero((codes & codes.dtype.type(mask)) == value))
+        return sum(1 for c in codes if (c & mask) == value)
+
+    def bitmap(self, band: int, state: int) -> Any:
+        """Bitmap delle righe con S_band == state.
+
+        Con NumPy è un array uint8 impacchettato (np.packbits, bit order
+        "little"); senza NumPy è un intero Python usato come bitset.
+        """
+        key = (int(band), int(state))
+        bm = self._bitmaps.get(key)
+        if bm is None:
+            mask, value = pattern_mask({band: state}, self.max_band_index)
+            codes = self._column()
+            if np is not None:
+                hits = (codes & codes.dtype.type(mask)) == value
+                bm = np.packbits(hits, bitorder="little")
+            else:
+                bm = 0
+                for i, c in enumerate(codes):
+                    if (c & mask) == value:
+                        bm |= 1 << i
+            self._bitmaps[key] = bm
+        return bm
+
+    def query_bitmaps(self, pattern: Mapping[int, int]) -> Any:
+        """Come query(), ma combinando in AND le bitmap per (banda, stato)."""
+        if not pattern:
+            return self.query(pattern)
+        bitmaps = [self.bitmap(k, s) for k, s in pattern.items()]
+        acc = bitmaps[0]
+        for bm in bitmaps[1:]:
+            acc = acc & bm
+        if np is not None:
+            hits = np.unpackbits(acc, count=len(self), bitorder="little")
+            return np.flatnonzero(hits)
+        return array("Q", (i for i in range(acc.bit_length()) if (acc >> i) & 1))
+
+    def _as_mask(self, pattern: Mapping[int, int] | tuple[int, int]) -> tuple[int, int]:
+        if isinstance(pattern, tuple):
+            return int(pattern[0]), int(pattern[1])
+        return pattern_mask(pattern, self.max_band_index)
+
+    # -- persistenza -----------------------------------------------------------
+
+    def save(self, path: str | Path) -> None:
+        """Scrive header + codici little-endian (file memory-mappable)."""
+        with open(path, "wb") as fh:
+            fh.write(
+                _HEADER.pack(_MAGIC, self.max_band_index, self.itemsize, len(self))
+            )
+            data = self._codes if self._view is None else self._raw_view()
+            if sys.byteorder != "little" and self.itemsize > 1:
+                data = array(_TYPECODES[self.itemsize], bytes(data))
+                data.byteswap()
+            fh.write(memoryview(data).cast("B"))
+
+    @classmethod
+    def load(cls, path: str | Path) -> ClusterCodeIndex:
+        """Apre un indice salvato mappando i codici in memoria (sola lettura)."""
+        with open(path, "rb") as fh:
+            header = fh.read(_HEADER.size)
+            magic, max_band_index, itemsize, count = _HEADER.unpack(header)
+            if magic != _MAGIC:
+                raise ValueError(f"file indice non riconosciuto: {path}")
+            index = cls(max_band_index)
+            if itemsize != index.itemsize:
+                raise ValueError(f"itemsize incoerente nel file: {itemsize}")
+            if count == 0:
+                return index
+            index._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        end = _HEADER.size + count * itemsize
+        if np is not None:
+            dtype = np.dtype(_TYPECODES[itemsize]).newbyteorder("<")
+            index._view = np.frombuffer(
+                index._mmap, dtype=dtype, count=count, offset=_HEADER.size
+            )
+        elif sys.byteorder == "little" or itemsize == 1:
+            raw = memoryview(index._mmap)[_HEADER.size : end]
+            index._view = raw.cast(_TYPECODES[itemsize])
+        else:  # pragma: no cover - piattaforme big-endian senza NumPy
+            index._codes = array(_TYPECODES[itemsize], index._mmap[_HEADER.size : end])
+            index._codes.byteswap()
+            index._release()
+        return index
+
+    def _raw_view(self) -> memoryview:
+        return memoryview(self._view).cast("B")
+
+    def _release(self) -> None:
+        self._view = None
+        self._bitmaps.clear()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Esistono ancora viste esportate: la mappa resta aperta.
+                pass
+            self._mmap = None
+
+    def close(self) -> None:
+        """Rilascia la mappatura del file, copiando prima i codici in memoria."""
+        if self._view is not None:
+            self._writable()
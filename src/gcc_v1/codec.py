@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+from dataclasses import asdict, dataclass
 from typing import Any, Mapping
 
 from .cluster import compute_cluster_signature
-from .exponents import build_exponent_matrix
+from .exponents import build_exponent_matrix, build_exponent_matrix_from_residues
 from .invariants import build_cip, compute_cids
-from .logic import LogicOp, XorLogicOp, build_logic_signature
+from .kernel2310 import PRIMES_PENTAGON, kernel_2310_from_buffer
+from .logic import LogicOp, XorLogicOp, build_logic_signature, get_logic_op
+from .stats import EncodeStats, current_stats, stage
 
 # Codec di alto livello per GCC v1:
 # - usa exponents / invariants / logic per costruire CIP e CID_p;
@@ -17,6 +20,12 @@ __all__ = ["encode_block", "decode_block"]
 
 __version__ = "0.1.0"
 
+# Sorgenti del prisma M:
+# - "bytes": valutazioni p-adiche dei singoli byte (default);
+# - "kernel2310": residui (r2, r3, r5, r7, r11) del blocco letto come numero
+#   decimale, in un solo passaggio lineare senza fattorizzare.
+PRISM_SOURCES = ("bytes", "kernel2310")
+
 
 @dataclass
 class GCCV1Block:
@@ -41,56 +50,110 @@ class GCCV1Block:
 
 def encode_block(
     block: bytes,
-    max_prime: int = 31,
-    logic_op: LogicOp | None = None,
+    max_prime: int | None = None,
+    logic_op: LogicOp | str | None = None,
     *,
     with_cluster: bool = False,
     cluster_mode: str = "canonical",
     cluster_dyn: str = "H-identity",
     cluster_params: dict[str, Any] | None = None,
+    prism_source: str = "bytes",
+    stats: EncodeStats | None = None,
 ) -> dict[str, Any]:
-    """Codifica un blocco di byte in un oggetto GCC_v1_Block."""
+    """Codifica un blocco di byte in un oggetto GCC_v1_Block.
+
+    `logic_op` può essere un LogicOp o il nome di un operatore registrato
+    (lo stesso `logic_mode` scritto nella CIP).
+
+    `max_prime` (default 31) limita i primi del prisma dai byte. Con
+    `prism_source="kernel2310"` il blocco deve essere un numero decimale
+    ASCII (newline finali ammessi) e M nasce dalla firma pentagonale, sulla
+    base fissa 2..11: un `max_prime` diverso da 11 è un ValueError. Il
+    header registra il `max_prime` effettivo.
+
+    `stats` raccoglie tempo/memoria per stadio (vedi `gcc_v1.stats`); se
+    omesso si usano le stats installate globalmente, se presenti.
+    """
     if not isinstance(block, (bytes, bytearray)):
         raise TypeError("encode_block richiede un oggetto bytes-like")
-
-    # 1. Prisma p-adico (M, primes) dalla logica esistente.
-    M, primes = build_exponent_matrix(block, primes=None, max_prime=max_prime)
+    if prism_source not in PRISM_SOURCES:
+        raise ValueError(f"prism_source non supportata: {prism_source!r}")
+    if prism_source == "kernel2310":
+        if max_prime not in (None, PRIMES_PENTAGON[-1]):
+            msg = (
+                f"max_prime={max_prime} non applicabile con prism_source="
+                f"'kernel2310' (base fissa {list(PRIMES_PENTAGON)})"
+            )
+            raise ValueError(msg)
+        max_prime = PRIMES_PENTAGON[-1]
+    elif max_prime is None:
+        max_prime = 31
+    if stats is None:
+        stats = current_stats()
+    size = len(block)
+
+    # 1. Prisma p-adico (M, primes): dai byte o dal kernel 2310.
+    kernel_sig = None
+    with stage(stats, "prism", size):
+        if prism_source == "kernel2310":
+            digits = bytes(block).rstrip(b"\r\n")
+            if not digits:
+                msg = "prism_source='kernel2310' richiede almeno una cifra"
+                raise ValueError(msg)
+            kernel_sig = kernel_2310_from_buffer(digits)
+            M, primes = build_exponent_matrix_from_residues(kernel_sig.residues)
+        else:
+            M, primes = build_exponent_matrix(block, primes=None, max_prime=max_prime)
 
     # 2. Operatore logico e relativa firma.
     if logic_op is None:
         logic_op = XorLogicOp()
-    logic_signature = build_logic_signature(M, primes, logic_op)
+    elif isinstance(logic_op, str):
+        logic_op = get_logic_op(logic_op)
+    with stage(stats, "logic", size):
+        logic_signature = build_logic_signature(M, primes, logic_op)
 
     # 3. Invarianti cristalline (CID_p, CIP).
-    per_prime_cids = compute_cids(M, primes)
-    cip = build_cip(M, primes, per_prime_cids, logic_signature)
+    with stage(stats, "cids", size):
+        per_prime_cids = compute_cids(M, primes)
+    with stage(stats, "cip", size):
+        cip = build_cip(
+            M, primes, per_prime_cids, logic_signature, prism_source=prism_source
+        )
 
     invariants: dict[str, Any] = {"cip": cip, "per_prime": per_prime_cids}
 
     # 4. Cluster Signature opzionale (layer separato).
     cluster_sig: dict[str, Any] | None = None
     if with_cluster:
-        cluster_sig = compute_cluster_signature(
-            cip, mode=cluster_mode, dyn_name=cluster_dyn, dyn_params=cluster_params
-        )
+        with stage(stats, "cluster", size):
+            cluster_sig = compute_cluster_signature(
+                cip, mode=cluster_mode, dyn_name=cluster_dyn, dyn_params=cluster_params
+            )
 
     # 5. Header (compat con test_basic.py: magic="GCC1" e cip in header).
     header: dict[str, Any] = {
         "magic": "GCC1",
         "version": __version__,
         "block_len": len(block),
+        "content_sha256": hashlib.sha256(block).hexdigest(),
+        "max_prime": max_prime,
         "primes": primes,
+        "prism_source": prism_source,
         "cip": cip,
     }
+    if kernel_sig is not None:
+        header["kernel_2310"] = asdict(kernel_sig)
     if cluster_sig is not None:
         header["cluster_signature"] = cluster_sig
 
     # 6. Residuo (modello identity).
-    residual: dict[str, Any] = {
-        "model_type": "identity",
-        "model_params": {},
-        "residual_stream": list(block),
-    }
+    with stage(stats, "residual", size):
+        residual: dict[str, Any] = {
+            "model_type": "identity",
+            "model_params": {},
+            "residual_stream": list(block),
+        }
 
     gcc = GCCV1Block(header=header, invariants=invariants, residual=residual)
     return gcc.to_dict()
@@ -112,6 +175,11 @@ def decode_block(gcc_obj: Mapping[str, Any]) -> bytes:
     if magic not in ("GCC1", "GCCV1"):
         raise ValueError(f"magic non riconosciuto: {magic!r}")
 
+    # Blocchi precedenti senza il campo: prisma dai byte.
+    prism_source = header.get("prism_source", "bytes")
+    if prism_source not in PRISM_SOURCES:
+        raise ValueError(f"prism_source non riconosciuta: {prism_source!r}")
+
     model_type = residual.get("model_type", "identity")
     if model_type != "identity":
         msg = "decode_block supporta solo model_type='identity'"
@@ -122,15 +190,19 @@ def decode_block(gcc_obj: Mapping[str, Any]) -> bytes:
         raise ValueError("residual_stream mancante o non sequenza")
 
     try:
-        data = bytes(int(b) & 0xFF for b in stream)
-    except Exception as exc:  # noqa: BLE001
-        msg = "residual_stream non convertibile in bytes"
-        raise ValueError(msg) from exc
+        # Caso comune: interi già in 0..255, conversione in C.
+        data = bytes(stream)
+    except (TypeError, ValueError):
+        try:
+            data = bytes(int(b) & 0xFF for b in stream)
+        except Exception as exc:  # noqa: BLE001
+            msg = "residual_stream non convertibile in bytes"
+            raise ValueError(msg) from exc
 
     expected_len = header.get("block_len")
     if isinstance(expected_len, int) and expected_len >= 0:
         if len(data) != expected_len:
-            # Per ora solo warning silenzioso; in futuro si può rendere un errore.
-            pass
+            msg = f"block_len incoerente: header {expected_len}, residuo {len(data)}"
+            raise ValueError(msg)
 
     return data
@@ -0,0 +1,235 @@
+"""CIP compatta: slot + array al posto del dizionario di dizionari.
+
+Una CIP di `build_cip` costa qualche KB (un dict per primo in `per_prime`,
+un altro in `logic_signature`, liste di int Python). `CompactCIP` tiene gli
+stessi dati in pochi oggetti:
+
+- `primes`: tupla condivisa tra tutte le CIP con la stessa base;
+- `cid`: un solo `array` con i campi CID per colonne (struct-of-arrays),
+  `cid[f * k + j]` = campo `CID_FIELDS[f]` del primo primes[j];
+  `col_mass` coincide con la colonna Mass_p;
+- `row_mass`: `array` di interi senza segno;
+- logic_signature impacchettata in (logic_mode, t0, t1) come `PackedSignature`;
+- fingerprint come 32 byte grezzi.
+
+Per compatibilità è un Mapping in sola lettura: `cip["per_prime"]`,
+`cip.get("logic_signature")` ecc. ricostruiscono al volo le stesse viste a
+dizionario di `build_cip` (senza memorizzarle).
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Mapping
+from dataclasses import fields
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+from .invariants import CID
+from .spectrum import PackedSignature, pack_signature
+
+__all__ = ["CID_FIELDS", "CompactCIP", "compact_cip"]
+
+# Campi CID salvati nell'array (p è implicito nella colonna).
+CID_FIELDS: Tuple[str, ...] = tuple(f.name for f in fields(CID) if f.name != "p")
+_MASS = CID_FIELDS.index("Mass_p")
+
+_KEYS = (
+    "version",
+    "H_total",
+    "k",
+    "primes",
+    "total_mass",
+    "col_mass",
+    "row_mass",
+    "per_prime",
+    "logic_signature",
+    "defects",
+    "matrix_fingerprint",
+)
+
+_DEFAULT_DEFECTS = {"model": "none", "params": {}}
+
+# Basi di primi già viste: le CIP con la stessa base condividono la tupla.
+_PRIMES_CACHE: Dict[Tuple[int, ...], Tuple[int, ...]] = {}
+
+
+def _intern_primes(primes: Sequence[int]) -> Tuple[int, ...]:
+    key = tuple(int(p) for p in primes)
+    return _PRIMES_CACHE.setdefault(key, key)
+
+
+def _uint_array(values: Sequence[int]) -> array:
+    """array('I') se i valori stanno in 32 bit, altrimenti array('Q')."""
+    try:
+        return array("I", values)
+    except OverflowError:
+        return array("Q", values)
+
+
+class CompactCIP(Mapping):
+    """CIP in forma compatta, con viste a dizionario compatibili."""
+
+    __slots__ = (
+        "version",
+        "H_total",
+        "primes",
+        "cid",
+        "row_mass",
+        "logic_mode",
+        "t0",
+        "t1",
+        "defects",
+        "fingerprint",
+    )
+
+    def __init__(
+        self,
+        *,
+        version: int,
+        H_total: int,
+        primes: Sequence[int],
+        cid: array,
+        row_mass: array,
+        logic_mode: str,
+        t0: int,
+        t1: int,
+        defects: Optional[Dict[str, Any]] = None,
+        fingerprint: bytes = b"",
+    ) -> None:
+        self.version = version
+        self.H_total = H_total
+        self.primes = _intern_primes(primes)
+        if len(cid) != len(CID_FIELDS) * len(self.primes):
+            raise ValueError(
+                f"cid deve avere {len(CID_FIELDS)} x {len(self.primes)} valori, "
+                f"ricevuti {len(cid)}"
+            )
+        self.cid = cid
+        self.row_mass = row_mass
+        self.logic_mode = sys.intern(logic_mode)
+        self.t0 = t0
+        self.t1 = t1
+        self.defects = None if defects == _DEFAULT_DEFECTS else defects
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def from_dict(cls, cip: Mapping[str, Any]) -> CompactCIP:
+        """Converte una CIP di `build_cip` (dict) in forma compatta."""
+        if isinstance(cip, CompactCIP):
+            return cip
+        primes = [int(p) for p in cip["primes"]]
+        per_prime = cip["per_prime"]
+        cid = _uint_array(
+            [int(per_prime[p][name]) for name in CID_FIELDS for p in primes]
+        )
+        logic = cip.get("logic_signature") or {}
+        packed = pack_signature(primes, logic)
+        return cls(
+            version=int(cip.get("version", 1)),
+            H_total=int(cip["H_total"]),
+            primes=primes,
+            cid=cid,
+            row_mass=_uint_array([int(v) for v in cip["row_mass"]]),
+            logic_mode=str(logic.get("logic_mode", "")),
+            t0=packed.t0,
+            t1=packed.t1,
+            defects=cip.get("defects"),
+            fingerprint=bytes.fromhex(cip.get("matrix_fingerprint", "")),
+        )
+
+    # -- accesso diretto (senza dizionari) -----------------------------------
+
+    @property
+    def k(self) -> int:
+        return len(self.primes)
+
+    def cid_column(self, name: str) -> memoryview:
+        """Colonna di un campo CID (allineata a primes), vista senza copia."""
+        f = CID_FIELDS.index(name)
+        k = len(self.primes)
+        return memoryview(self.cid)[f * k : (f + 1) * k]
+
+    @property
+    def col_mass(self) -> memoryview:
+        return self.cid_column("Mass_p")
+
+    @property
+    def total_mass(self) -> int:
+        k = len(self.primes)
+        return sum(self.cid[_MASS * k : (_MASS + 1) * k])
+
+    @property
+    def matrix_fingerprint(self) -> str:
+        return self.fingerprint.hex()
+
+    def packed_signature(self) -> PackedSignature:
+        """logic_signature impacchettata, pronta per gli spectrum batch."""
+        return PackedSignature(primes=self.primes, t0=self.t0, t1=self.t1)
+
+    # -- viste a dizionario (compatibilità con build_cip) ----------------------
+
+    def _per_prime(self) -> Dict[int, Dict[str, int]]:
+        k = len(self.primes)
+        cid = self.cid
+        return {
+            p: {"p": p, **{name: cid[f * k + j] for f, name in enumerate(CID_FIELDS)}}
+            for j, p in enumerate(self.primes)
+        }
+
+    def _logic_signature(self) -> Dict[str, Any]:
+        return {
+            "logic_mode": self.logic_mode,
+            "per_prime": {
+                p: {"T0": (self.t0 >> j) & 1, "T1": (self.t1 >> j) & 1}
+                for j, p in enumerate(self.primes)
+            },
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "version":
+            return self.version
+        if key == "H_total":
+            return self.H_total
+        if key == "k":
+            return len(self.primes)
+        if key == "primes":
+            return list(self.primes)
+        if key == "total_mass":
+            return self.total_mass
+        if key == "col_mass":
+            return self.col_mass.tolist()
+        if key == "row_mass":
+            return self.row_mass.tolist()
+        if key == "per_prime":
+            return self._per_prime()
+        if key == "logic_signature":
+            return self._logic_signature()
+        if key == "defects":
+            defects = self.defects if self.defects is not None else _DEFAULT_DEFECTS
+            return {**defects, "params": dict(defects.get("params", {}))}
+        if key == "matrix_fingerprint":
+            return self.matrix_fingerprint
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_KEYS)
+
+    def __len__(self) -> int:
+        return len(_KEYS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """CIP completa come dizionario (identica a quella di build_cip)."""
+        return {key: self[key] for key in _KEYS}
+
+    def __repr__(self) -> str:
+        return (
+            f"CompactCIP(k={len(self.primes)}, H_total={self.H_total}, "
+            f"logic_mode={self.logic_mode!r}, "
+            f"fingerprint={self.fingerprint.hex()[:12]})"
+        )
+
+
+def compact_cip(cip: Mapping[str, Any]) -> CompactCIP:
+    """Scorciatoia per `CompactCIP.from_dict`."""
+    return CompactCIP.from_dict(cip)
@@ -0,0 +1,169 @@
+"""Contenitori di blocchi GCC v1 su stream (file, stdin/stdout).
+
+Due formati, un record per blocco:
+
+- "json": NDJSON, un oggetto GCC_v1_Block per riga (vedi `serialize`, chiavi
+  dei primi di nuovo int in lettura);
+- "binary": record `<4sIQ` (magic b"GCCB", lunghezza meta, lunghezza dati)
+  seguito dai metadati JSON (header, invariants, residual senza stream) e dal
+  residual_stream come byte grezzi, senza la lista di interi del JSON.
+
+`read_blocks` riconosce il formato dal primo byte dello stream.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from typing import IO, Any, BinaryIO, Dict, Iterator, Mapping, Optional, Tuple
+
+from .serialize import LazyRecord, dumps, dumps_record, loads, loads_record
+
+__all__ = [
+    "CONTAINER_FORMATS",
+    "dump_block",
+    "read_block_at",
+    "read_blocks",
+    "scan_blocks",
+    "write_block",
+]
+
+CONTAINER_FORMATS = ("json", "binary")
+
+_RECORD_MAGIC = b"GCCB"
+_RECORD = struct.Struct("<4sIQ")
+
+
+def dump_block(gcc_obj: Mapping[str, Any], fmt: str = "json") -> bytes:
+    """Serializza un blocco come record del contenitore `fmt`."""
+    if fmt == "json":
+        return dumps_record(gcc_obj)
+    if fmt == "binary":
+        residual = dict(gcc_obj["residual"])
+        data = bytes(residual.pop("residual_stream"))
+        meta = dumps({**gcc_obj, "residual": residual}).encode("ascii")
+        return _RECORD.pack(_RECORD_MAGIC, len(meta), len(data)) + meta + data
+    raise ValueError(f"formato contenitore non supportato: {fmt!r}")
+
+
+def write_block(fh: IO[bytes], gcc_obj: Mapping[str, Any], fmt: str = "json") -> int:
+    """Scrive un record su `fh`; restituisce i byte scritti."""
+    record = dump_block(gcc_obj, fmt)
+    fh.write(record)
+    return len(record)
+
+
+def _read_exact(fh: IO[bytes], n: int) -> bytes:
+    data = fh.read(n)
+    if len(data) != n:
+        raise ValueError(f"record troncato: attesi {n} byte, letti {len(data)}")
+    return data
+
+
+def _read_record_header(fh: IO[bytes]) -> Optional[Tuple[int, int]]:
+    """(lunghezza meta, lunghezza dati) del prossimo record, None a fine stream."""
+    head = fh.read(_RECORD.size)
+    if not head:
+        return None
+    if len(head) != _RECORD.size:
+        raise ValueError("header di record troncato")
+    magic, meta_len, data_len = _RECORD.unpack(head)
+    if magic != _RECORD_MAGIC:
+        raise ValueError(f"magic di record non riconosciuto: {magic!r}")
+    return meta_len, data_len
+
+
+def _read_binary_record(fh: IO[bytes], meta_len: int, data_len: int) -> Dict[str, Any]:
+    obj = loads(_read_exact(fh, meta_len))
+    obj["residual"]["residual_stream"] = list(_read_exact(fh, data_len))
+    return obj
+
+
+def _iter_binary(fh: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    while True:
+        sizes = _read_record_header(fh)
+        if sizes is None:
+            return
+        yield _read_binary_record(fh, *sizes)
+
+
+def _iter_json(fh: IO[bytes], first: bytes) -> Iterator[Dict[str, Any]]:
+    pending = first
+    for line in fh:
+        if pending:
+            line, pending = pending + line, b""
+        if line.strip():
+            yield loads_record(line)
+    if pending.strip():
+        yield loads_record(pending)
+
+
+def read_blocks(fh: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    """Itera i blocchi di uno stream, in JSON Lines o binario."""
+    first = fh.read(1)
+    if not first:
+        return iter(())
+    if first == _RECORD_MAGIC[:1]:
+        rest = _read_exact(fh, _RECORD.size - 1)
+        return _iter_binary(_Prefixed(first + rest, fh))
+    return _iter_json(fh, first)
+
+
+def scan_blocks(fh: BinaryIO) -> Iterator[Tuple[int, int]]:
+    """(offset del record, block_len) per ogni blocco di uno stream seekable.
+
+    Nei record binari block_len è la lunghezza del residuo e i dati vengono
+    saltati con seek; in NDJSON si decodifica solo `header.block_len`.
+    """
+    start = fh.tell()
+    first = fh.read(1)
+    fh.seek(start)
+    if not first:
+        return
+    if first == _RECORD_MAGIC[:1]:
+        while True:
+            offset = fh.tell()
+            sizes = _read_record_header(fh)
+            if sizes is None:
+                return
+            meta_len, data_len = sizes
+            fh.seek(meta_len + data_len, os.SEEK_CUR)
+            yield offset, data_len
+    else:
+        offset = start
+        for line in iter(fh.readline, b""):
+            if line.strip():
+                yield offset, int(LazyRecord(line)["header.block_len"])
+            offset += len(line)
+
+
+def read_block_at(fh: BinaryIO, offset: int) -> Dict[str, Any]:
+    """Legge il singolo blocco che inizia a `offset` (da scan_blocks)."""
+    fh.seek(offset)
+    first = fh.read(1)
+    fh.seek(offset)
+    if first == _RECORD_MAGIC[:1]:
+        sizes = _read_record_header(fh)
+        if sizes is None:
+            raise ValueError(f"nessun record all'offset {offset}")
+        return _read_binary_record(fh, *sizes)
+    line = fh.readline()
+    if not line.strip():
+        raise ValueError(f"nessun record all'offset {offset}")
+    return loads_record(line)
+
+
+class _Prefixed:
+    """Stream con alcuni byte già letti rimessi in testa."""
+
+    def __init__(self, prefix: bytes, fh: IO[bytes]) -> None:
+        self._prefix = prefix
+        self._fh = fh
+
+    def read(self, n: int) -> bytes:
+        if not self._prefix:
+            return self._fh.read(n)
+        head, self._prefix = self._prefix[:n], self._prefix[n:]
+        if len(head) < n:
+            head += self._fh.read(n - len(head))
+        return head
@@ -16,7 +16,14 @@ The goal is not mathematical rigor (yet), but a clean, testable structure.
 
 from __future__ import annotations
 
-from typing import Iterable, List, Tuple
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Iterable, List, Mapping, Tuple
+
+try:  # NumPy è un'accelerazione opzionale per l'istogramma dei byte.
+    import numpy as np
+except ImportError:  # pragma: no cover - dipende dall'ambiente
+    np = None
 
 
 def sieve_primes(limit: int) -> List[int]:
@@ -74,26 +81,62 @@ def build_exponent_matrix(
         M: list of H rows, each a list of len(primes) integers.
         primes: the list of primes in column order.
     """
-    values = [int(x) for x in block]
+    if not isinstance(block, (bytes, bytearray, memoryview)):
+        block = [int(x) for x in block]
     if primes is None:
-        primes = infer_primes_from_block(values, max_prime=max_prime)
+        primes = infer_primes_from_block(block, max_prime=max_prime)
 
-    totals: List[int] = []
-    for p in primes:
-        e_total = 0
-        for n in values:
-            if n == 0:
-                continue
-            e_total += v_p(n, p)
-        totals.append(e_total)
+    return exponent_matrix_from_totals(exponent_totals(block, primes)), primes
+
+
+@lru_cache(maxsize=None)
+def _byte_valuations(p: int) -> Tuple[int, ...]:
+    """v_p(b) for every byte value b (v_p(0) = 0)."""
+    return tuple(v_p(b, p) for b in range(256))
+
+
+@lru_cache(maxsize=64)
+def _valuation_matrix(primes: Tuple[int, ...]) -> Any:
+    """(256, k) matrix of v_p(b), columns in primes order (NumPy only)."""
+    table = [_byte_valuations(p) for p in primes]
+    return np.array(table, dtype=np.int64).reshape(len(primes), 256).T.copy()
+
+
+def exponent_totals(block: Iterable[int], primes: List[int]) -> List[int]:
+    """Total p-adic exponent E_p = sum_n v_p(block[n]) for each prime.
+
+    Byte buffers are reduced to a 256-bin histogram first, so the cost is
+    one pass over the data plus 256 table lookups per prime (a single
+    histogram x valuation-matrix product with NumPy).
+    """
+    if isinstance(block, (bytes, bytearray, memoryview)):
+        if np is not None:
+            hist = np.bincount(np.frombuffer(block, dtype=np.uint8), minlength=256)
+            return (hist @ _valuation_matrix(tuple(primes))).tolist()
+        hist = Counter(bytes(block))
+        totals = []
+        for p in primes:
+            table = _byte_valuations(p)
+            totals.append(sum(count * table[b] for b, count in hist.items()))
+        return totals
+
+    values = [int(x) for x in block]
+    return [sum(v_p(n, p) for n in values if n != 0) for p in primes]
+
+
+def exponent_matrix_from_totals(totals: List[int]) -> List[List[int]]:
+    """Decompose per-prime exponent totals E_p over binary depth levels.
 
+    M[h][j] = (bit_h of E_j) * 2^h, so that sum_h M[h][j] = E_j.
+    Returns an empty matrix when all totals are zero.
+    """
     if not totals:
-        return [], primes
+        return []
 
     max_e = max(totals)
     if max_e == 0:
         # no p-adic content at all
-        return [], primes
+        return []
 
     H = max_e.bit_length()
     M: List[List[int]] = []
@@ -106,7 +149,25 @@ def build_exponent_matrix(
             row.append(bit * weight)
         M.append(row)
 
-    return M, primes
+    return M
+
+
+def build_exponent_matrix_from_residues(
+    residues: Mapping[int, int],
+) -> Tuple[List[List[int]], List[int]]:
+    """Build M[h][j] from a residue pattern {p: n mod p} (e.g. kernel 2310).
+
+    Each residue r_p is used as the column total E_p, then decomposed over
+    depth levels exactly like build_exponent_matrix. No factoring is needed.
+    """
+    primes = sorted(int(p) for p in residues)
+    totals = []
+    for p in primes:
+        r = int(residues[p])
+        if not 0 <= r < p:
+            raise ValueError(f"residue out of range for p={p}: {r}")
+        totals.append(r)
+    return exponent_matrix_from_totals(totals), primes
 
 
 def build_exponent_prism(block: bytes, primes: list[int]) -> list[list[int]]:
@@ -18,7 +18,7 @@ from dataclasses import asdict, dataclass
 from typing import Dict, List
 
 
-@dataclass
+@dataclass(slots=True)
 class CID:
     """Crystalline Identity for a single prime p."""
 
@@ -79,7 +79,10 @@ def compute_cids(M: List[List[int]], primes: List[int]) -> Dict[int, CID]:
 
 
 def _compute_matrix_fingerprint(
-    M: List[List[int]], primes: List[int], logic_signature: Dict | None = None
+    M: List[List[int]],
+    primes: List[int],
+    logic_signature: Dict | None = None,
+    prism_source: str = "bytes",
 ) -> str:
     """Compute SHA-256 fingerprint of the prism.
 
@@ -87,7 +90,9 @@ def _compute_matrix_fingerprint(
       - dimensions,
       - prime list,
       - raw exponent matrix M,
-      - logic mode + per-prime unary tables (if provided).
+      - logic mode + per-prime unary tables (if provided),
+      - prism source, unless it is the default byte-valuation prism
+        (so existing fingerprints are unchanged).
     """
     h = hashlib.sha256()
     H_total = len(M)
@@ -115,13 +120,26 @@ def _compute_matrix_fingerprint(
             t1 = int(bits.get("T1", 0)) & 1
             h.update(bytes([t0, t1]))
 
+    if prism_source != "bytes":
+        h.update(b"prism_source:" + prism_source.encode("utf-8"))
+
     return h.hexdigest()
 
 
 def build_cip(
-    M: List[List[int]], primes: List[int], cids: Dict[int, CID], logic_signature: Dict
+    M: List[List[int]],
+    primes: List[int],
+    cids: Dict[int, CID],
+    logic_signature: Dict,
+    *,
+    prism_source: str = "bytes",
 ) -> Dict:
-    """Build the CIP (prismatic identity) for the whole prism."""
+    """Build the CIP (prismatic identity) for the whole prism.
+
+    `prism_source` names where M came from ("bytes" or "kernel2310") and
+    is folded into the fingerprint, so equal matrices from different
+    sources never share a fingerprint.
+    """
     H_total_raw = len(M)
     if H_total_raw == 0:
         H_total = 0
@@ -147,7 +165,7 @@ def build_cip(
         row = M[h_idx]
         row_mass.append(sum(int(v) for v in row))
 
-    fingerprint = _compute_matrix_fingerprint(M, primes, logic_signature)
+    fingerprint = _compute_matrix_fingerprint(M, primes, logic_signature, prism_source)
 
     defects = {"model": "none", "params": {}}
 
@@ -6,17 +6,65 @@ SPEC:
 - Stato interno: s = n mod 2310, con 2310 = 2 * 3 * 5 * 7 * 11.
 - Update step: s_new = (10 * s_old + d) mod 2310.
 - Firma prismatica: (r2, r3, r5, r7, r11) = (n mod p) via s.
+
+Fast path (`update_state_2310_buffer`): per input ASCII (`bytes`, `str`,
+`memoryview`, mmap) le cifre vengono validate e convertite a blocchi di
+k cifre con int(), e lo stato avanza con s = (10^k * s + chunk) mod 2310.
+
+Parallelo (`kernel_2310_parallel`, `kernel_2310_from_file`): l'update è
+affine, quindi ogni blocco si riduce a una coppia (s, 10^len mod 2310) e le
+coppie si combinano in modo associativo:
+
+    (s_a, p_a) ∘ (s_b, p_b) = (s_a * p_b + s_b, p_a * p_b)   mod 2310
+
+Batch (`kernel_2310_batch`): un buffer di numeri separati da newline diventa
+una colonna di s_mod più una colonna di residui per primo. Per e >= 1,
+10^e mod 2310 dipende solo da e mod 6, quindi con NumPy ogni cifra riceve un
+peso da una tabella di 7 valori e ogni riga è una somma (np.add.reduceat).
 """
 
 from __future__ import annotations
 
+import mmap
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Union
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+try:  # NumPy è un'accelerazione opzionale per il batch.
+    import numpy as np
+except ImportError:  # pragma: no cover - dipende dall'ambiente
+    np = None
 
 MOD_2310 = 2310
 PRIMES_PENTAGON = (2, 3, 5, 7, 11)
 
 Digit = Union[int, str]
+DigitBuffer = Union[bytes, bytearray, memoryview, str]
+
+# Cifre per blocco nel fast path (ben sotto il limite di int() su stringhe).
+CHUNK_DIGITS_2310 = 256
+
+# Sotto questa dimensione per worker non conviene avviare processi.
+MIN_PARALLEL_CHUNK_2310 = 1 << 22
+
+# Forma affine di un blocco di cifre: (s, 10^len mod 2310).
+AffineState2310 = Tuple[int, int]
+
+# Byte per blocco nel batch vettoriale: blocchi piccoli restano in cache.
+BATCH_BLOCK_BYTES_2310 = 1 << 18
+
+# 10^e mod 2310: e = 0 -> 1; per e >= 1 il valore dipende da (e - 1) mod 6.
+_POW10_PERIOD_2310 = tuple(pow(10, e, MOD_2310) for e in range(7))
+
+
+def pow10_mod_2310(k: int) -> int:
+    """10^k mod 2310 in O(1) dalla tabella periodica (k >= 0)."""
+    if k < 0:
+        raise ValueError(f"esponente negativo: {k}")
+    return _POW10_PERIOD_2310[(k - 1) % 6 + 1 if k else 0]
 
 
 def _digit_to_int(ch: Digit) -> int:
@@ -34,6 +82,9 @@ def _digit_to_int(ch: Digit) -> int:
 
 def update_state_2310(digits: Iterable[Digit]) -> int:
     """Elabora uno stream di cifre decimali e restituisce s = n mod 2310."""
+    if isinstance(digits, str):
+        return update_state_2310_buffer(digits)
+
     s = 0
     for ch in digits:
         d = _digit_to_int(ch)
@@ -41,7 +92,50 @@ def update_state_2310(digits: Iterable[Digit]) -> int:
     return s
 
 
-@dataclass(frozen=True)
+def _invalid_digit_error(chunk: bytes | str, offset: int) -> ValueError:
+    """Costruisce l'errore per il primo carattere non decimale del blocco."""
+    for pos, ch in enumerate(chunk):
+        if isinstance(ch, int):
+            ch = chr(ch)
+        if not ("0" <= ch <= "9"):
+            return ValueError(f"Digit non valido in posizione {offset + pos}: {ch!r}")
+    return ValueError(f"Digit non valido nel blocco alla posizione {offset}")
+
+
+def update_state_2310_buffer(
+    data: DigitBuffer, *, chunk_digits: int = CHUNK_DIGITS_2310, state: int = 0
+) -> int:
+    """Fast path: s = n mod 2310 per un buffer di cifre ASCII '0'..'9'.
+
+    `state` permette di continuare uno stream già elaborato in parte.
+    Restituisce lo stesso valore di update_state_2310 sulla stessa stringa.
+    """
+    if chunk_digits <= 0:
+        raise ValueError(f"chunk_digits deve essere positivo: {chunk_digits}")
+
+    is_str = isinstance(data, str)
+    if isinstance(data, memoryview):
+        data = data.cast("B") if data.format != "B" else data
+
+    s = state % MOD_2310
+    pow_chunk = pow(10, chunk_digits, MOD_2310)
+    n = len(data)
+
+    for start in range(0, n, chunk_digits):
+        chunk = data[start : start + chunk_digits]
+        if isinstance(chunk, memoryview):
+            chunk = chunk.tobytes()
+        if not (chunk.isdigit() and (not is_str or chunk.isascii())):
+            raise _invalid_digit_error(chunk, start)
+        if len(chunk) == chunk_digits:
+            s = (s * pow_chunk + int(chunk)) % MOD_2310
+        else:
+            s = (s * pow(10, len(chunk), MOD_2310) + int(chunk)) % MOD_2310
+
+    return s
+
+
+@dataclass(frozen=True, slots=True)
 class PrismSignature2310:
     """Firma prismatica pentagonale per il kernel decimale."""
 
@@ -53,7 +147,7 @@ class PrismSignature2310:
 def state_to_prism_signature_2310(s: int) -> PrismSignature2310:
     """Costruisce la firma prismatica (r2,r3,r5,r7,r11) a partire da s = n mod 2310."""
     if not (0 <= s < MOD_2310):
-        raise ValueError(f"s deve essere in [0..{MOD_2310-1}], ricevuto {s}")
+        raise ValueError(f"s deve essere in [0..{MOD_2310 - 1}], ricevuto {s}")
 
     residues: Dict[int, int] = {}
     vector: List[int] = []
@@ -69,3 +163,269 @@ def kernel_2310_from_digits(digits: Iterable[Digit]) -> PrismSignature2310:
     """Convenience: stream di cifre -> firma prismatica (s_mod + residui)."""
     s = update_state_2310(digits)
     return state_to_prism_signature_2310(s)
+
+
+def kernel_2310_from_buffer(data: DigitBuffer) -> PrismSignature2310:
+    """Come kernel_2310_from_digits, ma sul fast path per buffer ASCII."""
+    return state_to_prism_signature_2310(update_state_2310_buffer(data))
+
+
+# ---------------------------------------------------------------------------
+# Riduzione parallela (blocchi affini combinati in modo associativo)
+# ---------------------------------------------------------------------------
+
+
+def chunk_state_2310(data: DigitBuffer) -> AffineState2310:
+    """Riduce un blocco di cifre ASCII alla coppia (s, 10^len mod 2310)."""
+    return update_state_2310_buffer(data), pow(10, len(data), MOD_2310)
+
+
+def combine_states_2310(
+    left: AffineState2310, right: AffineState2310
+) -> AffineState2310:
+    """Concatena due blocchi: prima `left`, poi `right` (operazione associativa)."""
+    s_left, p_left = left
+    s_right, p_right = right
+    return (s_left * p_right + s_right) % MOD_2310, (p_left * p_right) % MOD_2310
+
+
+def _split_ranges(size: int, workers: int, min_chunk: int) -> List[Tuple[int, int]]:
+    parts = max(1, min(workers, size // max(1, min_chunk)))
+    step = -(-size // parts) if size else 0
+    return [(start, min(start + step, size)) for start in range(0, size, step or 1)]
+
+
+def _file_range_state(path: str, start: int, stop: int) -> AffineState2310:
+    """Worker: stato affine dei byte [start, stop) di un file mappato."""
+    if stop <= start:
+        return 0, 1
+    with open(path, "rb") as fh:
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                try:
+                    return chunk_state_2310(view[start:stop])
+                except ValueError as exc:
+                    raise ValueError(f"{exc} (byte {start}.. di {path})") from None
+
+
+def _digits_end(mm: mmap.mmap) -> int:
+    """Fine utile del file: ignora newline finali."""
+    end = len(mm)
+    while end and mm[end - 1] in b"\r\n":
+        end -= 1
+    return end
+
+
+def kernel_2310_parallel(
+    data: DigitBuffer,
+    *,
+    workers: int | None = None,
+    min_chunk: int = MIN_PARALLEL_CHUNK_2310,
+) -> PrismSignature2310:
+    """Kernel 2310 su un buffer grande, ripartito su un pool di processi."""
+    workers = workers or os.cpu_count() or 1
+    ranges = _split_ranges(len(data), workers, min_chunk)
+    if len(ranges) <= 1:
+        return kernel_2310_from_buffer(data)
+
+    chunks = [data[start:stop] for start, stop in ranges]
+    if isinstance(data, memoryview):
+        chunks = [c.tobytes() for c in chunks]
+
+    state: AffineState2310 = (0, 1)
+    with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+        for part in pool.map(chunk_state_2310, chunks):
+            state = combine_states_2310(state, part)
+    return state_to_prism_signature_2310(state[0])
+
+
+def kernel_2310_from_file(
+    path: str | os.PathLike[str],
+    *,
+    workers: int | None = None,
+    min_chunk: int = MIN_PARALLEL_CHUNK_2310,
+) -> PrismSignature2310:
+    """Kernel 2310 su un file di cifre ASCII (mmap), in parallelo se conviene.
+
+    Ogni worker mappa il file per conto proprio e riduce il suo intervallo di
+    byte a (s, 10^len mod 2310); i newline finali vengono ignorati.
+    """
+    path = str(Path(path))
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return state_to_prism_signature_2310(0)
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = _digits_end(mm)
+
+    workers = workers or os.cpu_count() or 1
+    ranges = _split_ranges(end, workers, min_chunk)
+    if len(ranges) <= 1:
+        s, _ = _file_range_state(path, 0, end)
+        return state_to_prism_signature_2310(s)
+
+    state: AffineState2310 = (0, 1)
+    with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+        starts = [start for start, _ in ranges]
+        stops = [stop for _, stop in ranges]
+        for part in pool.map(_file_range_state, [path] * len(ranges), starts, stops):
+            state = combine_states_2310(state, part)
+    return state_to_prism_signature_2310(state[0])
+
+
+# ---------------------------------------------------------------------------
+# Batch: molti numeri corti separati da newline
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class PrismBatch2310:
+    """Firme pentagonali di molti numeri, in colonne compatte.
+
+    Con NumPy le colonne sono ndarray (uint16 per s_mod, uint8 per i
+    residui), altrimenti `array('H')` / `array('B')`.
+    """
+
+    s_mod: Any  # n mod 2310 per riga
+    residues: Dict[int, Any]  # p -> colonna di (n mod p)
+
+    def __len__(self) -> int:
+        return len(self.s_mod)
+
+    def signature(self, i: int) -> PrismSignature2310:
+        return state_to_prism_signature_2310(int(self.s_mod[i]))
+
+
+def _pow10_table_2310(length: int) -> Any:
+    """Tabella uint32 [10^e mod 2310 for e in range(length)] (periodica)."""
+    table = np.empty(max(length, 1), dtype=np.uint32)
+    table[0] = 1
+    period = np.asarray(_POW10_PERIOD_2310[1:], dtype=np.uint32)
+    reps = -(-(len(table) - 1) // 6)
+    table[1:] = np.tile(period, reps)[: len(table) - 1]
+    return table
+
+
+def _batch_block_numpy(view: Any, offset: int) -> Any:
+    """s_mod per le righe di un blocco uint8 che termina a fine riga."""
+    is_nl = view == 10
+    nl = np.flatnonzero(is_nl)
+    n = len(view)
+
+    # Un '\r' è ammesso solo subito prima di un newline (CRLF).
+    is_cr = view == 13
+    is_cr[:-1] &= is_nl[1:]
+    is_cr[-1] = False
+
+    digits = view - np.uint8(48)
+    bad = np.flatnonzero((digits > 9) & ~is_nl & ~is_cr)
+    if len(bad):
+        pos = int(bad[0])
+        msg = f"Digit non valido in posizione {offset + pos}: {chr(view[pos])!r}"
+        raise ValueError(msg)
+
+    ends = nl if view[-1] == 10 else np.append(nl, n)
+    starts = np.concatenate(([0], nl + 1))[: len(ends)]
+
+    # Esponente e di ogni cifra: distanza dalla fine delle cifre della sua
+    # riga - 1 (il '\r' di un CRLF non conta). Su newline e '\r', che
+    # hanno cifra azzerata, e è negativo e viene riportato a 0.
+    counts = ends - starts + 1
+    counts[-1] = n - starts[-1]
+    digit_ends = ends.astype(np.int32)
+    digit_ends[is_cr[np.maximum(ends - 1, 0)] & (ends > starts)] -= 1
+    e = np.repeat(digit_ends, counts)
+    e -= np.arange(1, n + 1, dtype=np.int32)
+    np.maximum(e, 0, out=e)
+    weights = _pow10_table_2310(int(counts.max()))[e]
+
+    digits[is_nl | is_cr] = 0
+    contrib = digits.astype(np.uint32)
+    contrib *= weights
+    sums = np.add.reduceat(contrib, starts, dtype=np.uint64)
+    sums[ends == starts] = 0  # righe vuote: n = 0
+    return (sums % MOD_2310).astype(np.uint16)
+
+
+def _batch_numpy(data: Any, block_bytes: int) -> Any:
+    buf = np.frombuffer(data, dtype=np.uint8)
+    if not len(buf):
+        return np.zeros(0, dtype=np.uint16)
+
+    parts = []
+    start = 0
+    n = len(buf)
+    while start < n:
+        end = min(start + block_bytes, n)
+        if end < n:
+            # Il blocco deve finire su un newline (riga intera).
+            nl = np.flatnonzero(buf[start:end] == 10)
+            if len(nl):
+                end = start + int(nl[-1]) + 1
+            else:
+                nxt = np.flatnonzero(buf[end:] == 10)
+                end = end + int(nxt[0]) + 1 if len(nxt) else n
+        parts.append(_batch_block_numpy(buf[start:end], start))
+        start = end
+    return np.concatenate(parts)
+
+
+def _batch_python(data: Any) -> array:
+    # bytes e mmap hanno find(): le righe si leggono senza copiare il buffer.
+    raw = data if hasattr(data, "find") else bytes(data)
+    n = len(raw)
+
+    out = array("H")
+    offset = 0
+    while offset < n:
+        end = raw.find(b"\n", offset)
+        if end < 0:
+            end = n
+        line = raw[offset:end]
+        if line.endswith(b"\r") and end < n:
+            line = line[:-1]  # terminatore CRLF
+        if not line:
+            out.append(0)
+        elif len(line) <= CHUNK_DIGITS_2310 and line.isdigit():
+            out.append(int(line) % MOD_2310)
+        else:
+            try:
+                out.append(update_state_2310_buffer(line))
+            except ValueError as exc:
+                raise ValueError(f"{exc} (riga al byte {offset})") from None
+        offset = end + 1
+    return out
+
+
+def kernel_2310_batch(
+    data: bytes | bytearray | memoryview | mmap.mmap,
+    *,
+    block_bytes: int = BATCH_BLOCK_BYTES_2310,
+) -> PrismBatch2310:
+    """Kernel 2310 su un buffer di numeri decimali separati da newline.
+
+    Una riga vuota vale 0 e un newline finale non aggiunge righe; i
+    terminatori CRLF sono accettati. Il risultato ha una riga per numero.
+    """
+    if isinstance(data, memoryview):
+        data = data.cast("B") if data.format != "B" else data
+
+    if np is not None:
+        s_mod = _batch_numpy(data, block_bytes)
+        residues = {p: (s_mod % p).astype(np.uint8) for p in PRIMES_PENTAGON}
+    else:
+        s_mod = _batch_python(data)
+        residues = {p: array("B", (s % p for s in s_mod)) for p in PRIMES_PENTAGON}
+
+    return PrismBatch2310(s_mod=s_mod, residues=residues)
+
+
+def kernel_2310_batch_from_file(
+    path: str | os.PathLike[str], **kwargs: Any
+) -> PrismBatch2310:
+    """kernel_2310_batch su un file mappato in memoria."""
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return kernel_2310_batch(b"", **kwargs)
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            batch = kernel_2310_batch(mm, **kwargs)
+    return batch
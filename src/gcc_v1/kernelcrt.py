@@ -0,0 +1,200 @@
+"""GCC v1 generalized kernel: n mod M per più primi/moduli in un solo passaggio.
+
+Generalizza `kernel2310.py` (base 10, M = 2310, primi 2,3,5,7,11):
+
+- Input: stream di cifre ASCII in base 2, 8, 10 o 16.
+- Modulo: M = lcm(prodotto dei primi, moduli extra), anche oltre 64 bit.
+- Update a blocchi: s_new = (radix^k * s_old + chunk) mod M.
+- Firma: (n mod p) per ogni primo, più n mod m per ogni modulo m | M.
+
+Con M multiplo di tutti i moduli richiesti basta un solo passaggio
+sull'input: ogni stato si ricava come s mod m (CRT).
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from math import gcd, prod
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .exponents import sieve_primes
+from .kernel2310 import (
+    MOD_2310,
+    DigitBuffer,
+    PrismSignature2310,
+    state_to_prism_signature_2310,
+)
+
+SUPPORTED_RADICES = (2, 8, 10, 16)
+
+_RADIX_DIGITS = {
+    2: b"01",
+    8: b"01234567",
+    10: b"0123456789",
+    16: b"0123456789abcdefABCDEF",
+}
+
+# Cifre per blocco: int() è lineare per le basi potenze di 2, quadratico in
+# base 10 (e limitato a ~4300 cifre), quindi lì si usano blocchi più piccoli.
+_CHUNK_DIGITS = {2: 1 << 14, 8: 1 << 13, 10: 256, 16: 1 << 12}
+
+
+def primorial_primes(limit: int) -> List[int]:
+    """Primi <= limit (il loro prodotto è il primoriale limit#)."""
+    return sieve_primes(limit)
+
+
+def _lcm(a: int, b: int) -> int:
+    return a // gcd(a, b) * b
+
+
+@dataclass(frozen=True)
+class CRTSignature:
+    """Firma multi-modulo: stato s = n mod M e residui per primo."""
+
+    modulus: int  # M
+    s_mod: int  # n mod M
+    residues: Dict[int, int]  # p -> (n mod p)
+    vector: List[int]  # [n mod p] nell'ordine dei primi
+
+    def state_mod(self, m: int) -> int:
+        """n mod m per un qualsiasi divisore m di M."""
+        if m <= 0 or self.modulus % m:
+            raise ValueError(f"{m} non divide il modulo del kernel {self.modulus}")
+        return self.s_mod % m
+
+    def to_prism_signature_2310(self) -> PrismSignature2310:
+        """Firma pentagonale compatibile con kernel2310 (serve 2310 | M)."""
+        return state_to_prism_signature_2310(self.state_mod(MOD_2310))
+
+
+class CRTKernel:
+    """Kernel a stato n mod M, alimentabile a blocchi (stile hashlib).
+
+    Esempio:
+
+        k = CRTKernel(primorial_primes(31), moduli=[2**61 - 1], radix=16)
+        k.feed(b"ff00")
+        k.feed(b"12")
+        sig = k.signature()
+    """
+
+    def __init__(
+        self,
+        primes: Iterable[int] = (2, 3, 5, 7, 11),
+        *,
+        moduli: Sequence[int] = (),
+        radix: int = 10,
+        chunk_digits: Optional[int] = None,
+    ) -> None:
+        if radix not in SUPPORTED_RADICES:
+            raise ValueError(f"radix non supportata: {radix!r}")
+
+        self.primes: Tuple[int, ...] = tuple(int(p) for p in primes)
+        self.moduli: Tuple[int, ...] = tuple(int(m) for m in moduli)
+        for m in self.primes + self.moduli:
+            if m < 2:
+                raise ValueError(f"primi e moduli devono essere >= 2, ricevuto {m}")
+
+        modulus = prod(self.primes) if self.primes else 1
+        for m in self.moduli:
+            modulus = _lcm(modulus, m)
+
+        self.modulus = modulus
+        self.radix = radix
+        self.chunk_digits = int(chunk_digits or _CHUNK_DIGITS[radix])
+        if self.chunk_digits <= 0:
+            raise ValueError(f"chunk_digits deve essere positivo: {chunk_digits}")
+        self._pow_chunk = pow(radix, self.chunk_digits, modulus)
+        self._valid = _RADIX_DIGITS[radix]
+        self._state = 0
+        self._length = 0
+
+    @classmethod
+    def for_primorial(cls, limit: int, **kwargs: Any) -> CRTKernel:
+        """Kernel su tutti i primi <= limit (M = limit#)."""
+        return cls(primorial_primes(limit), **kwargs)
+
+    @property
+    def state(self) -> int:
+        return self._state
+
+    @property
+    def length(self) -> int:
+        """Numero di cifre elaborate finora."""
+        return self._length
+
+    def reset(self) -> None:
+        self._state = 0
+        self._length = 0
+
+    def feed(self, data: DigitBuffer) -> CRTKernel:
+        """Aggiunge cifre ASCII in coda al numero (validazione a blocchi)."""
+        if isinstance(data, str):
+            try:
+                data = data.encode("ascii")
+            except UnicodeEncodeError:
+                raise ValueError("le cifre devono essere ASCII") from None
+        elif isinstance(data, memoryview) and data.format != "B":
+            data = data.cast("B")
+
+        s = self._state
+        m = self.modulus
+        k = self.chunk_digits
+        radix = self.radix
+        for start in range(0, len(data), k):
+            chunk = data[start : start + k]
+            if isinstance(chunk, memoryview):
+                chunk = chunk.tobytes()
+            if chunk.translate(None, self._valid):
+                raise self._invalid_digit_error(chunk, self._length + start)
+            if len(chunk) == k:
+                s = (s * self._pow_chunk + int(chunk, radix)) % m
+            else:
+                s = (s * pow(radix, len(chunk), m) + int(chunk, radix)) % m
+
+        self._state = s
+        self._length += len(data)
+        return self
+
+    def feed_file(
+        self, path: Union[str, os.PathLike[str]], *, block_size: int = 1 << 20
+    ) -> CRTKernel:
+        """Alimenta il kernel leggendo un file a blocchi (newline finali ignorati)."""
+        pending = b""
+        with open(path, "rb") as fh:
+            while True:
+                block = fh.read(block_size)
+                if not block:
+                    break
+                # I newline possono stare solo in coda: li teniamo da parte.
+                data = pending + block
+                stripped = data.rstrip(b"\r\n")
+                pending = data[len(stripped) :]
+                self.feed(stripped)
+        return self
+
+    def signature(self) -> CRTSignature:
+        s = self._state
+        residues = {p: s % p for p in self.primes}
+        return CRTSignature(
+            modulus=self.modulus,
+            s_mod=s,
+            residues=residues,
+            vector=[residues[p] for p in self.primes],
+        )
+
+    def compute(self, data: DigitBuffer) -> CRTSignature:
+        """One-shot: reset + feed + signature."""
+        self.reset()
+        return self.feed(data).signature()
+
+    def _invalid_digit_error(self, chunk: bytes, offset: int) -> ValueError:
+        for pos, byte in enumerate(chunk):
+            if byte not in self._valid:
+                return ValueError(
+                    f"Digit non valido in base {self.radix} "
+                    f"in posizione {offset + pos}: {chr(byte)!r}"
+                )
+        return ValueError(f"Digit non valido nel blocco alla posizione {offset}")
@@ -10,17 +10,64 @@ Defines:
     T_p(1) = output bit with input 1
 
 for the whole column corresponding to prime p.
+
+Evaluation is table-driven: every nodulo acts on the bit as one of four
+unary maps (identity, NOT, const 0, const 1), stored as (f(0), f(1)).
+`CompiledLogicOp` probes the operator once per distinct cell and composes
+each column into a single 2-entry map, caching columns by pattern.
+
+`build_packed_logic_signatures` is the bit-sliced batch version: the same
+(depth, prime) cell of N blocks is handled as one N-wide bit vector (NumPy
+bool array, or a Python int used as a bitset), so each distinct cell map
+costs a few bitwise operations for all blocks at once.
 """
 
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, List, Protocol, runtime_checkable
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    runtime_checkable,
+)
+
+from .spectrum import PackedSignature
+
+try:  # NumPy is an optional accelerator for the batch engine.
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+# Unary bit map as (f(0), f(1)); composing a column yields (T_p(0), T_p(1)).
+BitMap = Tuple[int, int]
+IDENTITY_MAP: BitMap = (0, 1)
+
+# What an operator's output may depend on, besides the input bit.
+LOGIC_DEPENDENCIES = ("parity", "exponent", "p", "h")
+
+# Assumed when an operator does not declare `depends_on`.
+_DEFAULT_DEPENDENCIES = ("exponent", "p", "h")
+
+# Entries kept (LRU) by each of the cell and column caches of a CompiledLogicOp.
+_COMPILED_CACHE_SIZE = 4096
 
 
 @runtime_checkable
 class LogicOp(Protocol):
-    """Abstract logical operator applied to a nodulo (h, p)."""
+    """Abstract logical operator applied to a nodulo (h, p).
+
+    Operators may declare an optional class attribute `depends_on`, a
+    subset of LOGIC_DEPENDENCIES ("parity" means only exponent & 1). The
+    compiler then shares table entries across cells with the same key.
+    Without it, each distinct (exponent, p, h) is probed once.
+    """
 
     name: str
 
@@ -46,6 +93,7 @@ class XorLogicOp:
     """
 
     name: str = "xor-v1"
+    depends_on: ClassVar[Tuple[str, ...]] = ("parity",)
 
     def apply(self, bit_in: int, exponent: int, *, p: int, h: int) -> int:
         if exponent & 1:
@@ -53,16 +101,207 @@ class XorLogicOp:
         return bit_in
 
 
-def _apply_column(column: List[int], bit_in: int, *, p: int, op: LogicOp) -> int:
-    """Propagate a bit through all noduli in a column for prime p."""
-    s = bit_in
-    for h, e in enumerate(column):
-        if e:
-            s = op.apply(s, e, p=p, h=h)
-    return s
+@dataclass(frozen=True)
+class NotXorLogicOp:
+    """NOT.XOR core: a nodulo flips the bit when its exponent is even."""
+
+    name: str = "not-xor-v1"
+    depends_on: ClassVar[Tuple[str, ...]] = ("parity",)
+
+    def apply(self, bit_in: int, exponent: int, *, p: int, h: int) -> int:
+        if exponent & 1:
+            return bit_in
+        return bit_in ^ 1
+
+
+@dataclass(frozen=True)
+class DepthXorLogicOp:
+    """h-dependent XOR: a nodulo flips the bit when exponent + h is odd."""
+
+    name: str = "xor-depth-v1"
+    depends_on: ClassVar[Tuple[str, ...]] = ("parity", "h")
+
+    def apply(self, bit_in: int, exponent: int, *, p: int, h: int) -> int:
+        return bit_in ^ ((exponent + h) & 1)
+
+
+@dataclass(frozen=True)
+class PrimeXorLogicOp:
+    """p-dependent XOR: odd exponents flip, with an extra flip for p = 3 mod 4."""
+
+    name: str = "xor-prime-v1"
+    depends_on: ClassVar[Tuple[str, ...]] = ("parity", "p")
+
+    def apply(self, bit_in: int, exponent: int, *, p: int, h: int) -> int:
+        return bit_in ^ (exponent & 1) ^ int(p % 4 == 3)
+
+
+# ---------------------------------------------------------------------------
+# Registry (logic_mode -> LogicOp)
+# ---------------------------------------------------------------------------
+
+_REGISTRY: Dict[str, LogicOp] = {}
+
+# Compiled tables of the registered operators, by logic_mode.
+_COMPILED: Dict[str, CompiledLogicOp] = {}
+
+
+def register_logic_op(op: LogicOp, *, replace: bool = False) -> LogicOp:
+    """Register an operator under its `name` (the logic_mode it writes)."""
+    if not isinstance(op, LogicOp):
+        raise TypeError(f"not a LogicOp: {op!r}")
+    if op.name in _REGISTRY and not replace:
+        raise ValueError(f"LogicOp already registered: {op.name!r}")
+    _REGISTRY[op.name] = op
+    _COMPILED.pop(op.name, None)
+    return op
+
+
+def get_logic_op(name: str) -> LogicOp:
+    """Resolve a logic_mode (e.g. from a CIP header) to its operator."""
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        known = ", ".join(sorted(_REGISTRY))
+        raise ValueError(f"unknown logic_mode {name!r} (known: {known})") from None
+
+
+def available_logic_ops() -> List[str]:
+    return sorted(_REGISTRY)
+
+
+for _op in (XorLogicOp(), NotXorLogicOp(), DepthXorLogicOp(), PrimeXorLogicOp()):
+    register_logic_op(_op)
+
+
+class CompiledLogicOp:
+    """Table-driven evaluation of a LogicOp.
+
+    Cell maps are probed lazily (two `apply` calls per distinct key) and
+    column maps are cached by (p, column), with p dropped from the key when
+    the operator does not depend on it. Parity-only operators key columns
+    on per-cell parities, so columns with the same flip pattern share an
+    entry. Both caches are LRU, bounded by `_COMPILED_CACHE_SIZE`.
+    """
+
+    def __init__(self, op: LogicOp) -> None:
+        deps = frozenset(getattr(op, "depends_on", _DEFAULT_DEPENDENCIES))
+        unknown = deps - set(LOGIC_DEPENDENCIES)
+        if unknown:
+            raise ValueError(f"unknown LogicOp dependencies: {sorted(unknown)}")
+
+        self.op = op
+        self.name = op.name
+        self._exponent = "exponent" in deps
+        self._parity = "parity" in deps and not self._exponent
+        self._p = "p" in deps
+        self._h = "h" in deps
+        self._cells: OrderedDict[Tuple, BitMap] = OrderedDict()
+        self._columns: OrderedDict[Tuple, BitMap] = OrderedDict()
 
+    def _exponent_key(self, e: int) -> Optional[int]:
+        if self._exponent:
+            return e
+        if self._parity:
+            return e & 1
+        return None
 
-def build_logic_signature(M: List[List[int]], primes: List[int], op: LogicOp) -> Dict:
+    def cell_map(self, exponent: int, *, p: int, h: int) -> BitMap:
+        """Unary map applied by a single non-zero nodulo."""
+        key = (
+            self._exponent_key(exponent),
+            p if self._p else None,
+            h if self._h else None,
+        )
+        cells = self._cells
+        m = cells.get(key)
+        if m is None:
+            op = self.op
+            m = (
+                int(op.apply(0, exponent, p=p, h=h)) & 1,
+                int(op.apply(1, exponent, p=p, h=h)) & 1,
+            )
+            _lru_put(cells, key, m)
+        else:
+            cells.move_to_end(key)
+        return m
+
+    def _column_key(self, column: Sequence[int], *, p: int) -> Tuple:
+        """Cache key of a column: only what the operator can observe."""
+        if self._exponent:
+            cells = tuple(column)
+        elif self._parity:
+            # 0 = empty nodulo (skipped), 1 = odd exponent, 2 = even exponent.
+            cells = tuple(2 - (e & 1) if e else 0 for e in column)
+        else:
+            cells = tuple(1 if e else 0 for e in column)
+        return (p if self._p else None, cells)
+
+    def _cached_column_map(self, key: Tuple) -> Optional[BitMap]:
+        m = self._columns.get(key)
+        if m is not None:
+            self._columns.move_to_end(key)
+        return m
+
+    def _cache_column_map(self, key: Tuple, m: BitMap) -> None:
+        _lru_put(self._columns, key, m)
+
+    def column_map(self, column: Sequence[int], *, p: int) -> BitMap:
+        """Compose all non-zero noduli of a column into (T_p(0), T_p(1))."""
+        key = self._column_key(column, p=p)
+        m = self._cached_column_map(key)
+        if m is None:
+            f0, f1 = IDENTITY_MAP
+            for h, e in enumerate(column):
+                if e:
+                    g = self.cell_map(e, p=p, h=h)
+                    f0, f1 = g[f0], g[f1]
+            m = (f0, f1)
+            self._cache_column_map(key, m)
+        return m
+
+
+def _lru_put(cache: OrderedDict, key: Tuple, value: BitMap) -> None:
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > _COMPILED_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def compile_logic_op(op: LogicOp | CompiledLogicOp) -> CompiledLogicOp:
+    """Compile a LogicOp.
+
+    Registered operators (or equal instances) share one cached compilation
+    per logic_mode; any other operator is compiled afresh, so ad-hoc ops
+    never accumulate in a global table. Pass the returned object around to
+    reuse its tables.
+    """
+    if isinstance(op, CompiledLogicOp):
+        return op
+    name = getattr(op, "name", None)
+    registered = _REGISTRY.get(name) if isinstance(name, str) else None
+    if registered is None or not (registered is op or registered == op):
+        return CompiledLogicOp(op)
+    compiled = _COMPILED.get(name)
+    if compiled is None:
+        compiled = _COMPILED[name] = CompiledLogicOp(registered)
+    return compiled
+
+
+def _columns(M: List[List[int]], primes: Sequence[int]) -> List[Tuple[int, ...]]:
+    """Columns of M, one per prime (all empty when M has no rows)."""
+    if not M:
+        return [()] * len(primes)
+    if any(len(row) != len(primes) for row in M):
+        raise ValueError(
+            f"exponent matrix rows must have {len(primes)} columns (one per prime)"
+        )
+    return list(zip(*M, strict=True))
+
+
+def build_logic_signature(
+    M: List[List[int]], primes: List[int], op: LogicOp | CompiledLogicOp
+) -> Dict:
     """Compute the logical signature per prime.
 
     For each prime p:
@@ -80,13 +319,214 @@ def build_logic_signature(M: List[List[int]], primes: List[int], op: LogicOp) ->
           }
         }
     """
-    H_total = len(M)
+    compiled = compile_logic_op(op)
+    columns = _columns(M, primes)
     logic_per_prime: Dict[int, Dict[str, int]] = {}
 
-    for j, p in enumerate(primes):
-        column = [M[h][j] for h in range(H_total)]
-        T0 = _apply_column(column, 0, p=p, op=op)
-        T1 = _apply_column(column, 1, p=p, op=op)
-        logic_per_prime[p] = {"T0": int(T0), "T1": int(T1)}
+    for p, column in zip(primes, columns, strict=True):
+        T0, T1 = compiled.column_map(column, p=p)
+        logic_per_prime[p] = {"T0": T0, "T1": T1}
+
+    return {"logic_mode": compiled.name, "per_prime": logic_per_prime}
+
+
+def build_logic_signatures_multi(
+    M: List[List[int]], primes: List[int], ops: Sequence[LogicOp | CompiledLogicOp]
+) -> Dict[str, Dict]:
+    """Logic signatures of the same prism for several operators.
+
+    The prism is traversed once: each column is walked a single time,
+    composing the cell maps of every operator whose column cache misses.
+    Returns {logic_mode: signature}.
+    """
+    compiled = [compile_logic_op(op) for op in ops]
+    names = [c.name for c in compiled]
+    if len(set(names)) != len(names):
+        raise ValueError(f"duplicate logic_mode in ops: {names}")
+
+    columns = _columns(M, primes)
+    per_op: List[Dict[int, Dict[str, int]]] = [{} for _ in compiled]
+
+    for p, column in zip(primes, columns, strict=True):
+        keys = [c._column_key(column, p=p) for c in compiled]
+        maps = [
+            c._cached_column_map(key) for c, key in zip(compiled, keys, strict=True)
+        ]
+        missing = [i for i, m in enumerate(maps) if m is None]
+        if missing:
+            states = {i: IDENTITY_MAP for i in missing}
+            for h, e in enumerate(column):
+                if e:
+                    for i in missing:
+                        g = compiled[i].cell_map(e, p=p, h=h)
+                        f0, f1 = states[i]
+                        states[i] = (g[f0], g[f1])
+            for i in missing:
+                compiled[i]._cache_column_map(keys[i], states[i])
+                maps[i] = states[i]
+        for i, (T0, T1) in enumerate(maps):
+            per_op[i][p] = {"T0": T0, "T1": T1}
+
+    return {
+        name: {"logic_mode": name, "per_prime": per_prime}
+        for name, per_prime in zip(names, per_op, strict=True)
+    }
+
 
-    return {"logic_mode": op.name, "per_prime": logic_per_prime}
+# ---------------------------------------------------------------------------
+# Bit-sliced batch evaluation
+# ---------------------------------------------------------------------------
+
+# Blocks per NumPy slab (bounds the (N, H, k) exponent array).
+_BATCH_BLOCKS = 1 << 13
+
+
+def _apply_map_bits(g: BitMap, f: int, mask: int) -> int:
+    """Apply the unary map g to the bits of f selected by mask."""
+    if g == (0, 1):
+        return f
+    if g == (1, 0):
+        return f ^ mask
+    if g == (0, 0):
+        return f & ~mask
+    return f | mask
+
+
+def _packed_bigint(
+    Ms: Sequence[List[List[int]]], primes: List[int], compiled: CompiledLogicOp
+) -> List[PackedSignature]:
+    """Bitset path: one Python int of N bits per (prime, T0/T1)."""
+    n = len(Ms)
+    k = len(primes)
+    # (h, j, reduced key) -> [representative exponent, block indices]
+    groups: Dict[Tuple, list] = {}
+    for b, M in enumerate(Ms):
+        for h, row in enumerate(M):
+            for j, e in enumerate(row):
+                if e:
+                    key = (h, j, compiled._exponent_key(e))
+                    entry = groups.get(key)
+                    if entry is None:
+                        groups[key] = [e, [b]]
+                    else:
+                        entry[1].append(b)
+
+    full = (1 << n) - 1
+    T0 = [0] * k
+    T1 = [full] * k
+    for (h, j, _key), (e, blocks) in sorted(groups.items(), key=lambda kv: kv[0][:2]):
+        bits = bytearray((n + 7) // 8)
+        for b in blocks:
+            bits[b >> 3] |= 1 << (b & 7)
+        mask = int.from_bytes(bits, "little")
+        g = compiled.cell_map(e, p=primes[j], h=h)
+        T0[j] = _apply_map_bits(g, T0[j], mask)
+        T1[j] = _apply_map_bits(g, T1[j], mask)
+
+    # Transpose (prime -> N bits) into (block -> k bits) via byte views.
+    size = (n + 7) // 8
+    T0_bytes = [t.to_bytes(size, "little") for t in T0]
+    T1_bytes = [t.to_bytes(size, "little") for t in T1]
+    primes_t = tuple(primes)
+    out = []
+    for b in range(n):
+        byte, shift = b >> 3, b & 7
+        t0 = t1 = 0
+        for j in range(k):
+            t0 |= ((T0_bytes[j][byte] >> shift) & 1) << j
+            t1 |= ((T1_bytes[j][byte] >> shift) & 1) << j
+        out.append(PackedSignature(primes=primes_t, t0=t0, t1=t1))
+    return out
+
+
+def _pack_rows(bits: Any) -> List[int]:
+    """(N, k) bool matrix -> one int per row, bit j = column j."""
+    k = bits.shape[1]
+    if k <= 63:
+        weights = np.left_shift(np.uint64(1), np.arange(k, dtype=np.uint64))
+        return [int(v) for v in (bits.astype(np.uint64) * weights).sum(axis=1)]
+    return [sum(1 << j for j in np.flatnonzero(row).tolist()) for row in bits]
+
+
+def _packed_numpy(
+    Ms: Sequence[List[List[int]]], primes: List[int], compiled: CompiledLogicOp
+) -> List[PackedSignature]:
+    """NumPy path: (N, k) bool state propagated layer by layer."""
+    n = len(Ms)
+    k = len(primes)
+    H = max((len(M) for M in Ms), default=0)
+    arr = np.zeros((n, H, k), dtype=np.int64)
+    rows = [row for M in Ms for row in M]
+    if rows:
+        # Scatter all rows at once: row r belongs to block blk[r], depth hh[r].
+        lengths = np.fromiter((len(M) for M in Ms), dtype=np.int64, count=n)
+        blk = np.repeat(np.arange(n), lengths)
+        starts = np.cumsum(lengths) - lengths
+        hh = np.arange(len(rows)) - np.repeat(starts, lengths)
+        arr[blk, hh] = np.asarray(rows, dtype=np.int64)
+
+    T0 = np.zeros((n, k), dtype=bool)
+    T1 = np.ones((n, k), dtype=bool)
+    for h in range(H):
+        layer = arr[:, h, :]
+        nz = layer != 0
+        if not nz.any():
+            continue
+        if compiled._exponent:
+            keys = layer
+        elif compiled._parity:
+            keys = layer & 1
+        else:
+            keys = np.zeros_like(layer)
+        for v in np.unique(keys[nz]).tolist():
+            mask = nz & (keys == v)
+            e = int(layer[mask][0])  # any exponent with this key
+            maps = [compiled.cell_map(e, p=p, h=h) for p in primes]
+            m0 = np.array([g[0] for g in maps], dtype=bool)
+            m1 = np.array([g[1] for g in maps], dtype=bool)
+            T0 = np.where(mask, np.where(T0, m1, m0), T0)
+            T1 = np.where(mask, np.where(T1, m1, m0), T1)
+
+    primes_t = tuple(primes)
+    return [
+        PackedSignature(primes=primes_t, t0=t0, t1=t1)
+        for t0, t1 in zip(_pack_rows(T0), _pack_rows(T1), strict=True)
+    ]
+
+
+def build_packed_logic_signatures(
+    Ms: Sequence[List[List[int]]], primes: List[int], op: LogicOp | CompiledLogicOp
+) -> List[PackedSignature]:
+    """Logic signatures of many prisms (same primes) in one bit-sliced pass.
+
+    Returns one PackedSignature per matrix (bit j = T_{primes[j]}), equal to
+    packing build_logic_signature(M, primes, op) for each M.
+    """
+    compiled = compile_logic_op(op)
+    for M in Ms:
+        if M and len(M[0]) != len(primes):
+            raise ValueError("every matrix must have one column per prime")
+    if np is None:
+        return _packed_bigint(Ms, primes, compiled)
+
+    out: List[PackedSignature] = []
+    for start in range(0, len(Ms), _BATCH_BLOCKS):
+        out.extend(_packed_numpy(Ms[start : start + _BATCH_BLOCKS], primes, compiled))
+    return out
+
+
+def build_logic_signatures(
+    Ms: Sequence[List[List[int]]], primes: List[int], op: LogicOp | CompiledLogicOp
+) -> List[Dict]:
+    """Batch build_logic_signature: same dicts, computed bit-sliced."""
+    name = compile_logic_op(op).name
+    return [
+        {
+            "logic_mode": name,
+            "per_prime": {
+                p: {"T0": (sig.t0 >> j) & 1, "T1": (sig.t1 >> j) & 1}
+                for j, p in enumerate(primes)
+            },
+        }
+        for sig in build_packed_logic_signatures(Ms, primes, op)
+    ]
@@ -0,0 +1,36 @@
+"""Helper di parallelismo condivisi (CLI, verify)."""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+__all__ = ["ordered_map"]
+
+
+def ordered_map(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    pool: Optional[Executor],
+    window: int,
+) -> Iterator[Any]:
+    """map() in ordine con al più `window` task in volo (memoria limitata).
+
+    Con `pool=None` equivale a `map(fn, items)`. Se il consumatore smette di
+    iterare, i task non ancora avviati vengono annullati.
+    """
+    if pool is None:
+        yield from map(fn, items)
+        return
+    pending: deque = deque()
+    try:
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
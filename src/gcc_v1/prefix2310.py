@@ -0,0 +1,266 @@
+"""Indice degli stati prefisso del kernel 2310 su uno stream di cifre.
+
+Per una stringa di cifre d_0 .. d_{n-1} si memorizzano gli stati prefisso
+
+    s_i = int(d_0 .. d_{i-1}) mod 2310,   i = 0 .. n   (s_0 = 0)
+
+in un array uint16. La firma di una qualsiasi sottostringa [i, j) è allora
+
+    s(i, j) = (s_j - s_i * 10^(j-i)) mod 2310
+
+in O(1), perché 10^k mod 2310 è periodico (periodo 6 per k >= 1).
+
+Costruzione vettoriale (NumPy): 10 non è invertibile mod 2310, ma lo è mod
+231 = 3·7·11. Si calcola quindi s_i mod 231 con una somma cumulativa di
+d_k · 10^(-k) e s_i mod 10 = ultima cifra, poi si ricompone con il CRT.
+Senza NumPy si usa il ciclo di Horner cifra per cifra (stessi risultati).
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Iterable
+
+from .kernel2310 import (
+    MOD_2310,
+    DigitBuffer,
+    PrismSignature2310,
+    _invalid_digit_error,
+    pow10_mod_2310,
+    state_to_prism_signature_2310,
+)
+
+try:  # NumPy è un'accelerazione opzionale.
+    import numpy as np
+except ImportError:  # pragma: no cover - dipende dall'ambiente
+    np = None
+
+__all__ = ["PrefixStateIndex2310"]
+
+# Header: magic, numero di cifre indicizzate (gli stati sono n + 1).
+_MAGIC = b"GCCPX231"
+_HEADER = struct.Struct("<8sQ")
+
+# Cifre elaborate per blocco durante la costruzione vettoriale.
+_BUILD_BLOCK = 1 << 20
+
+# CRT 2310 = 10 · 231: 10^-1 mod 231 = 208 e ord(10) mod 231 = 6.
+_MOD_231 = 231
+_INV10_231 = 208
+_POW10_231 = tuple(pow(10, k, _MOD_231) for k in range(6))
+_INV10_POW_231 = tuple(pow(_INV10_231, k, _MOD_231) for k in range(6))
+
+
+def _as_bytes(data: DigitBuffer) -> bytes:
+    if isinstance(data, str):
+        if not data.isascii():
+            raise _invalid_digit_error(data, 0)
+        return data.encode("ascii")
+    if isinstance(data, memoryview):
+        return data.cast("B").tobytes() if data.format != "B" else data.tobytes()
+    return bytes(data)
+
+
+def _prefix_states_numpy(raw: bytes, carry: int) -> Any:
+    """Stati s_1 .. s_m di un blocco, proseguendo dallo stato `carry`."""
+    d = np.frombuffer(raw, dtype=np.uint8).astype(np.int64) - 48
+    m = len(d)
+    k = np.arange(m, dtype=np.int64) % 6
+
+    # L_i = 10^(i-1) · sum_{k<i} d_k · 10^(-k)   (mod 231)
+    terms = d * np.asarray(_INV10_POW_231, dtype=np.int64)[k]
+    acc = np.cumsum(terms) % _MOD_231
+    pow231 = np.asarray(_POW10_231, dtype=np.int64)
+    r231 = acc * pow231[k] % _MOD_231
+
+    # Contributo dello stato precedente: carry · 10^i, con i = 1 .. m.
+    r231 = (r231 + (carry % _MOD_231) * pow231[(k + 1) % 6]) % _MOD_231
+
+    # s ≡ d_{i-1} (mod 10), s ≡ r231 (mod 231)
+    t = (r231 - d) * _INV10_231 % _MOD_231
+    return (d + 10 * t).astype(np.uint16)
+
+
+class PrefixStateIndex2310:
+    """Stati prefisso s_0 .. s_n di uno stream di cifre, con query O(1).
+
+    Esempio:
+
+        idx = PrefixStateIndex2310("31415926535")
+        idx.state(2, 7)      # == int("41592") % 2310
+        idx.window_states(3) # stati di tutte le finestre di 3 cifre
+    """
+
+    def __init__(self, data: DigitBuffer | None = None) -> None:
+        self._states = array("H", [0])
+        self._mmap: mmap.mmap | None = None
+        self._view: Any = None
+        if data is not None:
+            self.append(data)
+
+    @classmethod
+    def from_stream(cls, chunks: Iterable[DigitBuffer]) -> PrefixStateIndex2310:
+        """Costruisce l'indice da blocchi successivi dello stesso numero."""
+        index = cls()
+        for chunk in chunks:
+            index.append(chunk)
+        return index
+
+    @classmethod
+    def from_file(
+        cls, path: str | os.PathLike[str], *, block_size: int = 1 << 20
+    ) -> PrefixStateIndex2310:
+        """Indicizza un file di cifre ASCII (newline finali ignorati)."""
+        index = cls()
+        pending = b""
+        with open(path, "rb") as fh:
+            while True:
+                block = fh.read(block_size)
+                if not block:
+                    break
+                data = pending + block
+                stripped = data.rstrip(b"\r\n")
+                pending = data[len(stripped) :]
+                index.append(stripped)
+        return index
+
+    # -- costruzione -----------------------------------------------------------
+
+    def __len__(self) -> int:
+        """Numero di cifre indicizzate (gli stati sono len + 1)."""
+        return len(self._raw_states()) - 1
+
+    def append(self, data: DigitBuffer) -> None:
+        """Aggiunge cifre in coda allo stream (estende gli stati prefisso)."""
+        raw = _as_bytes(data)
+        offset = len(self)
+        if raw and not (raw.isdigit() and raw.isascii()):
+            raise _invalid_digit_error(raw, offset)
+
+        states = self._writable()
+        for start in range(0, len(raw), _BUILD_BLOCK):
+            block = raw[start : start + _BUILD_BLOCK]
+            carry = states[-1]
+            if np is not None:
+                states.frombytes(_prefix_states_numpy(block, carry).tobytes())
+            else:
+                s = carry
+                for byte in block:
+                    s = (10 * s + byte - 48) % MOD_2310
+                    states.append(s)
+
+    def _writable(self) -> array:
+        if self._view is not None:
+            # Indice caricato da file: si passa a una copia in memoria.
+            self._states = array("H", bytes(memoryview(self._view).cast("B")))
+            self._release()
+        return self._states
+
+    # -- query -------------------------------------------------------------------
+
+    @property
+    def prefix_states(self) -> Any:
+        """Colonna s_0 .. s_n: `np.ndarray` uint16 con NumPy, altrimenti array('H').
+
+        Per un indice caricato da file (con NumPy) è una vista in sola lettura
+        sulla mappatura; altrimenti è una copia. In entrambi i casi append
+        resta possibile.
+        """
+        raw = self._raw_states()
+        if np is not None:
+            if isinstance(raw, np.ndarray):
+                return raw
+            return np.frombuffer(raw, dtype=np.uint16).copy()
+        copy = array("H")
+        copy.frombytes(memoryview(raw).cast("B"))
+        return copy
+
+    def state(self, i: int, j: int) -> int:
+        """s = int(cifre[i:j]) mod 2310 in O(1) (0 per la stringa vuota)."""
+        n = len(self)
+        if not 0 <= i <= j <= n:
+            raise ValueError(f"intervallo non valido: [{i}, {j}) su {n} cifre")
+        states = self._raw_states()
+        return (int(states[j]) - int(states[i]) * pow10_mod_2310(j - i)) % MOD_2310
+
+    def signature(self, i: int, j: int) -> PrismSignature2310:
+        """Firma prismatica pentagonale della sottostringa [i, j)."""
+        return state_to_prism_signature_2310(self.state(i, j))
+
+    def window_states(self, width: int) -> Any:
+        """Stati di tutte le finestre [i, i + width), per i = 0 .. n - width."""
+        n = len(self)
+        if not 0 < width <= n:
+            raise ValueError(f"larghezza finestra non valida: {width} su {n} cifre")
+        p = pow10_mod_2310(width)
+        states = self._raw_states()
+        if np is not None:
+            s = np.asarray(states, dtype=np.uint16).astype(np.int32)
+            return ((s[width:] - s[:-width] * p) % MOD_2310).astype(np.uint16)
+        return array(
+            "H",
+            (
+                (states[i + width] - states[i] * p) % MOD_2310
+                for i in range(n - width + 1)
+            ),
+        )
+
+    def _raw_states(self) -> Any:
+        return self._view if self._view is not None else self._states
+
+    # -- persistenza -------------------------------------------------------------
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Scrive header + stati uint16 little-endian (file memory-mappable)."""
+        with open(path, "wb") as fh:
+            fh.write(_HEADER.pack(_MAGIC, len(self)))
+            data = self._raw_states()
+            if sys.byteorder != "little":
+                data = array("H", bytes(memoryview(data).cast("B")))
+                data.byteswap()
+            fh.write(memoryview(data).cast("B"))
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> PrefixStateIndex2310:
+        """Apre un indice salvato mappando gli stati in memoria (sola lettura)."""
+        index = cls()
+        with open(path, "rb") as fh:
+            magic, n = _HEADER.unpack(fh.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"file indice non riconosciuto: {path}")
+            if n == 0:
+                return index
+            index._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        count = n + 1
+        end = _HEADER.size + 2 * count
+        if np is not None:
+            index._view = np.frombuffer(
+                index._mmap, dtype="<u2", count=count, offset=_HEADER.size
+            )
+        elif sys.byteorder == "little":
+            index._view = memoryview(index._mmap)[_HEADER.size : end].cast("H")
+        else:  # pragma: no cover - piattaforme big-endian senza NumPy
+            index._states = array("H", index._mmap[_HEADER.size : end])
+            index._states.byteswap()
+            index._release()
+        return index
+
+    def _release(self) -> None:
+        self._view = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Esistono ancora viste esportate: la mappa resta aperta.
+                pass
+            self._mmap = None
+
+    def close(self) -> None:
+        """Rilascia la mappatura del file, copiando prima gli stati in memoria."""
+        if self._view is not None:
+            self._writable()
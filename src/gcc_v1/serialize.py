@@ -0,0 +1,244 @@
+"""Serializzazione JSON / NDJSON degli oggetti GCC con tipi di chiave stabili.
+
+Con `json` standard le chiavi intere (i primi in `per_prime`,
+`logic_signature["per_prime"]`, `kernel_2310["residues"]`) tornano come
+stringhe e `per_prime.get(p)` non le trova più. Qui:
+
+- `dumps` converte dataclass (CID, ...), Mapping (CompactCIP), array e NumPy;
+- `loads` riporta a int le chiavi delle mappe indicizzate per primo
+  (`INT_KEYED_FIELDS`), così il round-trip restituisce gli stessi dict;
+- ogni riga NDJSON termina con un campo `_index` {percorso: [inizio, fine]}
+  con gli offset dei valori fino a profondità 3 (es.
+  "header.cip.matrix_fingerprint"): `LazyRecord` decodifica solo le porzioni
+  di riga richieste.
+
+Le righe restano JSON valido, leggibile da qualunque parser.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from dataclasses import asdict, is_dataclass
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+__all__ = [
+    "INT_KEYED_FIELDS",
+    "LazyRecord",
+    "NDJSONWriter",
+    "dumps",
+    "dumps_record",
+    "loads",
+    "loads_record",
+    "read_ndjson",
+]
+
+# Mappe con chiavi intere (primi): le chiavi stringa vengono riconvertite.
+INT_KEYED_FIELDS = frozenset({"per_prime", "residues"})
+
+INDEX_KEY = "_index"
+_INDEX_MARKER = b',"' + INDEX_KEY.encode("ascii") + b'":'
+_INDEX_DEPTH = 3
+
+
+def _default(obj: Any) -> Any:
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    # array.array, memoryview, ndarray e scalari NumPy.
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"oggetto non serializzabile: {type(obj).__name__}")
+
+
+_ENCODER = json.JSONEncoder(separators=(",", ":"), default=_default)
+
+
+def _int_keys(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            int(k) if isinstance(k, str) and k.lstrip("-").isdigit() else k: v
+            for k, v in value.items()
+        }
+    return value
+
+
+def _restore(key: str, value: Any) -> Any:
+    return _int_keys(value) if key in INT_KEYED_FIELDS else value
+
+
+def _pairs_hook(pairs: List[tuple[str, Any]]) -> Dict[str, Any]:
+    return {k: _restore(k, v) for k, v in pairs}
+
+
+def dumps(obj: Any) -> str:
+    """JSON compatto di un oggetto GCC (dataclass e Mapping inclusi)."""
+    return _ENCODER.encode(obj)
+
+
+def loads(data: str | bytes) -> Any:
+    """Inverso di dumps: le mappe per primo tornano con chiavi int."""
+    return json.loads(data, object_pairs_hook=_pairs_hook)
+
+
+# ---------------------------------------------------------------------------
+# Record NDJSON indicizzati
+# ---------------------------------------------------------------------------
+
+
+def _as_dict(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return obj
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if is_dataclass(obj) and not isinstance(obj, type):
+        # Solo il primo livello: i campi annidati passano da _default.
+        return {name: getattr(obj, name) for name in obj.__dataclass_fields__}
+    return obj
+
+
+def _encode_indexed(
+    obj: Any,
+    prefix: str,
+    depth: int,
+    parts: List[str],
+    pos: int,
+    index: Dict[str, List[int]],
+) -> int:
+    obj = _as_dict(obj)
+    if depth == 0 or not isinstance(obj, dict):
+        text = _ENCODER.encode(obj)
+        parts.append(text)
+        return pos + len(text)
+
+    parts.append("{")
+    pos += 1
+    for i, (key, value) in enumerate(obj.items()):
+        key = str(key)
+        head = ("," if i else "") + _ENCODER.encode(key) + ":"
+        parts.append(head)
+        pos += len(head)
+        path = f"{prefix}.{key}" if prefix else key
+        start = pos
+        pos = _encode_indexed(value, path, depth - 1, parts, pos, index)
+        index[path] = [start, pos]
+    parts.append("}")
+    return pos + 1
+
+
+def dumps_record(obj: Mapping[str, Any]) -> bytes:
+    """Una riga NDJSON (con newline) per un oggetto GCC, con `_index` finale."""
+    parts: List[str] = []
+    index: Dict[str, List[int]] = {}
+    _encode_indexed(obj, "", _INDEX_DEPTH, parts, 0, index)
+    if len(parts) <= 2:  # oggetto vuoto: niente da indicizzare
+        return _ENCODER.encode(obj).encode("ascii") + b"\n"
+    parts[-1] = f',"{INDEX_KEY}":' + _ENCODER.encode(index) + "}\n"
+    return "".join(parts).encode("ascii")
+
+
+def loads_record(line: str | bytes) -> Dict[str, Any]:
+    """Decodifica completa di una riga NDJSON (senza `_index`)."""
+    obj = loads(line)
+    if isinstance(obj, dict):
+        obj.pop(INDEX_KEY, None)
+    return obj
+
+
+class LazyRecord:
+    """Riga NDJSON decodificata solo nelle parti richieste.
+
+    Esempio:
+
+        rec = LazyRecord(line)
+        rec["header.cip.matrix_fingerprint"]   # decodifica solo la stringa
+        rec["header.cip.per_prime"][2]         # chiavi int come in encode_block
+    """
+
+    __slots__ = ("_line", "_index", "_full")
+
+    def __init__(self, line: str | bytes) -> None:
+        self._line = line.encode("utf-8") if isinstance(line, str) else line
+        self._line = self._line.rstrip()
+        self._index: Optional[Dict[str, List[int]]] = None
+        self._full: Optional[Dict[str, Any]] = None
+
+    def _get_index(self) -> Dict[str, List[int]]:
+        if self._index is None:
+            pos = self._line.rfind(_INDEX_MARKER)
+            if pos < 0:
+                self._index = {}
+            else:
+                self._index = json.loads(self._line[pos + len(_INDEX_MARKER) : -1])
+        return self._index
+
+    def paths(self) -> Sequence[str]:
+        """Percorsi indicizzati, decodificabili singolarmente."""
+        return list(self._get_index())
+
+    def __getitem__(self, path: str) -> Any:
+        index = self._get_index()
+        keys = path.split(".")
+        # Prefisso indicizzato più lungo, poi si scende nel valore decodificato.
+        for n in range(len(keys), 0, -1):
+            span = index.get(".".join(keys[:n]))
+            if span is not None:
+                value = _restore(keys[n - 1], loads(self._line[span[0] : span[1]]))
+                break
+        else:
+            n, value = 0, self.to_dict()
+        for key in keys[n:]:
+            if isinstance(value, list) or (
+                isinstance(value, dict) and key not in value and key.isdigit()
+            ):
+                value = value[int(key)]
+            else:
+                value = value[key]
+        return value
+
+    def get(self, path: str, default: Any = None) -> Any:
+        try:
+            return self[path]
+        except (KeyError, IndexError, TypeError):
+            return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self._full is None:
+            self._full = loads_record(self._line)
+        return self._full
+
+
+class NDJSONWriter:
+    """Scrive oggetti GCC come NDJSON su uno stream binario."""
+
+    def __init__(self, fh: IO[bytes]) -> None:
+        self.fh = fh
+        self.count = 0
+
+    def write(self, obj: Mapping[str, Any]) -> int:
+        line = dumps_record(obj)
+        self.fh.write(line)
+        self.count += 1
+        return len(line)
+
+    def write_many(self, objs: Iterable[Mapping[str, Any]]) -> int:
+        return sum(self.write(obj) for obj in objs)
+
+
+def read_ndjson(
+    fh: Iterable[bytes], fields: Optional[Sequence[str]] = None
+) -> Iterator[Any]:
+    """Itera le righe NDJSON di `fh`.
+
+    Senza `fields` restituisce i dict completi; con `fields` (percorsi puntati)
+    restituisce {percorso: valore} decodificando solo quelle porzioni.
+    """
+    for line in fh:
+        if not line.strip():
+            continue
+        if fields is None:
+            yield loads_record(line)
+        else:
+            record = LazyRecord(line)
+            yield {path: record[path] for path in fields}
@@ -4,15 +4,158 @@ Qui vivono i filtri "luce nera", "luce bianca" e, in generale,
 la lettura spettrografica numerica basata sulla logic_signature:
 
     T_p(0), T_p(1)  per ogni primo p
+
+Rappresentazione impacchettata: il bit j di ogni maschera corrisponde a
+primes[j]. La logic_signature diventa due interi (T0, T1), un filtro una
+maschera F, e l'uscita è
+
+    out = (T0 & ~F) | (T1 & F)
+
+con i conteggi dati dal popcount. L'API a dizionari resta come wrapper;
+le funzioni batch valutano molti filtri/firme insieme (NumPy opzionale).
 """
 
 from __future__ import annotations
 
-from typing import Dict, List, Literal, Optional, Tuple
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Literal, Optional, Sequence, Tuple
+
+try:  # NumPy è un'accelerazione opzionale per le valutazioni batch.
+    import numpy as np
+except ImportError:  # pragma: no cover - dipende dall'ambiente
+    np = None
 
 FilterMode = Literal["black", "white", "custom"]
 
 
+# ---------------------------------------------------------------------------
+# Rappresentazione impacchettata (maschere di bit)
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class PackedSignature:
+    """logic_signature come due maschere: bit j = T_{primes[j]}(0) / (1)."""
+
+    primes: Tuple[int, ...]
+    t0: int
+    t1: int
+
+    @property
+    def full_mask(self) -> int:
+        return (1 << len(self.primes)) - 1
+
+    def apply(self, filter_mask: int) -> int:
+        """Maschera di uscita out = (T0 & ~F) | (T1 & F)."""
+        return (self.t0 & ~filter_mask) | (self.t1 & filter_mask)
+
+    def active_count(self, filter_mask: int) -> int:
+        return self.apply(filter_mask).bit_count()
+
+
+def pack_signature(primes: Sequence[int], logic_signature: Dict) -> PackedSignature:
+    """Impacchetta (T_p(0), T_p(1)); entry mancante = identità (T0=0, T1=1)."""
+    per_prime = logic_signature.get("per_prime", {})
+    t0 = t1 = 0
+    for j, p in enumerate(primes):
+        bits = per_prime.get(p)
+        if bits is None:
+            t1 |= 1 << j
+            continue
+        t0 |= (int(bits.get("T0", 0)) & 1) << j
+        t1 |= (int(bits.get("T1", 1)) & 1) << j
+    return PackedSignature(primes=tuple(primes), t0=t0, t1=t1)
+
+
+def pack_bits(primes: Sequence[int], bits: Dict[int, int]) -> int:
+    """Dizionario p -> 0/1 in maschera (bit j = primes[j])."""
+    mask = 0
+    for j, p in enumerate(primes):
+        if int(bits.get(p, 0)) & 1:
+            mask |= 1 << j
+    return mask
+
+
+def unpack_bits(primes: Sequence[int], mask: int) -> Dict[int, int]:
+    """Inverso di pack_bits."""
+    return {p: (mask >> j) & 1 for j, p in enumerate(primes)}
+
+
+def summarize_packed(primes: Sequence[int], out_mask: int) -> Dict[str, object]:
+    """Spettrografia numerica direttamente dalla maschera di uscita."""
+    bitvector = [(out_mask >> j) & 1 for j in range(len(primes))]
+    active_count = out_mask.bit_count()
+    return {
+        "active_primes": [p for j, p in enumerate(primes) if (out_mask >> j) & 1],
+        "active_count": active_count,
+        "inactive_count": len(primes) - active_count,
+        "bitvector": bitvector,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Valutazione batch
+# ---------------------------------------------------------------------------
+
+# Popcount per byte, per NumPy senza np.bitwise_count (< 2.0).
+_POPCOUNT8 = None
+
+
+def _popcount_u64(arr: Any) -> Any:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(arr).astype(np.int64)
+    global _POPCOUNT8
+    if _POPCOUNT8 is None:
+        _POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], np.uint8)
+    as_bytes = np.ascontiguousarray(arr).view(np.uint8).reshape(arr.shape + (8,))
+    return _POPCOUNT8[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+def _use_numpy(k: int) -> bool:
+    return np is not None and k <= 64
+
+
+def apply_filters_batch(signature: PackedSignature, filter_masks: Iterable[int]) -> Any:
+    """Maschere di uscita di una firma per molti filtri.
+
+    Con NumPy (k <= 64) restituisce un ndarray uint64, altrimenti una lista.
+    """
+    if _use_numpy(len(signature.primes)):
+        F = np.asarray(list(filter_masks), dtype=np.uint64)
+        t0 = np.uint64(signature.t0)
+        t1 = np.uint64(signature.t1)
+        return (t0 & ~F) | (t1 & F)
+    return [signature.apply(f) for f in filter_masks]
+
+
+def batch_active_counts(
+    signatures: Sequence[PackedSignature], filter_masks: Sequence[int]
+) -> Any:
+    """Matrice (firme × filtri) dei conteggi di primi attivi.
+
+    Tutte le firme devono condividere la stessa lista di primi. Con NumPy
+    (k <= 64) restituisce un ndarray int64, altrimenti una lista di liste.
+    """
+    if not signatures:
+        return [] if np is None else np.zeros((0, len(filter_masks)), np.int64)
+    k = len(signatures[0].primes)
+    for sig in signatures:
+        if len(sig.primes) != k:
+            raise ValueError("le firme del batch devono avere gli stessi primi")
+
+    if _use_numpy(k):
+        t0 = np.asarray([sig.t0 for sig in signatures], dtype=np.uint64)[:, None]
+        t1 = np.asarray([sig.t1 for sig in signatures], dtype=np.uint64)[:, None]
+        F = np.asarray(list(filter_masks), dtype=np.uint64)[None, :]
+        return _popcount_u64((t0 & ~F) | (t1 & F))
+    return [[sig.active_count(f) for f in filter_masks] for sig in signatures]
+
+
+# ---------------------------------------------------------------------------
+# API a dizionari (wrapper sulla rappresentazione impacchettata)
+# ---------------------------------------------------------------------------
+
+
 def build_filter_bits(
     primes: List[int],
     mode: FilterMode = "white",
@@ -39,36 +182,16 @@ def apply_filter(
     primes: List[int], logic_signature: Dict, filter_bits: Dict[int, int]
 ) -> Dict[int, int]:
     """Applica un filtro F[p] usando la logic_signature (T_p(0), T_p(1))."""
-    per_prime = logic_signature.get("per_prime", {})
-    out: Dict[int, int] = {}
-    for p in primes:
-        Fp = int(filter_bits.get(p, 0)) & 1
-        bits = per_prime.get(p)
-        if bits is None:
-            # Se manca l'entry, assumiamo identità (T0=0, T1=1)
-            T0, T1 = 0, 1
-        else:
-            T0 = int(bits.get("T0", 0)) & 1
-            T1 = int(bits.get("T1", 1)) & 1
-        out[p] = T0 if Fp == 0 else T1
-    return out
+    # Se manca l'entry di un primo, pack_signature assume identità (T0=0, T1=1).
+    packed = pack_signature(primes, logic_signature)
+    return unpack_bits(primes, packed.apply(pack_bits(primes, filter_bits)))
 
 
 def summarize_spectrum(
     primes: List[int], out_bits: Dict[int, int]
 ) -> Dict[str, object]:
     """Costruisce una mini 'spettrografia numerica' dell'output."""
-    bitvector: List[int] = [int(out_bits.get(p, 0)) & 1 for p in primes]
-    active_primes = [p for p, b in zip(primes, bitvector, strict=False) if b == 1]
-    active_count = sum(bitvector)
-    inactive_count = len(primes) - active_count
-
-    return {
-        "active_primes": active_primes,
-        "active_count": active_count,
-        "inactive_count": inactive_count,
-        "bitvector": bitvector,
-    }
+    return summarize_packed(primes, pack_bits(primes, out_bits))
 
 
 def spectral_view(
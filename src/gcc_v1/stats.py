@@ -0,0 +1,211 @@
+"""Strumentazione per stadio di `encode_block`.
+
+Un oggetto `EncodeStats` raccoglie, per ciascuno dei sei stadi del codec
+(prism, logic, cids, cip, cluster, residual):
+
+- numero di chiamate, tempo totale/minimo/massimo;
+- byte in ingresso (lunghezza del blocco);
+- con `trace_memory=True`: picco di byte allocati oltre il livello iniziale
+  (`peak_delta_bytes`) e variazione del numero di blocchi allocati
+  (sys.getallocatedblocks);
+- istogrammi log2 di durata (microsecondi) e dimensione (byte).
+
+Si passa a `encode_block(..., stats=...)` oppure si installa globalmente con
+`install_stats`. Senza stats il codec usa un contesto nullo condiviso: nessuna
+misura, nessuna allocazione.
+
+    stats = EncodeStats()
+    encode_block(data, stats=stats)
+    stats.as_dict()["prism"]["total_seconds"]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional
+
+__all__ = [
+    "ENCODE_STAGES",
+    "EncodeStats",
+    "StageEvent",
+    "StageStats",
+    "current_stats",
+    "install_stats",
+    "stage",
+    "uninstall_stats",
+]
+
+ENCODE_STAGES = ("prism", "logic", "cids", "cip", "cluster", "residual")
+
+# Contesto riusabile per gli stadi non strumentati.
+_NULL_STAGE: AbstractContextManager[None] = nullcontext()
+
+# Stats installate globalmente (usate quando encode_block non ne riceve).
+_ACTIVE: Optional[EncodeStats] = None
+
+
+def _log2_bucket(value: float) -> int:
+    """Bucket b tale che value < 2^b (0 per value < 1)."""
+    return int(value).bit_length()
+
+
+@dataclass(frozen=True)
+class StageEvent:
+    """Singola misura di uno stadio (passata al sink, se presente)."""
+
+    stage: str
+    seconds: float
+    size: int
+    peak_delta_bytes: Optional[int] = None
+    alloc_blocks: Optional[int] = None
+
+
+@dataclass
+class StageStats:
+    """Aggregato delle misure di uno stadio."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    min_seconds: float = float("inf")
+    max_seconds: float = 0.0
+    total_bytes: int = 0
+    peak_delta_bytes: int = 0
+    alloc_blocks: int = 0
+    time_histogram: Dict[int, int] = field(default_factory=dict)  # log2(µs)
+    size_histogram: Dict[int, int] = field(default_factory=dict)  # log2(byte)
+
+    def add(self, event: StageEvent) -> None:
+        self.count += 1
+        self.total_seconds += event.seconds
+        self.min_seconds = min(self.min_seconds, event.seconds)
+        self.max_seconds = max(self.max_seconds, event.seconds)
+        self.total_bytes += event.size
+        if event.peak_delta_bytes is not None:
+            self.peak_delta_bytes += event.peak_delta_bytes
+        if event.alloc_blocks is not None:
+            self.alloc_blocks += event.alloc_blocks
+        t = _log2_bucket(event.seconds * 1e6)
+        self.time_histogram[t] = self.time_histogram.get(t, 0) + 1
+        s = _log2_bucket(event.size)
+        self.size_histogram[s] = self.size_histogram.get(s, 0) + 1
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_seconds": self.total_seconds,
+            "mean_seconds": self.mean_seconds,
+            "min_seconds": self.min_seconds if self.count else 0.0,
+            "max_seconds": self.max_seconds,
+            "total_bytes": self.total_bytes,
+            "peak_delta_bytes": self.peak_delta_bytes,
+            "alloc_blocks": self.alloc_blocks,
+            "time_histogram_log2_us": dict(sorted(self.time_histogram.items())),
+            "size_histogram_log2_bytes": dict(sorted(self.size_histogram.items())),
+        }
+
+
+class EncodeStats:
+    """Collettore di statistiche per stadio.
+
+    - `trace_memory`: misura le allocazioni senza alterare lo stato di
+      tracemalloc del chiamante. Se tracemalloc è spento, ogni stadio lo
+      avvia e lo ferma da sé (picco esatto, tracciamento privato). Se è già
+      attivo, il picco del chiamante non viene azzerato: `peak_delta_bytes`
+      è esatto quando lo stadio supera il picco precedente, altrimenti è la
+      sola crescita della memoria corrente (limite inferiore).
+    - `sink`: callback chiamata con ogni `StageEvent` (es. export telemetria).
+    """
+
+    def __init__(
+        self,
+        *,
+        trace_memory: bool = False,
+        sink: Optional[Callable[[StageEvent], None]] = None,
+    ) -> None:
+        self.trace_memory = trace_memory
+        self.sink = sink
+        self.stages: Dict[str, StageStats] = {}
+
+    @contextmanager
+    def stage(self, name: str, size: int = 0) -> Iterator[None]:
+        """Misura il blocco `with` come una esecuzione dello stadio `name`."""
+        memory = self.trace_memory
+        if memory:
+            owned = not tracemalloc.is_tracing()
+            if owned:
+                tracemalloc.start()
+            base_bytes, outer_peak = tracemalloc.get_traced_memory()
+            base_blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            peak_delta = alloc_blocks = None
+            if memory:
+                current, peak = tracemalloc.get_traced_memory()
+                if owned:
+                    tracemalloc.stop()
+                if owned or peak > outer_peak:
+                    peak_delta = max(0, peak - base_bytes)
+                else:
+                    peak_delta = max(0, current - base_bytes)
+                alloc_blocks = sys.getallocatedblocks() - base_blocks
+            self.record(StageEvent(name, seconds, size, peak_delta, alloc_blocks))
+
+    def record(self, event: StageEvent) -> None:
+        stats = self.stages.get(event.stage)
+        if stats is None:
+            stats = self.stages[event.stage] = StageStats()
+        stats.add(event)
+        if self.sink is not None:
+            self.sink(event)
+
+    def reset(self) -> None:
+        self.stages.clear()
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Aggregati per stadio, nell'ordine del codec (serializzabili in JSON)."""
+        order = {name: i for i, name in enumerate(ENCODE_STAGES)}
+        names = sorted(self.stages, key=lambda n: (order.get(n, len(order)), n))
+        return {name: self.stages[name].to_dict() for name in names}
+
+
+# ---------------------------------------------------------------------------
+# Installazione globale
+# ---------------------------------------------------------------------------
+
+
+def install_stats(stats: Optional[EncodeStats] = None) -> EncodeStats:
+    """Installa (o crea) le stats globali usate da encode_block."""
+    global _ACTIVE
+    _ACTIVE = stats if stats is not None else EncodeStats()
+    return _ACTIVE
+
+
+def uninstall_stats() -> Optional[EncodeStats]:
+    """Rimuove le stats globali e le restituisce."""
+    global _ACTIVE
+    stats, _ACTIVE = _ACTIVE, None
+    return stats
+
+
+def current_stats() -> Optional[EncodeStats]:
+    return _ACTIVE
+
+
+def stage(
+    stats: Optional[EncodeStats], name: str, size: int = 0
+) -> AbstractContextManager[None]:
+    """Contesto di misura per `name`, o il contesto nullo se stats è None."""
+    if stats is None:
+        return _NULL_STAGE
+    return stats.stage(name, size)
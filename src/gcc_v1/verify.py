@@ -0,0 +1,159 @@
+"""Verifica di integrità dei blocchi GCC v1 senza ricodifica completa.
+
+`verify_block` ricalcola solo quanto serve, nell'ordine dal più economico e
+fermandosi al primo controllo fallito:
+
+1. decode del residuo, con `block_len` obbligatorio;
+2. `content_sha256` (se il header lo contiene);
+3. totali E_p dal motore a istogramma (o dal kernel 2310), confrontati con
+   `cip["col_mass"]`;
+4. logic_signature e `matrix_fingerprint`.
+
+CID, cluster signature e residuo non vengono ricostruiti.
+`verify_container` applica la verifica a un intero contenitore, anche in
+parallelo, e di default si ferma al primo blocco non valido.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import IO, Any, Iterable, List, Mapping, Optional
+
+from .codec import decode_block
+from .container import read_blocks
+from .exponents import (
+    build_exponent_matrix_from_residues,
+    exponent_matrix_from_totals,
+    exponent_totals,
+)
+from .invariants import _compute_matrix_fingerprint
+from .kernel2310 import kernel_2310_from_buffer
+from .logic import build_logic_signature, get_logic_op
+from .parallel import ordered_map
+
+__all__ = ["ContainerReport", "VerifyResult", "verify_block", "verify_container"]
+
+
+@dataclass(frozen=True)
+class VerifyResult:
+    """Esito della verifica di un blocco."""
+
+    ok: bool
+    check: Optional[str] = None  # controllo fallito: decode, content, ...
+    detail: str = ""
+    index: Optional[int] = None  # posizione nel contenitore
+    block_len: int = 0  # byte decodificati (0 se il decode fallisce)
+
+
+@dataclass
+class ContainerReport:
+    """Esito della verifica di un contenitore."""
+
+    checked: int = 0
+    bytes_checked: int = 0  # somma dei block_len dei blocchi controllati
+    failures: List[VerifyResult] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+
+def _fail(check: str, detail: str) -> VerifyResult:
+    return VerifyResult(ok=False, check=check, detail=detail)
+
+
+def verify_block(gcc_obj: Mapping[str, Any]) -> VerifyResult:
+    """Controlla che residuo e metadati di un blocco siano coerenti."""
+    try:
+        data = decode_block(gcc_obj)
+    except (TypeError, ValueError, NotImplementedError) as exc:
+        return _fail("decode", str(exc))
+
+    result = _verify_decoded(gcc_obj, data)
+    return replace(result, block_len=len(data))
+
+
+def _verify_decoded(gcc_obj: Mapping[str, Any], data: bytes) -> VerifyResult:
+    header = gcc_obj["header"]
+    if not isinstance(header.get("block_len"), int):
+        return _fail("decode", "block_len mancante nel header")
+
+    expected_hash = header.get("content_sha256")
+    if expected_hash is not None:
+        actual_hash = hashlib.sha256(data).hexdigest()
+        if actual_hash != expected_hash:
+            return _fail("content", f"sha256 {actual_hash} != {expected_hash}")
+
+    cip = header.get("cip")
+    if not isinstance(cip, Mapping):
+        return _fail("decode", "cip mancante nel header")
+    primes = [int(p) for p in header.get("primes", cip.get("primes", []))]
+    prism_source = header.get("prism_source", "bytes")
+
+    try:
+        if prism_source == "kernel2310":
+            sig = kernel_2310_from_buffer(data.rstrip(b"\r\n"))
+            M, primes = build_exponent_matrix_from_residues(sig.residues)
+            totals = [sig.residues[p] for p in primes]
+        else:
+            totals = exponent_totals(data, primes)
+            M = exponent_matrix_from_totals(totals)
+    except ValueError as exc:
+        return _fail("prism", str(exc))
+
+    if totals != list(cip.get("col_mass", [])):
+        return _fail("col_mass", f"{totals} != {cip.get('col_mass')}")
+
+    logic_mode = cip.get("logic_signature", {}).get("logic_mode")
+    try:
+        logic_op = get_logic_op(logic_mode)
+    except ValueError as exc:
+        return _fail("logic", str(exc))
+    logic_signature = build_logic_signature(M, primes, logic_op)
+    fingerprint = _compute_matrix_fingerprint(M, primes, logic_signature, prism_source)
+    if fingerprint != cip.get("matrix_fingerprint"):
+        return _fail("fingerprint", f"{fingerprint} != {cip.get('matrix_fingerprint')}")
+    return VerifyResult(ok=True)
+
+
+# ---------------------------------------------------------------------------
+# Contenitori
+# ---------------------------------------------------------------------------
+
+
+def verify_container(
+    source: str | os.PathLike[str] | IO[bytes] | Iterable[Mapping[str, Any]],
+    *,
+    workers: int = 1,
+    fail_fast: bool = True,
+) -> ContainerReport:
+    """Verifica tutti i blocchi di un contenitore (file, stream o iterabile).
+
+    Con `workers > 1` i blocchi sono verificati in un pool di processi, con un
+    numero limitato di blocchi in volo. Con `fail_fast` si ferma al primo
+    blocco non valido.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as fh:
+            return verify_container(fh, workers=workers, fail_fast=fail_fast)
+    blocks = read_blocks(source) if hasattr(source, "read") else source
+
+    report = ContainerReport()
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        results = ordered_map(verify_block, blocks, pool, 4 * workers)
+        for index, result in enumerate(results):
+            report.checked += 1
+            report.bytes_checked += result.block_len
+            if not result.ok:
+                report.failures.append(replace(result, index=index))
+                if fail_fast:
+                    results.close()
+                    break
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return report
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture(params=["numpy", "pure"])
+def backend(request, monkeypatch):
+    """Esegue il test con NumPy e con il fallback in puro Python.
+
+    Il modulo di test dichiara in `BACKEND_MODULES` i moduli il cui `np`
+    viene azzerato nella variante "pure".
+    """
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        for module in request.module.BACKEND_MODULES:
+            monkeypatch.setattr(module, "np", None)
+    return request.param
@@ -0,0 +1,74 @@
+import io
+
+import pytest
+
+from gcc_v1 import encode_block
+from gcc_v1.archive import ArchiveIndex, ArchiveReader
+from gcc_v1.container import dump_block, read_block_at, scan_blocks
+
+DATA = bytes((i * 7 + 3) % 256 for i in range(1000))
+SIZES = [100, 1, 299, 0, 400, 200]
+
+
+def _blocks():
+    pos = 0
+    for size in SIZES:
+        yield encode_block(DATA[pos : pos + size])
+        pos += size
+
+
+def _write_archive(path, fmt):
+    path.write_bytes(b"".join(dump_block(b, fmt) for b in _blocks()))
+    return path
+
+
+@pytest.mark.parametrize("fmt", ["json", "binary"])
+def test_scan_blocks_and_read_block_at(fmt):
+    stream = io.BytesIO(b"".join(dump_block(b, fmt) for b in _blocks()))
+    entries = list(scan_blocks(stream))
+    assert [n for _, n in entries] == SIZES
+    offset = entries[4][0]
+    assert read_block_at(stream, offset)["header"]["block_len"] == 400
+
+
+@pytest.mark.parametrize("fmt", ["json", "binary"])
+@pytest.mark.parametrize(
+    ("start", "stop"),
+    [(0, 1000), (0, 0), (10, 20), (99, 101), (100, 101), (150, 900), (999, 1000)],
+)
+def test_read_range_matches_original(tmp_path, fmt, start, stop):
+    path = _write_archive(tmp_path / "data.gcc", fmt)
+    with ArchiveReader(path) as reader:
+        assert len(reader) == len(DATA)
+        assert bytes(reader.read_range(start, stop)) == DATA[start:stop]
+
+
+def test_locate_selects_only_covering_blocks(tmp_path):
+    path = _write_archive(tmp_path / "data.gcc", "binary")
+    with open(path, "rb") as fh:
+        index = ArchiveIndex.build(fh)
+    assert list(index.ends) == [100, 101, 400, 400, 800, 1000]
+    assert index.locate(10, 20) == (0, 1)
+    assert index.locate(100, 101) == (1, 2)
+    assert index.locate(99, 402) == (0, 5)
+    assert index.locate(800, 1000) == (5, 6)
+    with pytest.raises(ValueError):
+        index.locate(0, 1001)
+
+
+def test_index_save_and_load(tmp_path):
+    path = _write_archive(tmp_path / "data.gcc", "json")
+    with open(path, "rb") as fh:
+        index = ArchiveIndex.build(fh)
+    index.save(tmp_path / "data.gcc.idx")
+    with ArchiveIndex.load(tmp_path / "data.gcc.idx") as loaded:
+        assert list(loaded.offsets) == list(index.offsets)
+        assert list(loaded.ends) == list(index.ends)
+        with ArchiveReader(path, index=loaded) as reader:
+            assert bytes(reader.read_range(95, 405)) == DATA[95:405]
+    assert loaded._mmap is None
+    assert list(loaded.ends) == list(index.ends)  # ancora utilizzabile
+
+    (tmp_path / "bad.idx").write_bytes(b"x" * 16)
+    with pytest.raises(ValueError):
+        ArchiveIndex.load(tmp_path / "bad.idx")
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import pytest
+
 from gcc_v1 import decode_block, encode_block
 
 
@@ -22,3 +24,35 @@ def test_cip_structure_present():
     assert "H_total" in cip
     assert "primes" in cip
     assert "matrix_fingerprint" in cip
+
+
+def test_kernel2310_prism_source():
+    data = b"123456789012345678901234567890\n"
+    obj = encode_block(data, prism_source="kernel2310")
+    header = obj["header"]
+
+    assert decode_block(obj) == data
+    assert header["prism_source"] == "kernel2310"
+    assert header["primes"] == [2, 3, 5, 7, 11]
+    assert header["max_prime"] == 11
+
+    s_mod = int(data) % 2310
+    assert header["kernel_2310"]["s_mod"] == s_mod
+    col_mass = header["cip"]["col_mass"]
+    assert col_mass == [s_mod % p for p in (2, 3, 5, 7, 11)]
+
+    default = encode_block(data)
+    assert default["header"]["prism_source"] == "bytes"
+    assert default["header"]["max_prime"] == 31
+    assert (
+        default["header"]["cip"]["matrix_fingerprint"]
+        != (header["cip"]["matrix_fingerprint"])
+    )
+
+    with pytest.raises(ValueError):
+        encode_block(b"12x4", prism_source="kernel2310")
+    with pytest.raises(ValueError):
+        encode_block(data, max_prime=31, prism_source="kernel2310")
+    assert encode_block(data, max_prime=11, prism_source="kernel2310") == obj
+    with pytest.raises(ValueError):
+        encode_block(data, prism_source="unknown")
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+import gcc_v1.cip_store as cip_store
+from gcc_v1 import CIPStore, encode_block
+from gcc_v1.cluster import compute_cluster_signature
+
+BACKEND_MODULES = (cip_store,)
+
+
+def _cips(n: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        encode_block(rng.randbytes(rng.randint(1, 200)))["header"]["cip"]
+        for _ in range(n)
+    ]
+
+
+def test_store_append_and_column_reads(backend, tmp_path):
+    cips = _cips(40)
+    clusters = [compute_cluster_signature(c) for c in cips]
+    store = CIPStore.create(tmp_path / "corpus", cips[0]["primes"], with_cluster=True)
+    store.extend(cips[:25], clusters[:25])
+    for cip, cluster in zip(cips[25:], clusters[25:], strict=True):
+        store.append(cip, cluster)
+    store.close()
+
+    store = CIPStore(tmp_path / "corpus")
+    assert len(store) == 40
+    assert [int(v) for v in store.column("total_mass")] == [
+        c["total_mass"] for c in cips
+    ]
+    assert store.column("col_mass").tolist() == [c["col_mass"] for c in cips]
+    assert [int(v) for v in store.column("cluster_code")] == [
+        c["code"] for c in clusters
+    ]
+    assert list(store.row_mass(7)) == cips[7]["row_mass"]
+    for i in (0, 13, 39):
+        assert store.cip(i).to_dict() == cips[i]
+    store.close()
+
+
+def test_store_rejects_a_different_basis(tmp_path):
+    store = CIPStore.create(tmp_path / "corpus", [2, 3, 5])
+    with pytest.raises(ValueError):
+        store.append(_cips(1)[0])
+    assert len(store) == 0
+    assert len(store.column("Mass_p")) == 0
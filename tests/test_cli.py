@@ -0,0 +1,80 @@
+import io
+import json
+
+import pytest
+
+from gcc_v1.cli import main
+from gcc_v1.codec import encode_block
+from gcc_v1.container import dump_block, read_blocks
+
+
+@pytest.mark.parametrize("fmt", ["json", "binary"])
+def test_encode_decode_roundtrip(tmp_path, fmt):
+    data = bytes(range(256)) * 9 + b"tail"
+    src = tmp_path / "in.bin"
+    enc = tmp_path / "out.gcc"
+    dec = tmp_path / "back.bin"
+    src.write_bytes(data)
+
+    assert (
+        main(
+            [
+                "encode",
+                str(src),
+                "-o",
+                str(enc),
+                "--format",
+                fmt,
+                "--block-size",
+                "1000",
+            ]
+        )
+        == 0
+    )
+    assert main(["decode", str(enc), "-o", str(dec)]) == 0
+    assert dec.read_bytes() == data
+    assert main(["verify", str(enc)]) == 0
+
+
+def test_verify_stats_count_checked_bytes(tmp_path, capsys):
+    path = tmp_path / "data.gcc"
+    path.write_bytes(b"".join(dump_block(encode_block(b"x" * n)) for n in (10, 5)))
+    assert main(["verify", str(path), "--stats"]) == 0
+    assert "verify: 2 blocchi, 15 B in" in capsys.readouterr().err
+
+
+def test_parallel_encode_matches_serial(tmp_path):
+    src = tmp_path / "in.bin"
+    src.write_bytes(b"crystal codec " * 300)
+    serial = tmp_path / "serial.gcc"
+    parallel = tmp_path / "parallel.gcc"
+    args = ["encode", str(src), "--block-size", "512", "--format", "binary"]
+    assert main([*args, "-o", str(serial)]) == 0
+    assert main([*args, "-o", str(parallel), "--workers", "2"]) == 0
+    assert serial.read_bytes() == parallel.read_bytes()
+
+
+def test_verify_detects_tampering(tmp_path, capsys):
+    obj = encode_block(b"\x02\x04\x06\x08")
+    obj["header"]["cip"]["matrix_fingerprint"] = "0" * 64
+    path = tmp_path / "bad.gcc"
+    path.write_bytes(dump_block(encode_block(b"ok")) + dump_block(obj))
+
+    assert main(["verify", str(path)]) == 1
+    assert "blocco 1: fingerprint" in capsys.readouterr().err
+
+
+def test_inspect_and_container_detection(tmp_path, capsys):
+    path = tmp_path / "x.gcc"
+    path.write_bytes(dump_block(encode_block(b"abc"), "binary"))
+    assert main(["inspect", str(path)]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["block_len"] == 3
+
+    blocks = list(read_blocks(io.BytesIO(path.read_bytes())))
+    assert blocks[0]["residual"]["residual_stream"] == list(b"abc")
+
+
+def test_missing_input_is_a_clean_error(tmp_path, capsys):
+    assert main(["decode", str(tmp_path / "missing.gcc")]) == 1
+    assert capsys.readouterr().err.startswith("errore: ")
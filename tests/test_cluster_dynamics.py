@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import random
+
+from gcc_v1.cluster import (
+    DYNAMICS,
+    _band_layout,
+    _compute_cluster_vector_from_dynamics,
+    _gf2_square_cyclic,
+    _make_step,
+    _orbit,
+    _run_dynamics,
+    analyze_dynamics,
+    build_bands,
+)
+from gcc_v1.exponents import sieve_primes
+
+
+def _naive_quadratic_term(x: list[int]) -> list[int]:
+    k = len(x)
+    return [sum(x[j] & x[(i - j) % k] for j in range(k)) & 1 for i in range(k)]
+
+
+def test_gf2_square_matches_quadratic_definition():
+    rng = random.Random(0)
+    for k in (1, 2, 5, 8, 11, 16, 17):
+        for _ in range(50):
+            x = [rng.randint(0, 1) for _ in range(k)]
+            mask = sum(bit << i for i, bit in enumerate(x))
+            q = _naive_quadratic_term(x)
+            expected = sum(bit << i for i, bit in enumerate(q))
+            assert _gf2_square_cyclic(mask, k) == expected
+
+
+def test_orbit_stops_at_first_repeated_state():
+    states, mu, lam = _orbit(0, lambda x: (x + 1) % 3, max_steps=100)
+    assert states == [0, 1, 2]
+    assert (mu, lam) == (0, 3)
+
+    states, mu, lam = _orbit(0, lambda x: x + 1, max_steps=4)
+    assert states == [0, 1, 2, 3, 4]
+    assert lam == 0
+
+
+def test_run_dynamics_visits_at_most_max_iter_plus_one_states():
+    bands = build_bands([2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31], mode="by-basis")
+    _, _, slots = _band_layout(bands)
+    for dyn in ("H-identity", "H-band-quadratic", "H-monster-v1"):
+        states = _run_dynamics(
+            0b1011, slots, dyn_name=dyn, dyn_params=None, max_steps=3
+        )
+        assert 1 <= len(states) <= 4
+        assert len(set(states)) == len(states)
+
+
+def test_orbit_analysis_matches_orbits_and_bounds_max_iter():
+    primes = [2, 3, 5, 7, 11, 13, 17]
+    for dyn in DYNAMICS:
+        analysis = analyze_dynamics(primes, dyn_name=dyn)
+        assert analysis.exhaustive
+        basis, _, slots = _band_layout(analysis.bands)
+        step = _make_step(dyn, slots, len(basis))
+        n = analysis.min_max_iter
+
+        for x in range(1 << len(basis)):
+            _, mu, lam = _orbit(x, step, max_steps=1000)
+            assert (analysis.transient[x], analysis.cycle_length[x]) == (mu, lam)
+
+            a0 = {p for i, p in enumerate(basis) if (x >> i) & 1}
+            kwargs = {"dyn_name": dyn, "dyn_params": None}
+            assert _compute_cluster_vector_from_dynamics(
+                a0, analysis.bands, max_steps=n, **kwargs
+            ) == _compute_cluster_vector_from_dynamics(
+                a0, analysis.bands, max_steps=1000, **kwargs
+            )
+
+
+def test_sampled_analysis_on_bases_wider_than_64_bits():
+    primes = sieve_primes(400)  # 78 primi
+    for dyn in DYNAMICS:
+        analysis = analyze_dynamics(primes, dyn_name=dyn, sample=8, seed=1)
+        basis, _, slots = _band_layout(analysis.bands)
+        assert len(basis) > 64
+        step = _make_step(dyn, slots, len(basis))
+        for i, x in enumerate(analysis.states):
+            states, mu, lam = _orbit(x, step, max_steps=1000)
+            assert (analysis.transient[i], analysis.cycle_length[i]) == (mu, lam)
+            assert analysis.basin[i] == min(states[mu:])
+        assert sum(analysis.basin_sizes().values()) == 8
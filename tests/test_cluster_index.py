@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+import gcc_v1.cluster_index as cluster_index
+from gcc_v1.cluster import encode_cluster_vector
+from gcc_v1.cluster_index import ClusterCodeIndex, pattern_mask
+
+MAX_BAND_INDEX = 4
+
+
+def _vectors(n: int) -> list[list[int]]:
+    rng = random.Random(0)
+    return [
+        [rng.randint(0, 1)] + [rng.randint(0, 3) for _ in range(MAX_BAND_INDEX)]
+        for _ in range(n)
+    ]
+
+
+BACKEND_MODULES = (cluster_index,)
+
+
+def test_pattern_mask_selects_band_fields():
+    mask, value = pattern_mask({2: 1, 3: 3}, MAX_BAND_INDEX)
+    code = encode_cluster_vector([1, 0, 1, 3, 2])
+    assert code & mask == value
+    assert encode_cluster_vector([1, 0, 2, 3, 2]) & mask != value
+
+
+def test_index_queries_and_persistence(backend, tmp_path):
+    vectors = _vectors(2000)
+    pattern = {2: 1, 3: 3}
+    expected = [i for i, v in enumerate(vectors) if v[2] == 1 and v[3] == 3]
+
+    codes = cluster_index.encode_cluster_vectors(vectors)
+    assert [int(c) for c in codes] == [encode_cluster_vector(v) for v in vectors]
+    decoded = cluster_index.decode_cluster_codes(codes, MAX_BAND_INDEX)
+    assert [[int(s) for s in row] for row in decoded] == vectors
+
+    index = ClusterCodeIndex(MAX_BAND_INDEX, codes)
+    assert [int(i) for i in index.query(pattern)] == expected
+    assert [int(i) for i in index.query_bitmaps(pattern)] == expected
+    assert index.count(pattern) == len(expected)
+
+    path = tmp_path / "codes.idx"
+    index.save(path)
+    loaded = ClusterCodeIndex.load(path)
+    assert len(loaded) == len(vectors)
+    assert [int(i) for i in loaded.query(pattern)] == expected
+
+    loaded.append([1, 0, 1, 3, 0])
+    assert int(loaded.query(pattern)[-1]) == len(vectors)
+
+
+def test_extend_overflow_and_codes_snapshot(backend, tmp_path):
+    index = ClusterCodeIndex(MAX_BAND_INDEX, [1, 2, 3])  # codici a 16 bit
+    codes = index.codes
+    index.extend([4])  # la colonna restituita non blocca il buffer
+    assert [int(c) for c in codes] == [1, 2, 3]
+    assert type(index.codes) is type(codes)
+
+    too_big = [5, 1 << 16]
+    if backend == "numpy":
+        import numpy as np
+
+        too_big = np.array(too_big, dtype=np.uint64)
+    with pytest.raises(OverflowError):
+        index.extend(too_big)
+    with pytest.raises(OverflowError):
+        index.append(-1)
+    assert [int(c) for c in index.codes] == [1, 2, 3, 4]
+
+    path = tmp_path / "codes.idx"
+    index.save(path)
+    loaded = ClusterCodeIndex.load(path)
+    view = loaded.codes
+    loaded.extend([5])
+    assert [int(c) for c in view] == [1, 2, 3, 4]
+    assert len(loaded) == 5
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+import gcc_v1.cluster as cluster
+from gcc_v1.cluster import (
+    BandPlan,
+    ClusterSignatureTable,
+    compute_cluster_signature,
+    compute_cluster_signatures,
+    get_cluster_table,
+    load_cluster_table,
+    save_cluster_table,
+)
+
+PRIMES = [2, 3, 5, 7, 11, 13]
+
+
+def test_table_matches_direct_dynamics_on_all_states():
+    for dyn in ("H-identity", "H-band-quadratic", "H-monster-v1"):
+        table = ClusterSignatureTable(
+            primes=PRIMES, band_mode="canonical", dyn_name=dyn, max_iter=8
+        ).precompute()
+        assert table.is_complete
+
+        for mask in range(1 << len(PRIMES)):
+            col_mass = [(mask >> i) & 1 for i in range(len(PRIMES))]
+            if not any(col_mass):
+                continue  # A0 vuoto ricade su "tutti i primi attivi"
+            cip = {"primes": PRIMES, "col_mass": col_mass}
+            direct = compute_cluster_signature(
+                cip, dyn_name=dyn, dyn_params={"max_iter": 8}, use_table=False
+            )
+            assert table.lookup(mask) == (direct["cluster_vector"], direct["code"])
+
+
+def test_table_save_load_roundtrip_installs_table(tmp_path):
+    table = ClusterSignatureTable(
+        primes=PRIMES, band_mode="by-basis", dyn_name="H-monster-v1", max_iter=16
+    ).precompute()
+    path = tmp_path / "table.json"
+    save_cluster_table(table, path)
+
+    loaded = load_cluster_table(path)
+    assert loaded.codes == table.codes
+    assert (
+        get_cluster_table(PRIMES, mode="by-basis", dyn_name="H-monster-v1", max_iter=16)
+        is loaded
+    )
+
+
+def test_load_rejects_inconsistent_tables(tmp_path):
+    table = ClusterSignatureTable(
+        primes=PRIMES, band_mode="canonical", dyn_name="H-band-quadratic", max_iter=8
+    ).precompute()
+    data = table.to_dict()
+    path = tmp_path / "table.json"
+
+    tampered = dict(data, codes=[[m, c ^ 1] for m, c in data["codes"]])
+    path.write_text(json.dumps(tampered), encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_cluster_table(path)
+
+    out_of_range = dict(data, codes=data["codes"] + [[1 << len(PRIMES), 0]])
+    path.write_text(json.dumps(out_of_range), encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_cluster_table(path)
+
+    path.write_text(json.dumps(dict(data, dyn="H-unknown")), encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_cluster_table(path)
+
+
+def test_table_cache_is_bounded_and_rejects_unknown_dynamics(monkeypatch):
+    monkeypatch.setattr(cluster, "_TABLE_CACHE", type(cluster._TABLE_CACHE)())
+    monkeypatch.setattr(cluster, "_TABLE_CACHE_SIZE", 3)
+    with pytest.raises(ValueError):
+        get_cluster_table(PRIMES, dyn_name="H-unknown")
+    assert not cluster._TABLE_CACHE
+
+    first = get_cluster_table(PRIMES, max_iter=1)
+    for max_iter in (2, 3, 4):
+        get_cluster_table(PRIMES, max_iter=max_iter)
+    assert len(cluster._TABLE_CACHE) == 3
+    assert get_cluster_table(PRIMES, max_iter=1) is not first
+
+
+def test_extra_dyn_params_bypass_the_table(monkeypatch):
+    monkeypatch.setattr(cluster, "_TABLE_CACHE", type(cluster._TABLE_CACHE)())
+    cip = {"primes": PRIMES, "col_mass": [1, 0, 1, 1, 0, 1]}
+    params = {"max_iter": 8, "seed": 7}
+    sig = compute_cluster_signature(cip, dyn_name="H-monster-v1", dyn_params=params)
+    assert not cluster._TABLE_CACHE
+    assert sig["params"]["dyn_params"] == params
+    assert sig == compute_cluster_signature(
+        cip, dyn_name="H-monster-v1", dyn_params=params, use_table=False
+    )
+
+    compute_cluster_signature(cip, dyn_params={"max_iter": 8})
+    assert len(cluster._TABLE_CACHE) == 1
+
+
+def test_multi_plan_signatures_match_single_plan_calls():
+    primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31]
+    cip = {"primes": primes, "col_mass": [1, 0, 2, 1, 0, 1, 1, 0, 0, 4, 1]}
+    plans = [
+        BandPlan(mode, size, max_band)
+        for mode in ("canonical", "by-basis")
+        for size in (2, 3, 4, 5)
+        for max_band in (None, 1)
+    ]
+    for dyn in ("H-identity", "H-band-quadratic", "H-monster-v1"):
+        params = {"max_iter": 16}
+        multi = compute_cluster_signatures(cip, plans, dyn_name=dyn, dyn_params=params)
+        single = [
+            compute_cluster_signature(
+                cip,
+                mode=plan.mode,
+                band_size=plan.band_size,
+                max_band=plan.max_band,
+                dyn_name=dyn,
+                dyn_params=params,
+            )
+            for plan in plans
+        ]
+        assert multi == single
@@ -0,0 +1,39 @@
+import pickle
+
+from gcc_v1 import CompactCIP, encode_block, spectral_view
+from gcc_v1.cluster import compute_cluster_signature
+from gcc_v1.spectrum import pack_signature
+
+
+def _cip(data=b"crystal codec \x02\x04\x06\x0c"):
+    return encode_block(data)["header"]["cip"]
+
+
+def test_compact_cip_round_trips_to_the_same_dict():
+    cip = _cip()
+    compact = CompactCIP.from_dict(cip)
+    assert compact.to_dict() == cip
+    assert compact == cip
+    assert compact["per_prime"][2] == cip["per_prime"][2]
+    assert compact.get("matrix_fingerprint") == cip["matrix_fingerprint"]
+    assert list(compact.col_mass) == cip["col_mass"]
+    assert compact.total_mass == cip["total_mass"]
+    assert pickle.loads(pickle.dumps(compact)) == cip
+
+
+def test_compact_cip_is_accepted_where_dicts_are():
+    cip = _cip()
+    compact = CompactCIP.from_dict(cip)
+    assert compact.packed_signature() == pack_signature(
+        cip["primes"], cip["logic_signature"]
+    )
+    assert compute_cluster_signature(compact) == compute_cluster_signature(cip)
+    white = spectral_view(compact["primes"], compact["logic_signature"], "white")
+    assert white == spectral_view(cip["primes"], cip["logic_signature"], "white")
+
+
+def test_compact_cip_shares_primes_and_has_no_instance_dict():
+    a = CompactCIP.from_dict(_cip(b"abc"))
+    b = CompactCIP.from_dict(_cip(b"xyz"))
+    assert a.primes is b.primes
+    assert not hasattr(a, "__dict__")
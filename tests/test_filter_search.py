@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import lab.filter_search as filter_search  # noqa: E402
+from gcc_v1.spectrum import PackedSignature  # noqa: E402
+from lab.filter_search import ActiveCount, Separation, search_filters  # noqa: E402
+
+BACKEND_MODULES = (filter_search,)
+
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19)
+K = len(PRIMES)
+TOP = 5
+
+
+def _signatures(n: int, seed: int) -> list[PackedSignature]:
+    rng = random.Random(seed)
+    return [
+        PackedSignature(primes=PRIMES, t0=rng.getrandbits(K), t1=rng.getrandbits(K))
+        for _ in range(n)
+    ]
+
+
+def _brute_force(sigs, objective, maximize):
+    """Tutti i 2^k filtri valutati da zero, ordinati come search_filters."""
+    scored = []
+    for mask in range(1 << K):
+        counts = [((s.t0 & ~mask) | (s.t1 & mask)).bit_count() for s in sigs]
+        scored.append((float(objective(counts)), mask))
+    sign = 1 if maximize else -1
+    scored.sort(key=lambda item: (-sign * item[0], item[1]))
+    return scored[:TOP]
+
+
+OBJECTIVES = [ActiveCount(), Separation(3, margin=True)]
+
+
+def _found(results):
+    return [(r.score, r.mask) for r in results]
+
+
+@pytest.mark.parametrize("objective", OBJECTIVES)
+@pytest.mark.parametrize("maximize", [True, False])
+def test_exhaustive_matches_brute_force(backend, objective, maximize):
+    sigs = _signatures(7, seed=1)
+    expected = _brute_force(sigs, objective, maximize)
+    found = search_filters(sigs, objective, maximize=maximize, top=TOP)
+    assert {r.method for r in found} == {"exhaustive"}
+    assert _found(found) == expected
+
+
+def test_parallel_exhaustive_matches_brute_force(backend, monkeypatch):
+    monkeypatch.setattr(filter_search, "_MIN_STEPS_PER_WORKER", 1 << (K - 2))
+    sigs = _signatures(7, seed=2)
+    objective = Separation(3, margin=True)
+    found = search_filters(sigs, objective, top=TOP, workers=3)
+    assert _found(found) == _brute_force(sigs, objective, True)
+
+
+@pytest.mark.parametrize("objective", OBJECTIVES)
+def test_beam_search(backend, objective):
+    sigs = _signatures(7, seed=3)
+    expected = _brute_force(sigs, objective, True)
+
+    # Un fascio largo quanto lo spazio visita ogni filtro: come la esaustiva.
+    wide = search_filters(
+        sigs, objective, top=TOP, max_exhaustive_k=0, beam_width=1 << K
+    )
+    assert {r.method for r in wide} == {"beam"}
+    assert _found(wide) == expected
+
+    # Greedy: punteggio coerente con il filtro e mai oltre l'ottimo.
+    (greedy,) = search_filters(sigs, objective, max_exhaustive_k=0, beam_width=1)
+    counts = [((s.t0 & ~greedy.mask) | (s.t1 & greedy.mask)).bit_count() for s in sigs]
+    assert greedy.score == float(objective(counts))
+    assert greedy.score <= expected[0][0]
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+import gcc_v1.kernel2310 as kernel2310
+from gcc_v1 import kernel_2310_from_digits
+from gcc_v1.kernel2310 import (
+    chunk_state_2310,
+    combine_states_2310,
+    kernel_2310_from_buffer,
+    kernel_2310_from_file,
+    kernel_2310_parallel,
+    update_state_2310_buffer,
+)
+
+BACKEND_MODULES = (kernel2310,)
+
+
+def _digits(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return "".join(rng.choice("0123456789") for _ in range(n))
+
+
+def test_buffer_fast_path_matches_digit_stream():
+    for n in (0, 1, 7, 255, 256, 257, 1000, 5003):
+        digits = _digits(n, seed=n)
+        expected = kernel_2310_from_digits([int(ch) for ch in digits])
+        assert kernel_2310_from_buffer(digits) == expected
+        assert kernel_2310_from_buffer(digits.encode()) == expected
+        assert kernel_2310_from_buffer(memoryview(digits.encode())) == expected
+        assert update_state_2310_buffer(digits, chunk_digits=3) == expected.s_mod
+
+
+def test_buffer_fast_path_rejects_non_digits():
+    for bad in ("12a4", "1 2", "+12", "1_2", "12²", "١٢"):
+        with pytest.raises(ValueError):
+            update_state_2310_buffer(bad)
+        with pytest.raises(ValueError):
+            update_state_2310_buffer(bad.encode("utf-8"))
+
+
+def test_affine_chunk_states_combine_associatively():
+    digits = _digits(1000, seed=1)
+    a, b, c = digits[:123], digits[123:600], digits[600:]
+    sa, sb, sc = (chunk_state_2310(x) for x in (a, b, c))
+    left = combine_states_2310(combine_states_2310(sa, sb), sc)
+    right = combine_states_2310(sa, combine_states_2310(sb, sc))
+    assert left == right == chunk_state_2310(digits)
+
+
+def test_parallel_kernel_matches_serial(tmp_path):
+    digits = _digits(20000, seed=2)
+    expected = kernel_2310_from_buffer(digits)
+
+    path = tmp_path / "digits.txt"
+    path.write_text(digits + "\n", encoding="ascii")
+    assert kernel_2310_from_file(path, workers=3, min_chunk=4096) == expected
+    assert kernel_2310_from_file(path, workers=1) == expected
+    assert kernel_2310_parallel(digits.encode(), workers=3, min_chunk=4096) == expected
+
+
+def test_batch_kernel_matches_per_number(backend, tmp_path):
+    rng = random.Random(3)
+    lines = [_digits(rng.randrange(0, 40), seed=i) for i in range(2000)]
+    lines.append(_digits(700, seed=99))  # riga più lunga di un chunk
+    data = ("\n".join(lines) + "\n").encode()
+
+    batch = kernel2310.kernel_2310_batch(data, block_bytes=1000)
+    assert len(batch) == len(lines)
+    for i, line in enumerate(lines):
+        expected = kernel_2310_from_buffer(line)
+        assert int(batch.s_mod[i]) == expected.s_mod
+        assert batch.signature(i) == expected
+        assert int(batch.residues[7][i]) == expected.residues[7]
+
+    path = tmp_path / "numbers.txt"
+    path.write_bytes(data.replace(b"\n", b"\r\n"))
+    from_file = kernel2310.kernel_2310_batch_from_file(path)
+    assert list(from_file.s_mod) == list(batch.s_mod)
+
+    crlf = kernel2310.kernel_2310_batch(
+        memoryview(data.replace(b"\n", b"\r\n")), block_bytes=1000
+    )
+    assert list(crlf.s_mod) == list(batch.s_mod)
+
+    mixed = kernel2310.kernel_2310_batch(b"12\r\n\r\n345\n7\r\n")
+    assert [int(s) for s in mixed.s_mod] == [12, 0, 345, 7]
+    for bad in (b"12\n3x4\n", b"1\r2\n", b"12\r", b"\r"):
+        with pytest.raises(ValueError):
+            kernel2310.kernel_2310_batch(bad)
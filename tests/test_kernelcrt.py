@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from gcc_v1.kernel2310 import kernel_2310_from_buffer
+from gcc_v1.kernelcrt import CRTKernel, primorial_primes
+
+ALPHABETS = {2: "01", 8: "01234567", 10: "0123456789", 16: "0123456789abcdefABCDEF"}
+
+
+def test_multi_modulus_kernel_matches_python_ints():
+    rng = random.Random(0)
+    big = 2**127 - 1
+    for radix, alphabet in ALPHABETS.items():
+        digits = "".join(rng.choice(alphabet) for _ in range(1500))
+        value = int(digits, radix)
+
+        kernel = CRTKernel(primorial_primes(61), moduli=[big], radix=radix)
+        sig = kernel.compute(digits)
+        assert sig.s_mod == value % kernel.modulus
+        assert sig.residues == {p: value % p for p in primorial_primes(61)}
+        assert sig.state_mod(big) == value % big
+
+        kernel.reset()
+        for start in range(0, len(digits), 97):
+            kernel.feed(digits[start : start + 97].encode())
+        assert kernel.signature() == sig
+
+
+def test_pentagonal_kernel_is_a_special_case():
+    digits = "".join(random.Random(1).choice("0123456789") for _ in range(999))
+    sig = CRTKernel().compute(digits)
+    assert sig.to_prism_signature_2310() == kernel_2310_from_buffer(digits)
+
+
+@pytest.mark.parametrize(("digits", "radix"), [("12a", 10), ("102", 2), ("0x1f", 16)])
+def test_kernel_rejects_digits_outside_radix(digits, radix):
+    with pytest.raises(ValueError):
+        CRTKernel(radix=radix).compute(digits)
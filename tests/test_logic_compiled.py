@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import ClassVar
+
+import pytest
+
+import gcc_v1.logic as logic
+from gcc_v1.logic import (
+    CompiledLogicOp,
+    XorLogicOp,
+    build_logic_signature,
+    compile_logic_op,
+)
+
+BACKEND_MODULES = (logic,)
+
+
+@dataclass(frozen=True)
+class _InvertedXorTestOp:
+    """Flip on odd exponents, plus an extra NOT where (p + h) is odd."""
+
+    name: str = "not-xor-test"
+    depends_on: ClassVar[tuple[str, ...]] = ("parity", "p", "h")
+
+    def apply(self, bit_in: int, exponent: int, *, p: int, h: int) -> int:
+        out = bit_in ^ (exponent & 1)
+        return out ^ 1 if (p + h) & 1 else out
+
+
+class ThresholdOp:
+    """Undeclared dependencies: forces 1 when exponent >= h + 2."""
+
+    name = "threshold-test"
+
+    def apply(self, bit_in: int, exponent: int, *, p: int, h: int) -> int:
+        return 1 if exponent >= h + 2 else bit_in
+
+
+def _apply_column(column, bit_in, *, p, op):
+    """Scalar reference: propagate a bit through every nodulo of a column."""
+    s = bit_in
+    for h, e in enumerate(column):
+        if e:
+            s = op.apply(s, e, p=p, h=h)
+    return s
+
+
+def _apply_maps(column, op, p=5):
+    return (_apply_column(column, 0, p=p, op=op), _apply_column(column, 1, p=p, op=op))
+
+
+def _reference(M, primes, op):
+    per_prime = {}
+    for j, p in enumerate(primes):
+        column = [row[j] for row in M]
+        per_prime[p] = {
+            "T0": int(_apply_column(column, 0, p=p, op=op)),
+            "T1": int(_apply_column(column, 1, p=p, op=op)),
+        }
+    return {"logic_mode": op.name, "per_prime": per_prime}
+
+
+@pytest.mark.parametrize("op", [XorLogicOp(), _InvertedXorTestOp(), ThresholdOp()])
+def test_compiled_signature_matches_reference(op):
+    rng = random.Random(0)
+    primes = [2, 3, 5, 7, 11, 13]
+    compiled = compile_logic_op(op)
+    for _ in range(200):
+        H = rng.randrange(0, 6)
+        M = [[rng.choice((0, 0, 1, 2, 3, 4, 8)) for _ in primes] for _ in range(H)]
+        assert build_logic_signature(M, primes, compiled) == _reference(M, primes, op)
+
+
+def test_compile_cache_and_dependency_validation():
+    op = XorLogicOp()
+    assert compile_logic_op(op) is compile_logic_op(XorLogicOp())
+
+    class BadOp:
+        name = "bad"
+        depends_on = ("colour",)
+
+        def apply(self, bit_in, exponent, *, p, h):
+            return bit_in
+
+    with pytest.raises(ValueError):
+        CompiledLogicOp(BadOp())
+
+
+def test_compile_cache_holds_only_registered_ops():
+    from gcc_v1.logic import _COMPILED
+
+    @dataclass(frozen=True)
+    class TempOp:
+        name: str = "temp-test"
+
+        def apply(self, bit_in, exponent, *, p, h):
+            return bit_in
+
+    before = dict(_COMPILED)
+    assert compile_logic_op(TempOp()) is not compile_logic_op(TempOp())
+    assert _COMPILED == before
+
+
+def test_compiled_caches_are_bounded_and_parity_keyed(monkeypatch):
+    compiled = CompiledLogicOp(XorLogicOp())
+    assert compiled.column_map([3, 2, 0], p=2) == compiled.column_map([5, 4, 0], p=7)
+    assert len(compiled._columns) == 1
+
+    monkeypatch.setattr(logic, "_COMPILED_CACHE_SIZE", 8)
+    compiled = CompiledLogicOp(ThresholdOp())
+    rng = random.Random(3)
+    for _ in range(200):
+        column = [rng.randrange(1, 50) for _ in range(3)]
+        assert compiled.column_map(column, p=5) == _apply_maps(column, ThresholdOp())
+    assert len(compiled._columns) <= 8
+    assert len(compiled._cells) <= 8
+
+
+def test_signature_rejects_prime_count_mismatch():
+    with pytest.raises(ValueError):
+        build_logic_signature([[1, 2]], [2, 3, 5], XorLogicOp())
+
+
+@pytest.mark.parametrize("op", [XorLogicOp(), _InvertedXorTestOp(), ThresholdOp()])
+def test_bit_sliced_batch_matches_per_block(backend, op):
+    rng = random.Random(1)
+    primes = [2, 3, 5, 7, 11]
+    Ms = [
+        [[rng.choice((0, 1, 2, 4, 8)) for _ in primes] for _ in range(rng.randrange(6))]
+        for _ in range(150)
+    ]
+    expected = [build_logic_signature(M, primes, op) for M in Ms]
+    assert logic.build_logic_signatures(Ms, primes, op) == expected
+
+
+def test_registry_and_multi_op_signatures():
+    from gcc_v1 import encode_block
+    from gcc_v1.logic import (
+        available_logic_ops,
+        build_logic_signatures_multi,
+        get_logic_op,
+    )
+
+    assert {"xor-v1", "not-xor-v1"} <= set(available_logic_ops())
+    with pytest.raises(ValueError):
+        get_logic_op("no-such-op")
+
+    cip = encode_block(b"GCC multi-op", logic_op="not-xor-v1")["header"]["cip"]
+    op = get_logic_op(cip["logic_signature"]["logic_mode"])
+    assert op.name == "not-xor-v1"
+
+    rng = random.Random(2)
+    primes = [2, 3, 5, 7, 11, 13]
+    ops = [get_logic_op(name) for name in available_logic_ops()]
+    for _ in range(50):
+        M = [[rng.choice((0, 1, 2, 3, 8)) for _ in primes] for _ in range(4)]
+        multi = build_logic_signatures_multi(M, primes, ops + [ThresholdOp()])
+        for o in ops + [ThresholdOp()]:
+            assert multi[o.name] == _reference(M, primes, o)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+import gcc_v1.prefix2310 as prefix2310
+from gcc_v1.kernel2310 import kernel_2310_from_buffer, pow10_mod_2310
+from gcc_v1.prefix2310 import PrefixStateIndex2310
+
+BACKEND_MODULES = (prefix2310,)
+
+
+def _digits(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return "".join(rng.choice("0123456789") for _ in range(n))
+
+
+def test_pow10_table_is_periodic():
+    assert [pow10_mod_2310(k) for k in range(40)] == [
+        pow(10, k, 2310) for k in range(40)
+    ]
+
+
+def test_substring_states_match_direct_kernel(backend):
+    digits = _digits(3000, seed=1)
+    idx = PrefixStateIndex2310.from_stream(
+        [digits[:17], digits[17:1000], "", digits[1000:]]
+    )
+    assert len(idx) == len(digits)
+    assert list(idx.prefix_states[:50]) == [
+        int(digits[:i] or "0") % 2310 for i in range(50)
+    ]
+
+    rng = random.Random(2)
+    for _ in range(300):
+        i = rng.randrange(0, len(digits) + 1)
+        j = rng.randrange(i, len(digits) + 1)
+        assert idx.signature(i, j) == kernel_2310_from_buffer(digits[i:j])
+
+    windows = idx.window_states(9)
+    assert len(windows) == len(digits) - 8
+    assert all(
+        int(windows[i]) == int(digits[i : i + 9]) % 2310 for i in range(0, 2992, 97)
+    )
+
+    with pytest.raises(ValueError):
+        idx.state(5, 3)
+    with pytest.raises(ValueError):
+        idx.append("12a")
+
+
+def test_index_persistence_and_file_build(backend, tmp_path):
+    digits = _digits(500, seed=3)
+    src = tmp_path / "digits.txt"
+    src.write_text(digits + "\n", encoding="ascii")
+    idx = PrefixStateIndex2310.from_file(src, block_size=64)
+
+    path = tmp_path / "prefix.idx"
+    idx.save(path)
+    loaded = PrefixStateIndex2310.load(path)
+    assert len(loaded) == len(digits)
+    assert list(loaded.prefix_states) == list(idx.prefix_states)
+    assert loaded.state(100, 140) == int(digits[100:140]) % 2310
+
+    loaded.append("42")
+    assert loaded.state(len(digits), len(digits) + 2) == 42
+    loaded.close()
+
+
+def test_prefix_states_snapshot_allows_append(backend):
+    idx = PrefixStateIndex2310("123")
+    states = idx.prefix_states
+    idx.append("4")
+    assert list(states) == [0, 1, 12, 123]
+    assert idx.state(0, 4) == 1234
@@ -0,0 +1,61 @@
+import io
+import json
+
+from gcc_v1 import apply_filter, build_filter_bits, encode_block
+from gcc_v1.compact import CompactCIP
+from gcc_v1.serialize import (
+    LazyRecord,
+    NDJSONWriter,
+    dumps,
+    dumps_record,
+    loads,
+    loads_record,
+    read_ndjson,
+)
+
+
+def _black(cip):
+    bits = build_filter_bits(cip["primes"], "black")
+    return apply_filter(cip["primes"], cip["logic_signature"], bits)
+
+
+def test_round_trip_keeps_int_prime_keys():
+    obj = encode_block(b"1234567\n", prism_source="kernel2310")
+    cip = obj["header"]["cip"]
+
+    plain = json.loads(json.dumps(cip))
+    assert _black(plain) != _black(cip)  # il json standard perde le chiavi int
+
+    back = loads_record(dumps_record(obj))
+    assert back["header"] == obj["header"]
+    assert back["invariants"]["per_prime"][2] == cip["per_prime"][2]
+    assert back["header"]["kernel_2310"]["residues"][7] == 1234567 % 7
+    assert _black(back["header"]["cip"]) == _black(cip)
+    assert loads(dumps(CompactCIP.from_dict(cip))) == cip
+
+
+def test_lazy_record_decodes_single_fields():
+    obj = encode_block(bytes(range(256)))
+    rec = LazyRecord(dumps_record(obj))
+    cip = obj["header"]["cip"]
+    assert rec["header.cip.matrix_fingerprint"] == cip["matrix_fingerprint"]
+    assert rec["header.cip.per_prime.3"] == cip["per_prime"][3]
+    assert rec["residual.residual_stream.255"] == 255
+    assert rec.get("header.missing") is None
+    assert "header.cip.logic_signature" in rec.paths()
+
+
+def test_ndjson_stream_with_field_selection():
+    blocks = [b"alpha", b"beta", b"\x02\x04"]
+    fh = io.BytesIO()
+    writer = NDJSONWriter(fh)
+    writer.write_many(encode_block(b) for b in blocks)
+    assert writer.count == 3
+
+    fh.seek(0)
+    rows = list(read_ndjson(fh, fields=["header.block_len"]))
+    assert rows == [{"header.block_len": len(b)} for b in blocks]
+
+    fh.seek(0)
+    full = list(read_ndjson(fh))
+    assert [o["residual"]["residual_stream"] for o in full] == [list(b) for b in blocks]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import dataclasses
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from gcc_v1 import encode_block  # noqa: E402
+from lab.spectral_filters import (  # noqa: E402
+    PipelineCache,
+    make_black_filter,
+    run_filter_orbit,
+    run_filter_orbit_many,
+    run_filter_pipeline,
+    run_filter_pipeline_many,
+    spectrum_custom,
+)
+
+
+def _cips(n: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        encode_block(rng.randbytes(rng.randint(1, 40)))["header"]["cip"]
+        for _ in range(n)
+    ]
+
+
+def start(prev, primes):
+    return {primes[0]: 1}  # dict parziale: filter_bits resta com'è
+
+
+def black(prev, primes):
+    return make_black_filter(primes)
+
+
+def rotate(prev, primes):
+    bits = [prev.out_bits[p] ^ prev.filter_bits.get(p, 0) for p in primes]
+    bits = bits[-1:] + bits[:-1]
+    return dict(zip(primes, bits, strict=True))
+
+
+def _naive_orbit(cip, steps):
+    spectra, prev = [], None
+    for n in range(steps):
+        f = start if n == 0 else rotate
+        F = f(prev, cip["primes"])
+        spec = spectrum_custom(cip, f.__name__, F)
+        spectra.append((spec.mode, spec.out_bits, spec.active_primes))
+        prev = dataclasses.replace(spec, filter_bits=F)
+    return spectra
+
+
+def test_pipeline_cache_hits_and_misses():
+    cip = _cips(1)[0]
+    cache = PipelineCache()
+    first = run_filter_pipeline(cip, [start, rotate, rotate], cache=cache)
+    assert (cache.hits, cache.misses) == (0, 3)
+    again = run_filter_pipeline(cip, [start, rotate, rotate], cache=cache)
+    assert (cache.hits, cache.misses) == (3, 3)
+    assert again == first
+    assert first[0].filter_bits == {cip["primes"][0]: 1}
+
+    # Istanze frozen e indipendenti: la cache non si altera dall'esterno.
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first[0].mode = "x"
+    first[0].out_bits.clear()
+    assert run_filter_pipeline(cip, [start], cache=cache)[0].out_bits
+
+
+def test_orbit_matches_naive_iteration():
+    for cip in _cips(20, seed=1):
+        steps = 3 * len(cip["primes"]) + 5
+        orbit = run_filter_orbit(cip, rotate, steps, init_fn=start)
+        expected = _naive_orbit(cip, steps)
+        got = [
+            (orbit[n].mode, orbit[n].out_bits, orbit[n].active_primes)
+            for n in range(steps)
+        ]
+        assert got == expected
+        assert orbit.lam > 0  # ciclo trovato prima di `steps`
+        assert len(orbit.spectra) == orbit.mu + orbit.lam
+
+
+def test_many_variants_match_single_runs():
+    cips = _cips(30, seed=2)
+    cache = PipelineCache()
+    pipelines = run_filter_pipeline_many(cips, [black, rotate], cache=cache)
+    orbits = run_filter_orbit_many(cips, rotate, 12, init_fn=start, cache=cache)
+    for cip, spectra, orbit in zip(cips, pipelines, orbits, strict=True):
+        assert spectra == run_filter_pipeline(cip, [black, rotate])
+        single = run_filter_orbit(cip, rotate, 12, init_fn=start)
+        assert [orbit[n] for n in range(12)] == [single[n] for n in range(12)]
+    assert pipelines[0] is not pipelines[1]
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import random
+
+import gcc_v1.spectrum as spectrum
+from gcc_v1 import apply_filter, encode_block
+from gcc_v1.spectrum import (
+    apply_filters_batch,
+    batch_active_counts,
+    pack_bits,
+    pack_signature,
+    unpack_bits,
+)
+
+BACKEND_MODULES = (spectrum,)
+
+
+def _cips(n: int) -> list[dict]:
+    rng = random.Random(0)
+    return [
+        encode_block(bytes(rng.randrange(256) for _ in range(12)))["header"]["cip"]
+        for _ in range(n)
+    ]
+
+
+def test_packed_matches_dict_semantics():
+    cip = _cips(1)[0]
+    primes = cip["primes"]
+    sig = pack_signature(primes, cip["logic_signature"])
+    per_prime = cip["logic_signature"]["per_prime"]
+    for mask in range(1 << len(primes)):
+        F = unpack_bits(primes, mask)
+        assert pack_bits(primes, F) == mask
+        expected = {
+            p: per_prime[p]["T1"] if F[p] else per_prime[p]["T0"] for p in primes
+        }
+        assert apply_filter(primes, cip["logic_signature"], F) == expected
+        assert sig.active_count(mask) == sum(expected.values())
+
+    # Entry mancante: identità (T0=0, T1=1).
+    assert apply_filter([2, 3], {"per_prime": {}}, {2: 1, 3: 0}) == {2: 1, 3: 0}
+
+
+def test_batch_counts_match_scalar(backend):
+    cips = _cips(20)
+    primes = cips[0]["primes"]
+    sigs = [pack_signature(primes, c["logic_signature"]) for c in cips]
+    masks = list(range(1 << len(primes)))
+
+    counts = batch_active_counts(sigs, masks)
+    for i, sig in enumerate(sigs):
+        assert [int(c) for c in counts[i]] == [sig.active_count(f) for f in masks]
+
+    outs = apply_filters_batch(sigs[0], masks)
+    assert [int(o) for o in outs] == [sigs[0].apply(f) for f in masks]
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import tracemalloc
+
+from gcc_v1 import EncodeStats, encode_block, install_stats, uninstall_stats
+from gcc_v1.stats import ENCODE_STAGES, current_stats
+
+
+def test_encode_block_records_every_stage():
+    stats = EncodeStats()
+    data = b"crystal codec" * 8
+    encode_block(data, stats=stats)
+    encode_block(data, stats=stats, with_cluster=True)
+
+    report = stats.as_dict()
+    assert tuple(report) == ENCODE_STAGES
+    assert report["prism"]["count"] == 2
+    assert report["cluster"]["count"] == 1
+    assert report["prism"]["total_bytes"] == 2 * len(data)
+    assert sum(report["logic"]["time_histogram_log2_us"].values()) == 2
+    assert report["residual"]["size_histogram_log2_bytes"] == {
+        len(data).bit_length(): 2
+    }
+
+
+def test_global_stats_and_sink():
+    events = []
+    install_stats(EncodeStats(sink=events.append))
+    try:
+        encode_block(b"\x02\x04\x06")
+    finally:
+        stats = uninstall_stats()
+    assert current_stats() is None
+    assert [e.stage for e in events] == ["prism", "logic", "cids", "cip", "residual"]
+    assert stats.stages["cids"].count == 1
+
+    # Senza stats installate non si registra nulla.
+    encode_block(b"\x02\x04\x06")
+    assert len(events) == 5
+
+
+def test_trace_memory_is_private():
+    stats = EncodeStats(trace_memory=True)
+    encode_block(bytes(range(256)), stats=stats)
+    assert stats.stages["residual"].peak_delta_bytes > 0
+    assert not tracemalloc.is_tracing()
+
+
+def test_trace_memory_keeps_caller_peak():
+    stats = EncodeStats(trace_memory=True)
+    tracemalloc.start()
+    try:
+        big = bytearray(1 << 20)
+        del big
+        peak = tracemalloc.get_traced_memory()[1]
+        encode_block(bytes(range(256)), stats=stats)
+        assert tracemalloc.get_traced_memory()[1] >= peak
+    finally:
+        tracemalloc.stop()
+    assert stats.stages["residual"].peak_delta_bytes > 0
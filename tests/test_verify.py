@@ -0,0 +1,65 @@
+import copy
+import io
+
+import pytest
+
+from gcc_v1 import decode_block, encode_block
+from gcc_v1.container import dump_block
+from gcc_v1.verify import verify_block, verify_container
+
+
+def test_valid_blocks_pass():
+    assert verify_block(encode_block(bytes(range(256)))).ok
+    assert verify_block(encode_block(b"", max_prime=13)).ok
+    assert verify_block(encode_block(b"9876543210\n", prism_source="kernel2310")).ok
+    assert verify_block(encode_block(b"abc", logic_op="xor-prime-v1")).ok
+
+
+def _drop_hash_and_change_byte(obj):
+    del obj["header"]["content_sha256"]
+    obj["residual"]["residual_stream"][0] = 8
+
+
+@pytest.mark.parametrize(
+    ("tamper", "check"),
+    [
+        (lambda o: o["header"].update(block_len=99), "decode"),
+        (lambda o: o["residual"]["residual_stream"].__setitem__(0, 7), "content"),
+        (_drop_hash_and_change_byte, "col_mass"),
+        (
+            lambda o: o["header"]["cip"].update(matrix_fingerprint="0" * 64),
+            "fingerprint",
+        ),
+    ],
+)
+def test_first_failing_check_is_reported(tamper, check):
+    obj = copy.deepcopy(encode_block(b"\x02\x04\x06\x0c"))
+    tamper(obj)
+    result = verify_block(obj)
+    assert not result.ok
+    assert result.check == check
+
+
+def test_decode_block_enforces_block_len():
+    obj = encode_block(b"abcd")
+    obj["header"]["block_len"] = 3
+    with pytest.raises(ValueError):
+        decode_block(obj)
+
+
+def test_verify_container_stops_at_first_failure():
+    good = [encode_block(bytes([i, i + 1])) for i in range(0, 40, 2)]
+    bad = copy.deepcopy(good[5])
+    bad["header"]["cip"]["matrix_fingerprint"] = "f" * 64
+    blocks = good[:5] + [bad] + good[5:] + [bad]
+    stream = io.BytesIO(b"".join(dump_block(b, "binary") for b in blocks))
+
+    report = verify_container(stream)
+    assert not report.ok
+    assert report.checked == 6
+    assert report.bytes_checked == 12
+    assert [f.index for f in report.failures] == [5]
+
+    full = verify_container(blocks, workers=2, fail_fast=False)
+    assert full.checked == len(blocks)
+    assert [f.index for f in full.failures] == [5, len(blocks) - 1]